@@ -9,7 +9,7 @@ import random
 from collections import deque
 
 # Diğer dosyalarımızdan gerekli sınıfları ve fonksiyonları import ediyoruz
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
 
 # Modelin tekrarlanabilir sonuçlar üretmesi için random seed'leri ayarlıyoruz
@@ -106,7 +106,7 @@ if __name__ == "__main__":
     BATCH_SIZE = 32
     
     # Veriyi hazırla
-    hisse_verisi = veri_cek_ve_hazirla(
+    hisse_verisi = veri_seti_hazirla(
         hisse_kodu="THYAO.IS",
         baslangic_tarihi="2020-01-01",
         bitis_tarihi="2024-12-31"
@@ -114,7 +114,7 @@ if __name__ == "__main__":
     
     if hisse_verisi is not None:
         # Ortamı ve Ajanı oluştur
-        env = TicaretOrtami(df=hisse_verisi, baslangic_bakiye=100000)
+        env = TicaretOrtami(df=hisse_verisi, baslangic_bakiye=100000, sequence_length=10)
         # state_size artık bir tuple (örn: (10, 5)) olacak
         state_size = (env.observation_space.shape[0], env.observation_space.shape[1])
         action_size = env.action_space.n
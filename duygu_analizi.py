@@ -1,15 +1,66 @@
+import os
+import threading
+
 import numpy as np
-from transformers import pipeline
 from haber_cekici import haberleri_getir # Bir önceki scriptimizden fonksiyonu import ediyoruz
+from duygu_onbellegi import DuyguOnbellegi, basligi_normallestir
 import datetime
 
-# --- DUYGU ANALİZİ MODELİNİ YÜKLEME ---
-# 'pipeline' fonksiyonu, modeli ve gerekli tüm bileşenleri bizim için kolayca kurar.
-# Bu model, ilk çalıştırmada Hugging Face'ten indirilecektir (birkaç yüz MB).
-print("Duygu analizi modeli yükleniyor... (ilk seferde uzun sürebilir)")
-sentiment_pipeline = pipeline("sentiment-analysis", model="savasy/bert-base-turkish-sentiment-cased")
-print("Model başarıyla yüklendi.")
-# ------------------------------------
+MODEL_ADI = "savasy/bert-base-turkish-sentiment-cased"
+# Ayarlanırsa (örn. "127.0.0.1:8788" veya "unix:/tmp/duygu.sock") model yerine duygu_servisi.py ile
+# başlatılmış, modeli sıcak tutan skorlama servisi kullanılır
+DUYGU_SERVISI = os.environ.get("DUYGU_SERVISI")
+# Çıkarım arka ucu: "transformers" (fp32 pipeline) veya "onnx" (ONNX Runtime ile int8 nicemlenmiş model, bkz. duygu_onnx.py)
+DUYGU_ARKA_UCU = os.environ.get("DUYGU_ARKA_UCU", "transformers")
+ARKA_UCLAR = ("transformers", "onnx")
+
+_duygu_modelleri = {}
+_duygu_onbellegi = None
+_kilit = threading.Lock()
+
+
+def duygu_modeli(arka_uc=None):
+    """
+    Duygu analizi modelini ilk kullanımda yükler ve sonraki çağrılarda aynısını döndürür.
+    Modül import edildiğinde model yüklenmez; yalnızca önbellekte olmayan bir başlık skorlanacağı zaman yüklenir.
+
+    Args:
+        arka_uc (str, optional): ARKA_UCLAR'dan biri (varsayılan DUYGU_ARKA_UCU). İki arka uç da aynı
+            çağrı arayüzünü (tokenizer özniteliği, metin listesi -> {'label', 'score'} listesi) sunar.
+    """
+    arka_uc = arka_uc or DUYGU_ARKA_UCU
+    if arka_uc not in ARKA_UCLAR:
+        raise ValueError(f"Bilinmeyen duygu arka ucu: {arka_uc}. Seçenekler: {', '.join(ARKA_UCLAR)}")
+    with _kilit:
+        if arka_uc not in _duygu_modelleri:
+            print(f"Duygu analizi modeli yükleniyor ({arka_uc})... (ilk seferde uzun sürebilir)")
+            if arka_uc == "onnx":
+                from duygu_onnx import OnnxDuyguModeli
+
+                _duygu_modelleri[arka_uc] = OnnxDuyguModeli()
+            else:
+                # 'pipeline' fonksiyonu, modeli ve gerekli tüm bileşenleri bizim için kolayca kurar.
+                # Bu model, ilk çalıştırmada Hugging Face'ten indirilecektir (birkaç yüz MB).
+                from transformers import pipeline
+
+                _duygu_modelleri[arka_uc] = pipeline("sentiment-analysis", model=MODEL_ADI)
+            print("Model başarıyla yüklendi.")
+    return _duygu_modelleri[arka_uc]
+
+
+def onbellek_model_adi(arka_uc=None):
+    """ Önbellekte tahminlerin saklandığı model adı; nicemlenmiş modelin tahminleri fp32 tahminlerle karışmaz. """
+    arka_uc = arka_uc or DUYGU_ARKA_UCU
+    return MODEL_ADI if arka_uc == "transformers" else f"{MODEL_ADI}@{arka_uc}-int8"
+
+
+def varsayilan_onbellek():
+    """ Başlık bazında tahminlerin saklandığı, modül genelinde paylaşılan DuyguOnbellegi (ilk kullanımda açılır). """
+    global _duygu_onbellegi
+    with _kilit:
+        if _duygu_onbellegi is None:
+            _duygu_onbellegi = DuyguOnbellegi(model_adi=onbellek_model_adi())
+    return _duygu_onbellegi
 
 
 def gunluk_duygu_skorunu_hesapla(baslik_listesi):
@@ -27,8 +78,8 @@ def gunluk_duygu_skorunu_hesapla(baslik_listesi):
 
     skorlar = []
     
-    # Modelden tahminleri al
-    tahminler = sentiment_pipeline(baslik_listesi)
+    # Modelden tahminleri al (önbellekte olanlar için model çalıştırılmaz)
+    tahminler = basliklari_skorla(baslik_listesi)
     
     for tahmin in tahminler:
         label = tahmin['label']
@@ -46,6 +97,117 @@ def gunluk_duygu_skorunu_hesapla(baslik_listesi):
     return np.mean(skorlar)
 
 
+# Toplu skorlamada modele tek seferde verilen başlık sayısı
+TOPLU_BATCH_BOYUTU = 64
+ETIKET_SKORLARI = {'positive': 1, 'negative': -1}
+
+
+def modelle_tahmin_et(basliklar, batch_boyutu=TOPLU_BATCH_BOYUTU, arka_uc=None):
+    """
+    Başlıkları token uzunluğuna göre sıralayıp büyük batch'lerle modelden geçirir. Her batch en uzun başlığına
+    göre doldurulduğu (padding) için benzer uzunluktaki başlıkları bir araya getirmek boşa hesaplamayı azaltır.
+
+    Returns:
+        list: Girdiyle aynı sırada {'label', 'score'} tahminleri.
+    """
+    model = duygu_modeli(arka_uc)
+    uzunluklar = [len(ids) for ids in model.tokenizer(basliklar)['input_ids']]
+    sira = np.argsort(uzunluklar, kind='stable')
+    tahminler = model([basliklar[i] for i in sira], batch_size=batch_boyutu, truncation=True)
+    sonuc = [None] * len(basliklar)
+    for i, tahmin in zip(sira, tahminler):
+        sonuc[i] = tahmin
+    return sonuc
+
+
+def _varsayilan_tahminci(model_adi=None):
+    if DUYGU_SERVISI:
+        from duygu_servisi import servis_tahmincisi
+        return servis_tahmincisi(DUYGU_SERVISI, model_adi)
+    return modelle_tahmin_et
+
+
+def basliklari_skorla(basliklar, batch_boyutu=TOPLU_BATCH_BOYUTU, onbellek=None, tahminci=None):
+    """
+    Önbellekte bulunmayan başlıkları modelden geçirir (bkz. modelle_tahmin_et); yeni tahminler önbelleğe yazılır.
+
+    Args:
+        basliklar (list): Haber başlıkları.
+        batch_boyutu (int): Pipeline batch boyutu.
+        onbellek (DuyguOnbellegi, optional): Varsayılan olarak varsayilan_onbellek().
+        tahminci (callable, optional): (başlıklar, batch_boyutu) -> tahminler. Varsayılan olarak DUYGU_SERVISI
+            ayarlıysa skorlama servisi (önbelleğin modeliyle skorlamıyorsa hata verir), değilse bu süreçte yüklenen
+            model.
+
+    Returns:
+        list: Girdiyle aynı sırada {'label', 'score'} tahminleri.
+    """
+    if not basliklar:
+        return []
+    onbellek = varsayilan_onbellek() if onbellek is None else onbellek
+    bulunanlar = onbellek.getir(basliklar)
+    # Yalnızca boşluk veya Unicode biçimiyle ayrışan başlıklar önbellekte tek kayıttır; modele de bir kez verilir
+    eksik_gruplar = {}
+    for baslik in dict.fromkeys(basliklar):
+        if baslik not in bulunanlar:
+            eksik_gruplar.setdefault(basligi_normallestir(baslik), []).append(baslik)
+
+    if eksik_gruplar:
+        tahminci = _varsayilan_tahminci(onbellek.model_adi) if tahminci is None else tahminci
+        eksikler = [grup[0] for grup in eksik_gruplar.values()]
+        yeni_tahminler = dict(zip(eksikler, tahminci(eksikler, batch_boyutu)))
+        onbellek.kaydet(yeni_tahminler)
+        for grup in eksik_gruplar.values():
+            for baslik in grup:
+                bulunanlar[baslik] = yeni_tahminler[grup[0]]
+    return [bulunanlar[b] for b in basliklar]
+
+
+def _haberli_gunler(gunluk_basliklar):
+    return {
+        gun: basliklar for gun, basliklar in gunluk_basliklar.items()
+        if basliklar and "bulunamadı" not in basliklar[0]
+    }
+
+
+def haber_sayilari(gunluk_basliklar):
+    """
+    duygu_skorlarini_toplu_hesapla'nın her günün skorunu kaç başlıktan hesapladığı (haber yoksa 0). Seans
+    skorları bu sayılarla ağırlıklandırılır (bkz. islem_takvimi.seanslara_topla).
+
+    Returns:
+        dict: Gün -> başlık sayısı.
+    """
+    haberli_gunler = _haberli_gunler(gunluk_basliklar)
+    return {gun: len(haberli_gunler.get(gun, ())) for gun in gunluk_basliklar}
+
+
+def duygu_skorlarini_toplu_hesapla(gunluk_basliklar, batch_boyutu=TOPLU_BATCH_BOYUTU):
+    """
+    Bir tarih aralığındaki tüm günlerin başlıklarını tek seferde skorlar ve gün bazında ortalamaya geri toplar.
+    Gün bazında gunluk_duygu_skorunu_hesapla ile aynı kurallar geçerlidir; günler arasında tekrar eden
+    başlıklar modele yalnızca bir kez verilir.
+
+    Args:
+        gunluk_basliklar (dict): Gün -> haberleri_getir çıktısı (başlık listesi).
+        batch_boyutu (int): Pipeline batch boyutu.
+
+    Returns:
+        dict: Gün -> -1 ile +1 arasında ortalama skor.
+    """
+    haberli_gunler = _haberli_gunler(gunluk_basliklar)
+    tekil_basliklar = list(dict.fromkeys(b for basliklar in haberli_gunler.values() for b in basliklar))
+    tahminler = basliklari_skorla(tekil_basliklar, batch_boyutu)
+    baslik_skorlari = {
+        baslik: ETIKET_SKORLARI.get(tahmin['label'], 0) for baslik, tahmin in zip(tekil_basliklar, tahminler)
+    }
+
+    skorlar = {gun: 0.0 for gun in gunluk_basliklar}
+    for gun, basliklar in haberli_gunler.items():
+        skorlar[gun] = np.mean([baslik_skorlari[b] for b in basliklar])
+    return skorlar
+
+
 if __name__ == "__main__":
     # Test etmek için dünün haberlerini tekrar çekelim
     sirket = "THY"
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+DUYGU_ONBELLEK_DOSYASI = os.environ.get("DUYGU_ONBELLEK_DOSYASI", "duygu_onbellegi.sqlite")
+# SQLite'ın tek sorguda izin verdiği parametre sayısının güvenli tarafında kalıyoruz
+_SORGU_PARCASI = 500
+
+
+def basligi_normallestir(baslik):
+    """
+    Aynı başlığın farklı yazımlarını (Unicode biçimi, fazla/farklı boşluklar) tek anahtara indirger.
+    Model büyük/küçük harfe duyarlı (cased) olduğu için harf büyüklüğü korunur.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", baslik)).strip()
+
+
+def baslik_anahtari(baslik):
+    return hashlib.sha256(basligi_normallestir(baslik).encode("utf-8")).hexdigest()
+
+
+class DuyguOnbellegi:
+    """
+    Başlık bazında model tahminlerini (etiket, güven) saklayan SQLite önbelleği.
+    Anahtar normalleştirilmiş başlığın özeti ve model adıdır; farklı modellerin sonuçları karışmaz.
+
+    WAL kipinde çalışır: okuyucular yazarları beklemez, aynı dosyayı kullanan birden fazla süreç veya iş parçacığı
+    güvenle yazabilir (her iş parçacığı kendi bağlantısını kullanır, çakışan yazımlar timeout süresince bekler).
+    """
+    def __init__(self, dosya=DUYGU_ONBELLEK_DOSYASI, model_adi=None, timeout=30.0):
+        self.dosya = dosya
+        self.model_adi = model_adi
+        self.timeout = timeout
+        self._yerel = threading.local()
+        with self._baglanti() as baglanti:
+            baglanti.execute(
+                "CREATE TABLE IF NOT EXISTS baslik_duygulari ("
+                " anahtar TEXT NOT NULL, model TEXT NOT NULL, etiket TEXT NOT NULL, guven REAL NOT NULL,"
+                " PRIMARY KEY (anahtar, model)) WITHOUT ROWID"
+            )
+
+    def _baglanti(self):
+        baglanti = getattr(self._yerel, 'baglanti', None)
+        if baglanti is None:
+            baglanti = sqlite3.connect(self.dosya, timeout=self.timeout)
+            baglanti.execute("PRAGMA journal_mode=WAL")
+            baglanti.execute("PRAGMA synchronous=NORMAL")
+            self._yerel.baglanti = baglanti
+        return baglanti
+
+    def getir(self, basliklar):
+        """
+        Returns:
+            dict: Önbellekte bulunan başlık -> {'label', 'score'}; bulunmayanlar sözlükte yer almaz.
+        """
+        anahtarlar = {}
+        for baslik in basliklar:
+            anahtarlar.setdefault(baslik_anahtari(baslik), []).append(baslik)
+        bulunanlar = {}
+        baglanti = self._baglanti()
+        tum_anahtarlar = list(anahtarlar)
+        for i in range(0, len(tum_anahtarlar), _SORGU_PARCASI):
+            parca = tum_anahtarlar[i:i + _SORGU_PARCASI]
+            satirlar = baglanti.execute(
+                f"SELECT anahtar, etiket, guven FROM baslik_duygulari "
+                f"WHERE model = ? AND anahtar IN ({','.join('?' * len(parca))})",
+                [self.model_adi, *parca],
+            )
+            for anahtar, etiket, guven in satirlar:
+                for baslik in anahtarlar[anahtar]:
+                    bulunanlar[baslik] = {'label': etiket, 'score': guven}
+        return bulunanlar
+
+    def kaydet(self, tahminler):
+        """
+        Args:
+            tahminler (dict): Başlık -> {'label', 'score'} model çıktısı.
+        """
+        if not tahminler:
+            return
+        satirlar = [
+            (baslik_anahtari(baslik), self.model_adi, tahmin['label'], float(tahmin['score']))
+            for baslik, tahmin in tahminler.items()
+        ]
+        # Tek işlemde yazıyoruz; aynı başlığı başka bir yazar önce eklediyse onun kaydı korunur
+        with self._baglanti() as baglanti:
+            baglanti.executemany("INSERT OR IGNORE INTO baslik_duygulari VALUES (?, ?, ?, ?)", satirlar)
+
+    def __len__(self):
+        return self._baglanti().execute(
+            "SELECT COUNT(*) FROM baslik_duygulari WHERE model = ?", (self.model_adi,)
+        ).fetchone()[0]
+
+    def kapat(self):
+        baglanti = getattr(self._yerel, 'baglanti', None)
+        if baglanti is not None:
+            baglanti.close()
+            self._yerel.baglanti = None
\ No newline at end of file
@@ -0,0 +1,201 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from duygu_analizi import ETIKET_SKORLARI, MODEL_ADI, TOPLU_BATCH_BOYUTU, modelle_tahmin_et
+
+# Dışa aktarılan ve nicemlenen modelin saklandığı klasör; DUYGU_ONNX_KLASORU ortam değişkeniyle değiştirilebilir
+ONNX_KLASORU = os.environ.get("DUYGU_ONNX_KLASORU", "duygu_onnx")
+FP32_DOSYASI = "model.onnx"
+INT8_DOSYASI = "model_int8.onnx"
+ONNX_OPSET = 14
+CIKTI_DOSYASI = "onnx_karsilastirma.json"
+GIRDI_ADLARI = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def onnx_modelini_hazirla(model_adi=MODEL_ADI, klasor=None, yeniden_olustur=False):
+    """
+    Modeli bir kez ONNX'e aktarır ve ağırlıklarını dinamik int8 nicemlemeyle küçültür. Nicemlenmiş model
+    zaten varsa hiçbir şey yapılmaz. Tokenizer ve yapılandırma (etiket adları) aynı klasöre kaydedilir.
+
+    Args:
+        model_adi (str): Hugging Face model adı veya yerel model klasörü.
+        klasor (str, optional): Çıktı klasörü (varsayılan ONNX_KLASORU).
+        yeniden_olustur (bool): True ise mevcut model yok sayılıp yeniden aktarılır.
+
+    Returns:
+        str: Nicemlenmiş .onnx dosyasının yolu.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    klasor = klasor or ONNX_KLASORU
+    int8_yolu = os.path.join(klasor, INT8_DOSYASI)
+    if os.path.exists(int8_yolu) and not yeniden_olustur:
+        return int8_yolu
+
+    print(f"'{model_adi}' ONNX'e aktarılıp int8 nicemleniyor (yalnızca bir kez)...")
+    os.makedirs(klasor, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_adi)
+    model = AutoModelForSequenceClassification.from_pretrained(model_adi).eval()
+    tokenizer.save_pretrained(klasor)
+    model.config.save_pretrained(klasor)
+
+    ornek = tokenizer(["THY yeni uçak siparişini açıkladı"], return_tensors="pt")
+    girdi_adlari = [ad for ad in GIRDI_ADLARI if ad in ornek]
+    fp32_yolu = os.path.join(klasor, FP32_DOSYASI)
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(ornek[ad] for ad in girdi_adlari), fp32_yolu,
+            input_names=girdi_adlari, output_names=["logits"],
+            dynamic_axes={**{ad: {0: "batch", 1: "uzunluk"} for ad in girdi_adlari}, "logits": {0: "batch"}},
+            opset_version=ONNX_OPSET, dynamo=False,
+        )
+    # Yarım kalmış bir nicemleme hazır model sanılmasın diye geçici dosyaya yazıp yerine taşıyoruz
+    quantize_dynamic(fp32_yolu, int8_yolu + ".tmp", weight_type=QuantType.QInt8)
+    os.replace(int8_yolu + ".tmp", int8_yolu)
+    return int8_yolu
+
+
+class OnnxDuyguModeli:
+    """
+    int8 nicemlenmiş modeli ONNX Runtime ile çalıştırır. transformers pipeline'ı ile aynı arayüzü sunar
+    (tokenizer özniteliği, metin listesi -> {'label', 'score'} listesi); etiket adları modelin yapılandırmasından gelir.
+    """
+    def __init__(self, model_adi=MODEL_ADI, klasor=None, is_parcacigi_sayisi=None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        klasor = klasor or ONNX_KLASORU
+        model_yolu = onnx_modelini_hazirla(model_adi, klasor)
+        secenekler = ort.SessionOptions()
+        secenekler.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if is_parcacigi_sayisi:
+            secenekler.intra_op_num_threads = is_parcacigi_sayisi
+        self.oturum = ort.InferenceSession(model_yolu, secenekler, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(klasor)
+        self.etiketler = AutoConfig.from_pretrained(klasor).id2label
+        self._girdi_adlari = [girdi.name for girdi in self.oturum.get_inputs()]
+
+    def __call__(self, metinler, batch_size=TOPLU_BATCH_BOYUTU, truncation=True):
+        if isinstance(metinler, str):
+            metinler = [metinler]
+        tahminler = []
+        for i in range(0, len(metinler), batch_size):
+            kodlanmis = self.tokenizer(metinler[i:i + batch_size], padding=True, truncation=truncation, return_tensors="np")
+            girdiler = {ad: kodlanmis[ad].astype(np.int64) for ad in self._girdi_adlari}
+            logitler = self.oturum.run(None, girdiler)[0]
+            # Softmax (sayısal kararlılık için en büyük logit çıkarılarak)
+            olasiliklar = np.exp(logitler - logitler.max(axis=1, keepdims=True))
+            olasiliklar /= olasiliklar.sum(axis=1, keepdims=True)
+            for satir in olasiliklar:
+                sinif = int(satir.argmax())
+                tahminler.append({'label': self.etiketler[sinif], 'score': float(satir[sinif])})
+        return tahminler
+
+
+def _karsilastirma_basliklari(duygu_dosyasi, sirket_adi):
+    """ Duygu dosyasının kapsadığı dönemin başlıklarını sayfa arşivinden (yoksa ağdan çekip arşivleyerek) toplar. """
+    from haber_cekici import arsivden_ayikla, fetch_range
+    from sayfa_arsivi import SayfaArsivi
+
+    tarihler = pd.to_datetime(pd.read_csv(duygu_dosyasi)['Date'])
+    baslangic, bitis = tarihler.min().date(), tarihler.max().date()
+    arsiv = SayfaArsivi()
+    gunluk = arsivden_ayikla(sirket_adi, baslangic, bitis, arsiv=arsiv)
+    if not gunluk:
+        print(f"Arşivde {baslangic} - {bitis} için sayfa yok, haberler çekilip arşivleniyor...")
+        cekilenler = fetch_range(sirket_adi, baslangic, bitis, arsiv=arsiv)
+        gunluk = {gun: sonuc['basliklar'] for gun, sonuc in cekilenler.items() if sonuc['hata'] is None}
+    return gunluk
+
+
+def _hiz_olc(basliklar, batch_boyutu, arka_uc):
+    # Model yükleme ve ilk çağrının ısınma maliyeti ölçüme katılmaz
+    modelle_tahmin_et(basliklar[:batch_boyutu], batch_boyutu, arka_uc)
+    t0 = time.perf_counter()
+    tahminler = modelle_tahmin_et(basliklar, batch_boyutu, arka_uc)
+    return tahminler, time.perf_counter() - t0
+
+
+def arka_uclari_karsilastir(gunluk_basliklar, batch_boyutu=TOPLU_BATCH_BOYUTU):
+    """
+    fp32 transformers pipeline'ı ile int8 ONNX modelini aynı başlıklar üzerinde karşılaştırır.
+
+    Args:
+        gunluk_basliklar (dict): Gün -> başlık listesi.
+
+    Returns:
+        dict: Etiket uyumu, gün bazında skor farkı ve arka uç başına başlık/sn.
+    """
+    basliklar = list(dict.fromkeys(b for liste in gunluk_basliklar.values() for b in liste))
+    if not basliklar:
+        raise ValueError("Karşılaştırılacak başlık bulunamadı.")
+
+    fp32, fp32_suresi = _hiz_olc(basliklar, batch_boyutu, "transformers")
+    int8, int8_suresi = _hiz_olc(basliklar, batch_boyutu, "onnx")
+
+    fp32_etiketler = [t['label'] for t in fp32]
+    int8_etiketler = [t['label'] for t in int8]
+    uyusmayanlar = pd.crosstab(pd.Series(fp32_etiketler, name='fp32'), pd.Series(int8_etiketler, name='int8'))
+
+    def gunluk_skorlar(etiketler):
+        skor = dict(zip(basliklar, (ETIKET_SKORLARI.get(e, 0) for e in etiketler)))
+        return np.array([np.mean([skor[b] for b in liste]) for liste in gunluk_basliklar.values() if liste])
+
+    gun_farki = np.abs(gunluk_skorlar(fp32_etiketler) - gunluk_skorlar(int8_etiketler))
+    return {
+        'baslik_sayisi': len(basliklar),
+        'gun_sayisi': int(sum(1 for liste in gunluk_basliklar.values() if liste)),
+        'etiket_uyumu': float(np.mean(np.array(fp32_etiketler) == np.array(int8_etiketler))),
+        'karisiklik_matrisi': {f"{a}->{b}": int(uyusmayanlar.loc[a, b]) for a in uyusmayanlar.index for b in uyusmayanlar.columns},
+        'gunluk_skor_farki': {
+            'ortalama': float(gun_farki.mean()),
+            'en_buyuk': float(gun_farki.max()),
+            'ayni_skorlu_gun_orani': float(np.mean(gun_farki < 1e-9)),
+        },
+        'baslik_per_sn': {
+            'transformers_fp32': len(basliklar) / fp32_suresi,
+            'onnx_int8': len(basliklar) / int8_suresi,
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="int8 ONNX duygu modelini fp32 modele karşı etiket uyumu ve hız açısından karşılaştırır."
+    )
+    parser.add_argument("--duygu-dosyasi", default="thy_duygu_skorlari.csv", help="Dönemi belirleyen duygu skorları CSV'si")
+    parser.add_argument("--sirket", default="THY", help="Başlıkları aranan şirket adı")
+    parser.add_argument("--batch", type=int, default=TOPLU_BATCH_BOYUTU, help="Çıkarım batch boyutu")
+    parser.add_argument("--cikti", default=CIKTI_DOSYASI, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    sonuc = arka_uclari_karsilastir(_karsilastirma_basliklari(args.duygu_dosyasi, args.sirket), args.batch)
+    rapor = {
+        'meta': {
+            'tarih': datetime.datetime.now().isoformat(timespec='seconds'),
+            'model': MODEL_ADI,
+            'duygu_dosyasi': args.duygu_dosyasi,
+            'platform': platform.platform(),
+            'batch': args.batch,
+        },
+        'sonuclar': sonuc,
+    }
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(rapor, f, indent=2, ensure_ascii=False)
+
+    print(f"\nSonuçlar '{args.cikti}' dosyasına kaydedildi.")
+    print(f"- {sonuc['baslik_sayisi']} başlık, {sonuc['gun_sayisi']} gün")
+    print(f"- Etiket uyumu: %{100 * sonuc['etiket_uyumu']:.2f}")
+    print(f"- Günlük skor farkı: ortalama {sonuc['gunluk_skor_farki']['ortalama']:.4f}, "
+          f"en büyük {sonuc['gunluk_skor_farki']['en_buyuk']:.4f}")
+    for arka_uc, hiz in sonuc['baslik_per_sn'].items():
+        print(f"- {arka_uc}: {hiz:,.1f} başlık/sn")
\ No newline at end of file
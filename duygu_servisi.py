@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import json
+import socket
+
+from duygu_analizi import (TOPLU_BATCH_BOYUTU, basliklari_skorla, duygu_modeli, modelle_tahmin_et,
+                           onbellek_model_adi, varsayilan_onbellek)
+
+VARSAYILAN_ADRES = "127.0.0.1:8788"
+# Batch'i doldurmak için ilk istekten sonra diğer isteklerin en fazla bu kadar saniye beklenmesi
+TOPLAMA_SURESI = 0.01
+ZAMAN_ASIMI = 120.0
+# Tek satırlık bir istek/yanıt için üst sınır (binlerce başlıklık istekler sığsın diye yüksek tutuldu)
+SATIR_SINIRI = 64 * 1024 * 1024
+
+
+def _adresi_coz(adres):
+    """ "unix:/yol/servis.sock" veya "host:port" biçimindeki adresi çözer. """
+    if adres.startswith("unix:"):
+        return "unix", adres[len("unix:"):]
+    host, _, port = adres.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class DuyguServisi:
+    """
+    Modeli bellekte sıcak tutan yerel skorlama servisi. İstemciler satır başına bir JSON
+    ({"basliklar": [...]}) gönderir, aynı sırayla {"tahminler": [...]} veya {"hata": "..."} alır. Her yanıt
+    tahminlerin hangi modelle üretildiğini (duygu_analizi.onbellek_model_adi, örn. int8 ONNX) "model" alanında taşır.
+
+    Eş zamanlı gelen istekler birleştirilir: ilk istekten sonra TOPLAMA_SURESI kadar (ya da batch dolana kadar)
+    beklenen istekler tek bir model çağrısında skorlanır, tekrar eden başlıklar bir kez skorlanır.
+    Skorlar servisin önbelleğine de yazılır.
+    """
+    def __init__(self, adres=VARSAYILAN_ADRES, batch_boyutu=TOPLU_BATCH_BOYUTU, toplama_suresi=TOPLAMA_SURESI,
+                 onbellek=None):
+        self.adres = adres
+        self.batch_boyutu = batch_boyutu
+        self.toplama_suresi = toplama_suresi
+        self.onbellek = onbellek
+        self.model_adi = onbellek_model_adi()
+        self._kuyruk = None
+
+    def _skorla(self, basliklar):
+        return basliklari_skorla(basliklar, self.batch_boyutu, onbellek=self.onbellek, tahminci=modelle_tahmin_et)
+
+    async def _toplayici(self):
+        dongu = asyncio.get_running_loop()
+        while True:
+            bekleyenler = [await self._kuyruk.get()]
+            baslik_sayisi = len(bekleyenler[0][0])
+            son_an = dongu.time() + self.toplama_suresi
+            while baslik_sayisi < self.batch_boyutu:
+                kalan = son_an - dongu.time()
+                if kalan <= 0:
+                    break
+                try:
+                    bekleyen = await asyncio.wait_for(self._kuyruk.get(), kalan)
+                except asyncio.TimeoutError:
+                    break
+                bekleyenler.append(bekleyen)
+                baslik_sayisi += len(bekleyen[0])
+
+            tekil = list(dict.fromkeys(b for basliklar, _ in bekleyenler for b in basliklar))
+            try:
+                # Model çağrısı ayrı iş parçacığında çalışır; bu sırada yeni istekler kabul edilip kuyruğa alınır
+                tahminler = dict(zip(tekil, await dongu.run_in_executor(None, self._skorla, tekil)))
+            except Exception as e:
+                for _, sonuc in bekleyenler:
+                    if not sonuc.done():
+                        sonuc.set_exception(e)
+                continue
+            for basliklar, sonuc in bekleyenler:
+                if not sonuc.done():
+                    sonuc.set_result([tahminler[b] for b in basliklar])
+
+    async def _istemci(self, okuyucu, yazici):
+        dongu = asyncio.get_running_loop()
+        try:
+            while satir := await okuyucu.readline():
+                try:
+                    basliklar = json.loads(satir)['basliklar']
+                    sonuc = dongu.create_future()
+                    await self._kuyruk.put((basliklar, sonuc))
+                    yanit = {'tahminler': await sonuc, 'model': self.model_adi}
+                except Exception as e:
+                    yanit = {'hata': f"{type(e).__name__}: {e}", 'model': self.model_adi}
+                yazici.write(json.dumps(yanit, ensure_ascii=False).encode("utf-8") + b"\n")
+                await yazici.drain()
+        except ConnectionError:
+            pass
+        finally:
+            yazici.close()
+
+    async def calistir(self):
+        self._kuyruk = asyncio.Queue()
+        if self.onbellek is None:
+            self.onbellek = varsayilan_onbellek()
+        # İlk istek model yüklenmesini beklemesin diye model servis açılmadan yüklenir
+        duygu_modeli()
+        tur, hedef = _adresi_coz(self.adres)
+        if tur == "unix":
+            sunucu = await asyncio.start_unix_server(self._istemci, path=hedef, limit=SATIR_SINIRI)
+        else:
+            sunucu = await asyncio.start_server(self._istemci, *hedef, limit=SATIR_SINIRI)
+        toplayici = asyncio.create_task(self._toplayici())
+        print(f"Duygu skorlama servisi {self.adres} adresinde hazır.")
+        try:
+            async with sunucu:
+                await sunucu.serve_forever()
+        finally:
+            toplayici.cancel()
+
+
+def servisten_tahmin_et(basliklar, adres=VARSAYILAN_ADRES, zaman_asimi=ZAMAN_ASIMI, model_adi=None):
+    """
+    Başlıkları çalışan bir DuyguServisi'ne skorlatır.
+
+    Args:
+        model_adi (str, optional): Beklenen model (önbellek anahtarı); verilirse servis başka bir modelle
+            (örn. fp32 yerine int8 ONNX) skorluyorsa tahminler kullanılmaz.
+
+    Returns:
+        list: Girdiyle aynı sırada {'label', 'score'} tahminleri.
+
+    Raises:
+        OSError: Servise bağlanılamazsa.
+        RuntimeError: Servis hata döndürürse ya da beklenenden farklı bir modelle skorluyorsa.
+    """
+    tur, hedef = _adresi_coz(adres)
+    if tur == "unix":
+        baglanti = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        baglanti.settimeout(zaman_asimi)
+        baglanti.connect(hedef)
+    else:
+        baglanti = socket.create_connection(hedef, timeout=zaman_asimi)
+    with baglanti, baglanti.makefile("rwb") as dosya:
+        dosya.write(json.dumps({'basliklar': list(basliklar)}, ensure_ascii=False).encode("utf-8") + b"\n")
+        dosya.flush()
+        yanit = json.loads(dosya.readline())
+    if model_adi is not None and yanit.get('model') != model_adi:
+        raise RuntimeError(
+            f"Duygu servisi '{yanit.get('model')}' modeliyle skorluyor, bu süreç '{model_adi}' bekliyor; "
+            f"servisi ve istemciyi aynı DUYGU_ARKA_UCU ile çalıştırın."
+        )
+    if 'hata' in yanit:
+        raise RuntimeError(f"Duygu servisi hata döndürdü: {yanit['hata']}")
+    return yanit['tahminler']
+
+
+def servis_tahmincisi(adres, model_adi=None):
+    """
+    basliklari_skorla için tahminci: servise ulaşılabiliyorsa onu, ulaşılamıyorsa (bir uyarıyla) bu süreçte
+    yüklenen modeli kullanır. Servisin modeli model_adi'ndan (varsayılan bu sürecin onbellek_model_adi'ndan)
+    farklıysa tahminleri önbelleğe yanlış anahtarla yazılmasın diye hata verir.
+    """
+    model_adi = model_adi or onbellek_model_adi()
+
+    def tahmin_et(basliklar, batch_boyutu):
+        try:
+            return servisten_tahmin_et(basliklar, adres, model_adi=model_adi)
+        except OSError as e:
+            print(f"UYARI: Duygu servisine ({adres}) ulaşılamadı ({e}); model bu süreçte yükleniyor.")
+            return modelle_tahmin_et(basliklar, batch_boyutu)
+    return tahmin_et
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Duygu modelini sıcak tutan yerel skorlama servisini başlatır.")
+    parser.add_argument("--adres", default=VARSAYILAN_ADRES, help='"host:port" veya "unix:/yol/servis.sock"')
+    parser.add_argument("--batch", type=int, default=TOPLU_BATCH_BOYUTU, help="Birleştirilen isteklerin batch boyutu")
+    parser.add_argument("--toplama-suresi", type=float, default=TOPLAMA_SURESI,
+                        help="İstekleri birleştirmek için beklenecek en uzun süre (saniye)")
+    args = parser.parse_args()
+
+    print("İstemcilerde kullanmak için: DUYGU_SERVISI=" + args.adres)
+    try:
+        asyncio.run(DuyguServisi(args.adres, args.batch, args.toplama_suresi).calistir())
+    except KeyboardInterrupt:
+        print("\nServis durduruldu.")
\ No newline at end of file
@@ -1,68 +1,240 @@
-import pandas as pd
 import datetime
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import os # Dosya varlığını kontrol etmek için os kütüphanesini ekledik
 
 # Diğer script'lerimizden fonksiyonları import ediyoruz
-from haber_cekici import haberleri_getir
-from duygu_analizi import gunluk_duygu_skorunu_hesapla
+from haber_cekici import fetch_range
+from islem_takvimi import HABER_SAYISI_SUTUNU, islem_gunleri, seans_pencereleri
+from sayfa_arsivi import SayfaArsivi
+from duygu_analizi import duygu_skorlarini_toplu_hesapla, haber_sayilari
 
 # --- PARAMETRELER ---
 HİSSE_KODU = "THY"
 BASLANGIC_TARIHI = "2020-01-01"
 BITIS_TARIHI = "2024-12-31"
 CIKTI_DOSYASI = "thy_duygu_skorlari.csv"
+# Haberleri aranacak şirket adı -> birleştirilmiş skorların yazılacağı dosya (birden fazla şirket eklenebilir)
+SIRKETLER = {HİSSE_KODU: CIKTI_DOSYASI}
+# Her ay ayrı bir parçadır ve ayrı bir süreçte çekilir; skorlar ana süreçte parça dosyalarına yalnızca ekleme yaparak yazılır
+PARCA_KLASORU = "duygu_parcalari"
+ISCI_SAYISI = os.cpu_count() or 1
+# Tüm süreçler için toplam sınırlar (süreç başına düşen pay otomatik hesaplanır)
+ESZAMANLI_ISTEK = 8
+SANIYEDE_ISTEK = 4.0
+# Haberler gün gün değil bu kadar günlük aramalarla çekilip yayın günlerine dağıtılır (1: her gün ayrı aranır)
+PENCERE_GUN = 7
 # --------------------
 
+
+def _parca_dosyasi(sirket_adi, ay, klasor=PARCA_KLASORU):
+    return os.path.join(klasor, sirket_adi.replace(" ", "_").replace("/", "_"), f"{ay}.csv")
+
+
+def _skorlari_oku(dosya):
+    """
+    Skor CSV'sini okur; yarıda kesilmiş bir eklemeden kalan bozuk son satır atlanır. Başlık sayısı sütunu olmayan
+    eski dosyalarda bu sütun boş (NaN) döner.
+    """
+    if not os.path.exists(dosya):
+        return pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'sentiment_score': pd.Series(dtype=float),
+                             HABER_SAYISI_SUTUNU: pd.Series(dtype=float)})
+    df = pd.read_csv(dosya, on_bad_lines='skip')
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+    df['sentiment_score'] = pd.to_numeric(df['sentiment_score'], errors='coerce')
+    df[HABER_SAYISI_SUTUNU] = pd.to_numeric(df.get(HABER_SAYISI_SUTUNU), errors='coerce')
+    return df.dropna(subset=['Date', 'sentiment_score'])
+
+
+def tamamlanan_gunler(sirket_adi, cikti_dosyasi, klasor=PARCA_KLASORU):
+    """ Birleştirilmiş çıktıda veya herhangi bir parça dosyasında skoru bulunan günler. """
+    gunler = set(_skorlari_oku(cikti_dosyasi)['Date'])
+    sirket_klasoru = os.path.dirname(_parca_dosyasi(sirket_adi, "x", klasor))
+    if os.path.isdir(sirket_klasoru):
+        for ad in os.listdir(sirket_klasoru):
+            if ad.endswith(".csv"):
+                gunler.update(_skorlari_oku(os.path.join(sirket_klasoru, ad))['Date'])
+    return gunler
+
+
+def hedef_pencereleri(baslangic_tarihi, bitis_tarihi):
+    """
+    Skoru hesaplanacak seanslar ve her seansın haber penceresi. Skorlar yalnızca işlem seansları için hesaplanır;
+    hafta sonu ve tatil günlerinin haberleri ayrı ayrı çekilip sonra atılmak yerine bir sonraki seansın penceresine
+    dahil edilir (bkz. islem_takvimi.seans_pencereleri). Takvim alınamazsa her takvim günü ayrı bir pencere olur.
+
+    Returns:
+        dict: Seans tarihi (pd.Timestamp) -> (pencerenin ilk günü, seans günü)
+    """
+    seanslar = islem_gunleri(baslangic_tarihi, bitis_tarihi)
+    if len(seanslar) == 0:
+        print("UYARI: İşlem takvimi alınamadı, tüm takvim günleri ayrı ayrı işlenecek.")
+        gunler = pd.date_range(start=baslangic_tarihi, end=bitis_tarihi, freq='D')
+        return {gun: (gun.date(), gun.date()) for gun in gunler}
+    return dict(zip(seanslar, seans_pencereleri(seanslar, baslangic_tarihi)))
+
+
+def eksik_gunler(sirket_adi, cikti_dosyasi, hedefler, klasor=PARCA_KLASORU):
+    """ Boşluk tespiti: hedef seanslardan henüz skoru olmayanlar (ortadaki boşluklar dahil). """
+    tamamlanan = tamamlanan_gunler(sirket_adi, cikti_dosyasi, klasor)
+    return [gun for gun in hedefler if gun not in tamamlanan]
+
+
+def isci_hazirla(isci_sayisi):
+    """
+    Süreç havuzu başlatıcısı: her işçinin torch iş parçacığı sayısını çekirdek sayısının işçilere düşen payıyla
+    sınırlar. Aksi halde N işçinin her biri tüm çekirdekleri kullanmaya çalışır (N×N iş parçacığı).
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // isci_sayisi))
+
+
+def parcayi_cek(ay, sirket_pencereleri, eszamanli=ESZAMANLI_ISTEK, saniyede_istek=SANIYEDE_ISTEK,
+                pencere_gun=PENCERE_GUN):
+    """
+    Bir ayın eksik seanslarının başlıklarını tüm şirketler için çeker (skorlamaz). Ayın ilk seans penceresi önceki
+    aya taşabildiğinden sayfalar o ayın arşiv dosyalarına da yazılabilir; SayfaArsivi yazımları ay dosyası başına
+    kilitlediği için paralel işçiler güvenle arşivler. Seans pencerelerinin kapsadığı günler pencere_gun günlük
+    aramalarla çekilir. Başlıklar takvim günü bazında döner: skorlar da gün bazında yazılır ve seans skoru, eski günlük
+    dosyalarda olduğu gibi, verileri_birlestir'de penceredeki günlük skorların ortalaması olarak hesaplanır
+    (bkz. islem_takvimi.seanslara_topla). Penceresinde alınamayan bir gün olan seansların hiçbir günü sonuca
+    girmez; boşluk tespiti onları bir sonraki çalıştırmada yeniden dener.
+
+    Args:
+        ay (str): "YYYY-MM".
+        sirket_pencereleri (dict): Şirket adı -> o aydaki eksik seansların (ilk gün, seans günü) pencereleri.
+
+    Returns:
+        dict: Şirket adı -> ({gün "YYYY-MM-DD": başlık listesi}, alınamayan seans sayısı)
+    """
+    arsiv = SayfaArsivi()
+    sonuc = {}
+    for sirket_adi, pencereler in sirket_pencereleri.items():
+        gunler = fetch_range(sirket_adi, min(ilk for ilk, _ in pencereler), max(son for _, son in pencereler),
+                             pencere_gun, eszamanli=eszamanli, saniyede_istek=saniyede_istek, arsiv=arsiv)
+        basarili = {}
+        hata_sayisi = 0
+        for ilk_gun, seans_gunu in sorted(pencereler, key=lambda pencere: pencere[1]):
+            pencere_gunleri = [ilk_gun + datetime.timedelta(days=i) for i in range((seans_gunu - ilk_gun).days + 1)]
+            if all(gunler[gun]['hata'] is None for gun in pencere_gunleri):
+                basarili.update((gun.strftime("%Y-%m-%d"), gunler[gun]['basliklar']) for gun in pencere_gunleri)
+            else:
+                hata_sayisi += 1
+        sonuc[sirket_adi] = (basarili, hata_sayisi)
+    return sonuc
+
+
+def _skorlari_csv_yaz(df, dosya):
+    # Yarıda kesilen bir yazım dosyayı bozmasın diye önce geçici dosyaya yazıp yerine taşıyoruz
+    df = df.assign(Date=df['Date'].dt.strftime('%Y-%m-%d'))
+    df[HABER_SAYISI_SUTUNU] = df[HABER_SAYISI_SUTUNU].astype('Int64')
+    df.to_csv(dosya + ".tmp", index=False)
+    os.replace(dosya + ".tmp", dosya)
+
+
+def skorlari_yaz(sirket_adi, ay, skorlar, sayilar, klasor=PARCA_KLASORU):
+    """
+    Günlük skorları ve başlık sayılarını şirketin o aya ait parça dosyasına ekler. Haber olmayan günler de
+    (0 skor, 0 başlık) yazılır ki boşluk tespiti onları tamamlanmış saysın.
+    """
+    dosya = _parca_dosyasi(sirket_adi, ay, klasor)
+    os.makedirs(os.path.dirname(dosya), exist_ok=True)
+    baslik = f"Date,sentiment_score,{HABER_SAYISI_SUTUNU}\n"
+    if os.path.exists(dosya):
+        with open(dosya, encoding="utf-8") as f:
+            eski_baslik = f.readline()
+        if eski_baslik != baslik:
+            # Başlık sayısı sütunu olmayan eski parça dosyası bir kez yeni düzene çevrilir
+            _skorlari_csv_yaz(_skorlari_oku(dosya), dosya)
+    yeni_dosya = not os.path.exists(dosya)
+    # Yalnızca yeni satırlar eklenir; kayıt maliyeti dosyanın mevcut boyutundan bağımsızdır
+    with open(dosya, "a", encoding="utf-8", newline="") as f:
+        if yeni_dosya:
+            f.write(baslik)
+        f.writelines(f"{tarih_str},{skor},{sayilar[tarih_str]}\n" for tarih_str, skor in skorlar.items())
+
+
+def parcayi_skorla(ay, cekilenler, klasor=PARCA_KLASORU):
+    """
+    parcayi_cek'in (işçi süreçte) çektiği başlıkları bu süreçte skorlar ve ayın parça dosyalarına ekler.
+
+    Args:
+        ay (str): "YYYY-MM".
+        cekilenler (dict): parcayi_cek çıktısı.
+
+    Returns:
+        dict: Şirket adı -> alınamayan seans sayısı
+    """
+    ozet = {}
+    for sirket_adi, (basarili, hata_sayisi) in cekilenler.items():
+        skorlari_yaz(sirket_adi, ay, duygu_skorlarini_toplu_hesapla(basarili), haber_sayilari(basarili), klasor)
+        ozet[sirket_adi] = hata_sayisi
+    return ozet
+
+
+def parcalari_birlestir(sirket_adi, cikti_dosyasi, klasor=PARCA_KLASORU):
+    """
+    Mevcut çıktı ile şirketin tüm parça dosyalarını tarih sıralı tek bir CSV'de birleştirir (aynı gün için son kayıt geçerlidir).
+
+    Returns:
+        pd.DataFrame: Birleştirilmiş skorlar.
+    """
+    parcalar = [_skorlari_oku(cikti_dosyasi)]
+    sirket_klasoru = os.path.dirname(_parca_dosyasi(sirket_adi, "x", klasor))
+    if os.path.isdir(sirket_klasoru):
+        parcalar += [_skorlari_oku(os.path.join(sirket_klasoru, ad)) for ad in sorted(os.listdir(sirket_klasoru))
+                     if ad.endswith(".csv")]
+    df = pd.concat(parcalar, ignore_index=True)
+    df = df.drop_duplicates('Date', keep='last').sort_values('Date')
+    _skorlari_csv_yaz(df, cikti_dosyasi)
+    return df.assign(Date=df['Date'].dt.strftime('%Y-%m-%d'))
+
+
 if __name__ == "__main__":
-    sonuclar = []
-    baslangic_gunu = pd.to_datetime(BASLANGIC_TARIHI)
-
-    # --- YENİ EKLENEN KISIM: KAYIT KONTROLÜ VE YÜKLEME ---
-    if os.path.exists(CIKTI_DOSYASI):
-        print(f"'{CIKTI_DOSYASI}' bulundu. Mevcut ilerleme yükleniyor...")
-        df_mevcut = pd.read_csv(CIKTI_DOSYASI)
-        # to_dict('records') ile DataFrame'i orijinal 'sonuclar' listesi formatına çeviriyoruz
-        sonuclar = df_mevcut.to_dict('records')
-        
-        # Son kaydedilen tarihten bir sonraki günden devam etmek için başlangıç gününü ayarla
-        son_tarih_str = df_mevcut['Date'].iloc[-1]
-        baslangic_gunu = pd.to_datetime(son_tarih_str) + datetime.timedelta(days=1)
-        print(f"İşleme {baslangic_gunu.strftime('%Y-%m-%d')} tarihinden devam edilecek.")
-    else:
-        print("Yeni bir hesaplama başlatılıyor...")
+    pencereler = hedef_pencereleri(BASLANGIC_TARIHI, BITIS_TARIHI)
+
+    # --- KAYIT KONTROLÜ: çıktıda veya parça dosyalarında skoru olmayan seanslar (boşluklar dahil) işlenir ---
+    aylik_isler = {}
+    toplam_eksik = 0
+    for sirket_adi, cikti_dosyasi in SIRKETLER.items():
+        eksikler = eksik_gunler(sirket_adi, cikti_dosyasi, pencereler)
+        toplam_eksik += len(eksikler)
+        print(f"'{sirket_adi}': {len(pencereler)} seansın {len(eksikler)} tanesinin duygu skoru eksik.")
+        for gun in eksikler:
+            aylik_isler.setdefault(gun.strftime("%Y-%m"), {}).setdefault(sirket_adi, []).append(pencereler[gun])
     # ----------------------------------------------------
 
-    tarih_araligi = pd.date_range(start=baslangic_gunu, end=BITIS_TARIHI, freq='D')
-    
-    if tarih_araligi.empty:
+    if not aylik_isler:
         print("Hesaplanacak yeni tarih bulunmuyor. İşlem tamamlanmış.")
     else:
-        print(f"'{baslangic_gunu.strftime('%Y-%m-%d')}' ve '{BITIS_TARIHI}' arasındaki günler için duygu skorları hesaplanacak.")
+        isci_sayisi = max(1, min(ISCI_SAYISI, len(aylik_isler)))
+        print(f"{len(aylik_isler)} aylık parça {isci_sayisi} süreçte işlenecek.")
         print("Bu işlem internet hızınıza ve gün sayısına bağlı olarak UZUN sürebilir.")
-        
-        # tqdm'a başlangıç değerini vererek ilerleme çubuğunun doğru yerden başlamasını sağlıyoruz
-        progress_bar = tqdm(tarih_araligi, desc="Duygu Skorları Hesaplanıyor", initial=len(sonuclar), total=len(pd.date_range(start=BASLANGIC_TARIHI, end=BITIS_TARIHI)))
-
-        for gun in progress_bar:
-            tarih_str = gun.strftime("%Y-%m-%d")
-            
-            haberler = haberleri_getir(HİSSE_KODU, gun.date())
-            skor = gunluk_duygu_skorunu_hesapla(haberler)
-            
-            sonuclar.append({'Date': tarih_str, 'sentiment_score': skor})
-
-            # --- YENİ EKLENEN KISIM: PERİYODİK KAYDETME ---
-            # Her 20 günde bir ilerlemeyi dosyaya yazarak checkpoint oluşturuyoruz.
-            if progress_bar.n % 20 == 0:
-                df_ara_kayit = pd.DataFrame(sonuclar)
-                df_ara_kayit.to_csv(CIKTI_DOSYASI, index=False)
-            # -----------------------------------------------
-
-        # Son kaydı da yap
-        df_sonuclar = pd.DataFrame(sonuclar)
-        df_sonuclar.to_csv(CIKTI_DOSYASI, index=False)
-
-        print(f"\nİşlem tamamlandı! Sonuçlar '{CIKTI_DOSYASI}' dosyasına kaydedildi.")
-        print("Son 5 skor:")
-        print(df_sonuclar.tail())
\ No newline at end of file
+
+        # İşçiler yalnızca haberleri çeker; skorlama bu süreçte tek model (ya da DUYGU_SERVISI ayarlıysa sıcak servis)
+        # ile yapılır. Böylece bellekte işçi sayısı kadar model kopyası olmaz ve model tüm çekirdekleri kullanır.
+        progress_bar = tqdm(desc="Duygu Skorları Hesaplanıyor", total=toplam_eksik)
+        with ProcessPoolExecutor(max_workers=isci_sayisi, initializer=isci_hazirla, initargs=(isci_sayisi,)) as havuz:
+            isler = {
+                havuz.submit(parcayi_cek, ay, sirket_pencereleri,
+                             max(1, ESZAMANLI_ISTEK // isci_sayisi), SANIYEDE_ISTEK / isci_sayisi, PENCERE_GUN): ay
+                for ay, sirket_pencereleri in sorted(aylik_isler.items())
+            }
+            for is_ in as_completed(isler):
+                for sirket_adi in parcayi_skorla(isler[is_], is_.result()):
+                    progress_bar.update(len(aylik_isler[isler[is_]][sirket_adi]))
+        progress_bar.close()
+
+        for sirket_adi, cikti_dosyasi in SIRKETLER.items():
+            df_sonuclar = parcalari_birlestir(sirket_adi, cikti_dosyasi)
+            kalan = eksik_gunler(sirket_adi, cikti_dosyasi, pencereler)
+            print(f"\n'{sirket_adi}' sonuçları '{cikti_dosyasi}' dosyasına kaydedildi ({len(df_sonuclar)} gün).")
+            if kalan:
+                print(f"{len(kalan)} gün alınamadı (ilki {kalan[0].strftime('%Y-%m-%d')}); "
+                      f"betiği yeniden çalıştırarak yalnızca bu boşlukları doldurabilirsiniz.")
+            print("Son 5 skor:")
+            print(df_sonuclar.tail())
\ No newline at end of file
@@ -3,8 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from stable_baselines3 import PPO
 
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
+from geriye_donuk_test import al_ve_tut_sonucu
 
 # --- TEST PARAMETRELERİ ---
 MODEL_DOSYASI = "ppo_champion_model" # Şampiyon modelimizin adı
@@ -16,7 +17,7 @@ TEST_BITIS_TARIHI = "2025-09-12" # Bugünün tarihi
 
 # --- Test Script'inin Geri Kalanı ---
 print("Test verisi çekiliyor...")
-test_verisi = veri_cek_ve_hazirla(
+test_verisi = veri_seti_hazirla(
     hisse_kodu=HİSSE_KODU,
     baslangic_tarihi=TEST_BASLANGIC_TARIHI,
     bitis_tarihi=TEST_BITIS_TARIHI
@@ -38,9 +39,7 @@ if test_verisi is not None and len(test_verisi) > 2:
     print("Test simülasyonu tamamlandı.")
 
     ppo_sonuc = info['toplam_portfoy_degeri']
-    ilk_fiyat = test_verisi['Close'].iloc[0]
-    son_fiyat = test_verisi['Close'].iloc[-1]
-    al_ve_tut_sonuc = (BASLANGIC_BAKIYE / ilk_fiyat) * son_fiyat
+    al_ve_tut_sonuc = al_ve_tut_sonucu(env.fiyatlar, BASLANGIC_BAKIYE)
 
     print("\n--- ŞAMPİYON AJAN NİHAİ TEST SONUÇLARI ---")
     print(f"Başlangıç Bakiyesi: {BASLANGIC_BAKIYE:,.2f} TL")
@@ -0,0 +1,70 @@
+import numpy as np
+
+from ticaret_ortami import islemleri_uygula
+
+
+def aksiyonlari_test_et(aksiyonlar, fiyatlar, baslangic_bakiye=10000, islem_maliyeti=0.001, baslangic_adimi=0):
+    """
+    Bir aksiyon dizisini (veya aksiyon dizileri yığınını) TicaretOrtami.step kurallarıyla fiyat serisi üzerinde oynatır.
+    Zaman ekseninde döngü kurulur, stratejiler ise aynı anda NumPy dizileri olarak işlenir.
+
+    Args:
+        aksiyonlar (array-like): (T,) veya (S, T) aksiyonlar (0: Al, 1: Sat, 2: Bekle).
+        fiyatlar (array-like): (n,) kapanış fiyatları, örn. TicaretOrtami.fiyatlar.
+        baslangic_bakiye (float): Her stratejinin başlangıç nakdi.
+        islem_maliyeti (float): Oransal işlem maliyeti.
+        baslangic_adimi (int): İlk aksiyonun uygulandığı fiyat indeksi (pencereli modda sequence_length - 1).
+
+    Returns:
+        dict: 'portfoy_degerleri' (S, T+1) başlangıç dahil portföy değeri eğrileri,
+              'alimlar' / 'satimlar' (S, T) gerçekleşen işlem maskeleri,
+              'son_degerler' (S,), 'bakiye' (S,), 'hisse_sayisi' (S,).
+              Tek boyutlu aksiyon verilirse strateji ekseni düşürülür.
+    """
+    aksiyonlar = np.asarray(aksiyonlar)
+    tekil = aksiyonlar.ndim == 1
+    aksiyonlar = np.atleast_2d(aksiyonlar)
+    fiyatlar = np.asarray(fiyatlar, dtype=np.float64)
+
+    strateji_sayisi, adim_sayisi = aksiyonlar.shape
+    # Ortam son fiyata ulaştığında bölümü bitirir; o noktadan sonraki aksiyonlar işlem görmez
+    azami_adim = len(fiyatlar) - 1 - baslangic_adimi
+    if adim_sayisi > azami_adim:
+        raise ValueError(f"En fazla {azami_adim} aksiyon oynatılabilir, {adim_sayisi} verildi.")
+
+    # Döngü zaman ekseninde ilerlediği için diziler zaman-öncelikli tutulur, her adım bitişik bir satırdır
+    aksiyonlar_t = np.ascontiguousarray(aksiyonlar.T)
+    bakiye = np.full(strateji_sayisi, baslangic_bakiye, dtype=np.float64)
+    hisse_sayisi = np.zeros(strateji_sayisi, dtype=np.int64)
+    portfoy_degerleri = np.empty((adim_sayisi + 1, strateji_sayisi), dtype=np.float64)
+    portfoy_degerleri[0] = baslangic_bakiye
+    alimlar = np.empty((adim_sayisi, strateji_sayisi), dtype=bool)
+    satimlar = np.empty((adim_sayisi, strateji_sayisi), dtype=bool)
+
+    for t in range(adim_sayisi):
+        fiyat = fiyatlar[baslangic_adimi + t]
+        alimlar[t], satimlar[t] = islemleri_uygula(bakiye, hisse_sayisi, aksiyonlar_t[t], fiyat, islem_maliyeti)
+        np.multiply(hisse_sayisi, fiyat, out=portfoy_degerleri[t + 1])
+        portfoy_degerleri[t + 1] += bakiye
+
+    portfoy_degerleri = portfoy_degerleri.T
+    sonuc = {
+        'portfoy_degerleri': portfoy_degerleri,
+        'alimlar': alimlar.T,
+        'satimlar': satimlar.T,
+        'son_degerler': portfoy_degerleri[:, -1],
+        'bakiye': bakiye,
+        'hisse_sayisi': hisse_sayisi,
+    }
+    if tekil:
+        sonuc = {anahtar: deger[0] for anahtar, deger in sonuc.items()}
+    return sonuc
+
+
+def al_ve_tut_sonucu(fiyatlar, baslangic_bakiye=10000):
+    """
+    Test script'lerindeki 'Al ve Tut' karşılaştırmasını hesaplar: başlangıç bakiyesiyle ilk fiyattan
+    (kesirli) hisse alınır ve son fiyattan değerlenir.
+    """
+    fiyatlar = np.asarray(fiyatlar, dtype=np.float64)
+    return (baslangic_bakiye / fiyatlar[0]) * fiyatlar[-1]
\ No newline at end of file
@@ -0,0 +1,452 @@
+import hashlib
+import math
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# Ortamın kullandığı sütunlar. RSI_14, eğitilmiş modellerle uyum için eski basit ortalamalı RSI'dır;
+# Wilder yumuşatmalı RSI 'rsi' adıyla ayrıca istenebilir.
+VARSAYILAN_GOSTERGELER = {
+    'SMA_14': ('sma', {'pencere': 14}),
+    'RSI_14': ('rsi_basit', {'pencere': 14}),
+}
+
+# Hesaplanan sütunların (veri anahtarı, gösterge, parametreler) bazında tutulduğu önbellek
+ONBELLEK_BOYUTU = 512
+_onbellek = OrderedDict()
+
+
+class _AraSonuclar:
+    """
+    Tek bir gostergeleri_hesapla çağrısındaki göstergelerin ortak ara sonuçlarını (fark, getiri, kayan toplamlar,
+    EMA'lar, gerçek aralık) bir kez hesaplayıp paylaştırır. Diziler zaman eksenindedir (T,) veya (T, hisse).
+    """
+    def __init__(self, girdiler):
+        self.girdiler = girdiler
+        self._sonuclar = {}
+
+    def _getir(self, anahtar, hesapla):
+        if anahtar not in self._sonuclar:
+            self._sonuclar[anahtar] = hesapla()
+        return self._sonuclar[anahtar]
+
+    def kapanis(self):
+        return self.girdiler['Close']
+
+    def fark(self):
+        def hesapla():
+            kapanis = self.kapanis()
+            fark = np.empty_like(kapanis)
+            fark[0] = np.nan
+            fark[1:] = kapanis[1:] - kapanis[:-1]
+            return fark
+        return self._getir('fark', hesapla)
+
+    def kazanc_kayip(self):
+        # pandas'taki delta.where(delta > 0, 0) gibi: NaN farklar 0 sayılır
+        def hesapla():
+            fark = self.fark()
+            with np.errstate(invalid='ignore'):
+                return np.where(fark > 0, fark, 0.0), np.where(fark < 0, -fark, 0.0)
+        return self._getir('kazanc_kayip', hesapla)
+
+    def getiri(self):
+        def hesapla():
+            kapanis = self.kapanis()
+            getiri = np.empty_like(kapanis)
+            getiri[0] = np.nan
+            getiri[1:] = kapanis[1:] / kapanis[:-1] - 1
+            return getiri
+        return self._getir('getiri', hesapla)
+
+    def kayan_ortalama(self, ad, dizi, pencere):
+        return self._getir(('ortalama', ad, pencere), lambda: _kayan_ortalama(dizi, pencere))
+
+    def kayan_std(self, ad, dizi, pencere, ddof):
+        def hesapla():
+            # Sayısal iptali azaltmak için sütun ortalamasına göre kaydırılmış kareler kullanılır
+            kayma = np.nanmean(dizi, axis=0)
+            kaydirilmis = dizi - kayma
+            ortalama = _kayan_ortalama(kaydirilmis, pencere)
+            kare_ortalama = _kayan_ortalama(kaydirilmis * kaydirilmis, pencere)
+            varyans = np.maximum(kare_ortalama - ortalama * ortalama, 0.0) * (pencere / (pencere - ddof))
+            return np.sqrt(varyans)
+        return self._getir(('std', ad, pencere, ddof), hesapla)
+
+    def ema(self, ad, dizi, span):
+        return self._getir(('ema', ad, span), lambda: _ema(dizi, 2.0 / (span + 1)))
+
+    def gercek_aralik(self):
+        def hesapla():
+            yuksek, dusuk, kapanis = self.girdiler['High'], self.girdiler['Low'], self.kapanis()
+            aralik = yuksek - dusuk
+            onceki = kapanis[:-1]
+            aralik[1:] = np.maximum(aralik[1:], np.maximum(np.abs(yuksek[1:] - onceki), np.abs(dusuk[1:] - onceki)))
+            return aralik
+        return self._getir('gercek_aralik', hesapla)
+
+
+def _kayan_ortalama(dizi, pencere):
+    """
+    pandas rolling(pencere).mean() karşılığı: kümülatif toplamla O(T); ilk pencere-1 satır ve
+    içinde NaN bulunan pencereler NaN olur.
+    """
+    dizi = np.asarray(dizi, dtype=np.float64)
+    eksik = np.isnan(dizi)
+    sifirli = np.where(eksik, 0.0, dizi)
+    toplam = np.cumsum(sifirli, axis=0)
+    eksik_sayisi = np.cumsum(eksik, axis=0)
+    sonuc = np.full_like(dizi, np.nan)
+    if len(dizi) < pencere:
+        return sonuc
+    pencere_toplami = toplam[pencere - 1:].copy()
+    pencere_toplami[1:] -= toplam[:-pencere]
+    pencere_eksigi = eksik_sayisi[pencere - 1:].copy()
+    pencere_eksigi[1:] -= eksik_sayisi[:-pencere]
+    sonuc[pencere - 1:] = np.where(pencere_eksigi == 0, pencere_toplami / pencere, np.nan)
+    return sonuc
+
+
+def _ema(dizi, alfa, tohum=None):
+    """
+    y[t] = alfa * x[t] + (1 - alfa) * y[t-1] özyinelemesini lfilter ile (C'de) hesaplar.
+    tohum verilmezse y[0] = x[0] alınır (pandas ewm(adjust=False)). Girdideki NaN'lar sonraki tüm değerlere yayılır.
+    """
+    dizi = np.asarray(dizi, dtype=np.float64)
+    if len(dizi) == 0:
+        return dizi.copy()
+    onceki = dizi[0] if tohum is None else tohum
+    zi = np.expand_dims((1 - alfa) * np.asarray(onceki, dtype=np.float64), 0)
+    sonuc, _ = lfilter([alfa], [1.0, alfa - 1.0], dizi, axis=0, zi=zi)
+    return sonuc
+
+
+def _wilder(dizi, pencere, baslangic):
+    """
+    Wilder yumuşatması: dizi[baslangic : baslangic+pencere] ortalamasıyla başlar, sonra alfa = 1/pencere ile devam eder.
+    """
+    sonuc = np.full_like(dizi, np.nan)
+    tohum_indisi = baslangic + pencere - 1
+    if len(dizi) <= tohum_indisi:
+        return sonuc
+    tohum = dizi[baslangic:tohum_indisi + 1].mean(axis=0)
+    sonuc[tohum_indisi] = tohum
+    sonuc[tohum_indisi + 1:] = _ema(dizi[tohum_indisi + 1:], 1.0 / pencere, tohum=tohum)
+    return sonuc
+
+
+# --- Göstergeler ---
+# Her gösterge (ara sonuçlar, **parametreler) alır; tek dizi ya da {sonek: dizi} sözlüğü döndürür.
+
+def sma(ara, pencere=14):
+    return ara.kayan_ortalama('kapanis', ara.kapanis(), pencere)
+
+
+def ema(ara, span=20):
+    return ara.ema('kapanis', ara.kapanis(), span)
+
+
+def _rsi_formulu(ortalama_kazanc, ortalama_kayip):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + ortalama_kazanc / ortalama_kayip))
+
+
+def rsi_basit(ara, pencere=14):
+    """ Eski _calculate_rsi ile aynı: kazanç ve kayıpların basit kayan ortalaması. """
+    kazanc, kayip = ara.kazanc_kayip()
+    return _rsi_formulu(ara.kayan_ortalama('kazanc', kazanc, pencere), ara.kayan_ortalama('kayip', kayip, pencere))
+
+
+def rsi(ara, pencere=14):
+    """ Wilder yumuşatmalı RSI. """
+    kazanc, kayip = ara.kazanc_kayip()
+    return _rsi_formulu(_wilder(kazanc, pencere, 1), _wilder(kayip, pencere, 1))
+
+
+def macd(ara, hizli=12, yavas=26, sinyal=9):
+    kapanis = ara.kapanis()
+    macd_cizgisi = ara.ema('kapanis', kapanis, hizli) - ara.ema('kapanis', kapanis, yavas)
+    sinyal_cizgisi = _ema(macd_cizgisi, 2.0 / (sinyal + 1))
+    return {'': macd_cizgisi, 'sinyal': sinyal_cizgisi, 'hist': macd_cizgisi - sinyal_cizgisi}
+
+
+def bollinger(ara, pencere=20, k=2.0):
+    orta = ara.kayan_ortalama('kapanis', ara.kapanis(), pencere)
+    std = ara.kayan_std('kapanis', ara.kapanis(), pencere, ddof=0)
+    ust, alt = orta + k * std, orta - k * std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yuzde_b = (ara.kapanis() - alt) / (ust - alt)
+    return {'ust': ust, 'alt': alt, 'yuzde_b': yuzde_b}
+
+
+def atr(ara, pencere=14):
+    """ Wilder ATR; girdilerde 'High' ve 'Low' gerekir. """
+    return _wilder(ara.gercek_aralik(), pencere, 0)
+
+
+def volatilite(ara, pencere=20, yillik=False):
+    """ Günlük getirilerin kayan standart sapması (pandas rolling std gibi ddof=1); yillik=True ise sqrt(252) ile çarpılır. """
+    std = ara.kayan_std('getiri', ara.getiri(), pencere, ddof=1)
+    return std * np.sqrt(252) if yillik else std
+
+
+GOSTERGELER = {
+    'sma': sma,
+    'ema': ema,
+    'rsi': rsi,
+    'rsi_basit': rsi_basit,
+    'macd': macd,
+    'bollinger': bollinger,
+    'atr': atr,
+    'volatilite': volatilite,
+}
+
+
+def _veri_ozeti(girdiler):
+    ozet = hashlib.blake2b(digest_size=16)
+    for ad in ('Close', 'High', 'Low'):
+        if ad in girdiler:
+            dizi = np.ascontiguousarray(girdiler[ad], dtype=np.float64)
+            ozet.update(ad.encode())
+            ozet.update(str(dizi.shape).encode())
+            ozet.update(dizi.tobytes())
+    return ozet.hexdigest()
+
+
+def onbellegi_temizle():
+    _onbellek.clear()
+
+
+def gostergeleri_hesapla(girdiler, istekler=None, anahtar=None):
+    """
+    İstenen göstergeleri ortak ara sonuçları paylaşarak tek geçişte hesaplar.
+
+    Args:
+        girdiler: 'Close' (ve ATR için 'High', 'Low') anahtarlarıyla (T,) veya (T, hisse) diziler; DataFrame de olabilir.
+        istekler (dict): Sütun adı -> (gösterge adı, parametreler), örn. {'EMA_20': ('ema', {'span': 20})}.
+            Birden fazla çıktılı göstergelerde sütunlar ad_sonek olarak adlandırılır (örn. 'MACD_sinyal', 'BB_20_ust').
+            Varsayılan VARSAYILAN_GOSTERGELER.
+        anahtar (hashable, optional): Verilirse (örn. (hisse kodu, ilk tarih, son tarih)) sonuçlar bu anahtar, verinin
+            özeti ve gösterge parametreleriyle önbelleğe alınır; aynı verideki sonraki çağrılar yeniden hesaplamaz.
+
+    Returns:
+        dict: Sütun adı -> salt okunur np.ndarray (float64).
+    """
+    istekler = VARSAYILAN_GOSTERGELER if istekler is None else istekler
+    girdiler = {ad: np.asarray(girdiler[ad], dtype=np.float64) for ad in ('Close', 'High', 'Low') if ad in girdiler}
+    veri_anahtari = None if anahtar is None else (anahtar, _veri_ozeti(girdiler))
+    ara = _AraSonuclar(girdiler)
+
+    sonuclar = {}
+    for sutun, (gosterge, parametreler) in istekler.items():
+        if gosterge not in GOSTERGELER:
+            raise ValueError(f"Bilinmeyen gösterge: '{gosterge}'. Seçenekler: {list(GOSTERGELER)}")
+        onbellek_anahtari = None
+        if veri_anahtari is not None:
+            onbellek_anahtari = (veri_anahtari, gosterge, tuple(sorted(parametreler.items())))
+        cikti = _onbellek.get(onbellek_anahtari) if onbellek_anahtari is not None else None
+        if cikti is not None:
+            _onbellek.move_to_end(onbellek_anahtari)
+
+        if cikti is None:
+            cikti = GOSTERGELER[gosterge](ara, **parametreler)
+            cikti = cikti if isinstance(cikti, dict) else {'': cikti}
+            for dizi in cikti.values():
+                dizi.flags.writeable = False
+            if onbellek_anahtari is not None:
+                _onbellek[onbellek_anahtari] = cikti
+                while len(_onbellek) > ONBELLEK_BOYUTU:
+                    _onbellek.popitem(last=False)
+
+        for sonek, dizi in cikti.items():
+            sonuclar[f"{sutun}_{sonek}" if sonek else sutun] = dizi
+    return sonuclar
+
+# --- Akan (artımlı) hesaplayıcılar ---
+# Yeni bir bar geldiğinde tüm geçmişi yeniden işlemeden sabit zaman ve bellekle güncellenirler.
+# Toplu hesaplamadaki aritmetiği aynı sırayla tekrarladıkları için aynı ilk bardan beslendiklerinde sonuçlar bit bit
+# aynıdır. Durumları düz Python nesneleridir; pickle ile saklanıp ertesi gün kaldığı yerden devam ettirilebilir.
+
+class AkanSMA:
+    """ _kayan_ortalama karşılığı: kümülatif toplam ve son 'pencere' kümülatif toplamın halka tamponu. """
+    def __init__(self, pencere=14):
+        self.pencere = pencere
+        self._toplam = 0.0
+        self._eksik_sayisi = 0
+        # Son 'pencere' barın öncesindeki kümülatif değerler; başlangıçta toplu hesaplamadaki gibi sıfır
+        self._toplamlar = deque([0.0] * pencere, maxlen=pencere)
+        self._eksikler = deque([0] * pencere, maxlen=pencere)
+        self._bar_sayisi = 0
+
+    def guncelle(self, deger):
+        eksik = math.isnan(deger)
+        self._toplam += 0.0 if eksik else deger
+        self._eksik_sayisi += eksik
+        pencere_toplami = self._toplam - self._toplamlar[0]
+        pencere_eksigi = self._eksik_sayisi - self._eksikler[0]
+        self._toplamlar.append(self._toplam)
+        self._eksikler.append(self._eksik_sayisi)
+        self._bar_sayisi += 1
+        if self._bar_sayisi < self.pencere or pencere_eksigi != 0:
+            return math.nan
+        return pencere_toplami / self.pencere
+
+
+class AkanRSIBasit:
+    """ rsi_basit karşılığı (RSI_14): kazanç ve kayıpların AkanSMA'sı. """
+    def __init__(self, pencere=14):
+        self._kazanc = AkanSMA(pencere)
+        self._kayip = AkanSMA(pencere)
+        self._onceki = math.nan
+
+    def guncelle(self, kapanis):
+        fark = kapanis - self._onceki
+        self._onceki = kapanis
+        # NaN farklar toplu hesaplamadaki gibi 0 kazanç / 0 kayıp sayılır
+        ortalama_kazanc = self._kazanc.guncelle(fark if fark > 0 else 0.0)
+        ortalama_kayip = self._kayip.guncelle(-fark if fark < 0 else 0.0)
+        # Sıfır kayıpta numpy'deki gibi sonsuz / NaN üretmek için np.float64 ile bölüyoruz
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(100 - (100 / (1 + np.float64(ortalama_kazanc) / ortalama_kayip)))
+
+
+class AkanGetiri:
+    """ pct_change karşılığı: x / önceki - 1; ilk barda NaN. """
+    def __init__(self):
+        self._onceki = math.nan
+
+    def guncelle(self, kapanis):
+        onceki, self._onceki = self._onceki, kapanis
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(np.float64(kapanis) / onceki - 1)
+
+
+class _ParcaliKayanOrtalama:
+    """
+    _kayan_ortalama'nın parça parça (vektörel) çalışan hali. Kümülatif toplam bir önceki parçanın son değeriyle
+    devam ettirildiği için sonuç, tüm seri tek seferde verilmiş gibi bit bit aynıdır.
+    """
+    def __init__(self, pencere):
+        self.pencere = pencere
+        self._toplam = 0.0
+        self._eksik_sayisi = 0
+        self._son_toplamlar = np.zeros(pencere)
+        self._son_eksikler = np.zeros(pencere, dtype=np.int64)
+        self._bar_sayisi = 0
+
+    def guncelle(self, dizi):
+        eksik = np.isnan(dizi)
+        # Başına önceki toplamı koyarak np.cumsum'un toplama sırasını tüm seriyle aynı tutuyoruz
+        toplam = np.cumsum(np.concatenate(([self._toplam], np.where(eksik, 0.0, dizi))))[1:]
+        eksik_sayisi = self._eksik_sayisi + np.cumsum(eksik)
+        gecmis_toplam = np.concatenate((self._son_toplamlar, toplam))
+        gecmis_eksik = np.concatenate((self._son_eksikler, eksik_sayisi))
+
+        n = len(dizi)
+        pencere_toplami = toplam - gecmis_toplam[:n]
+        pencere_eksigi = eksik_sayisi - gecmis_eksik[:n]
+        gecerli = (np.arange(self._bar_sayisi, self._bar_sayisi + n) >= self.pencere - 1) & (pencere_eksigi == 0)
+        sonuc = np.where(gecerli, pencere_toplami / self.pencere, np.nan)
+
+        if n:
+            self._toplam = toplam[-1]
+            self._eksik_sayisi = eksik_sayisi[-1]
+        self._son_toplamlar = gecmis_toplam[-self.pencere:]
+        self._son_eksikler = gecmis_eksik[-self.pencere:]
+        self._bar_sayisi += n
+        return sonuc
+
+
+class ParcaliGostergeler:
+    """
+    Ortamın göstergelerini (SMA ve eski basit RSI) bellekten büyük seriler için parça parça hesaplar.
+    Her parça vektörel işlenir, parçalar arasında yalnızca pencere kadar durum taşınır ve sonuçlar
+    gostergeleri_hesapla(VARSAYILAN_GOSTERGELER) ile bit bit aynıdır.
+    """
+    def __init__(self, pencere=14):
+        self.pencere = pencere
+        self._sma = _ParcaliKayanOrtalama(pencere)
+        self._kazanc = _ParcaliKayanOrtalama(pencere)
+        self._kayip = _ParcaliKayanOrtalama(pencere)
+        self._onceki = np.nan
+
+    def guncelle(self, kapanislar):
+        """
+        Args:
+            kapanislar (np.ndarray): Serinin sıradaki parçasına ait kapanışlar.
+
+        Returns:
+            dict: {'SMA_<pencere>': dizi, 'RSI_<pencere>': dizi}
+        """
+        kapanislar = np.asarray(kapanislar, dtype=np.float64)
+        fark = kapanislar - np.concatenate(([self._onceki], kapanislar[:-1]))
+        if len(kapanislar):
+            self._onceki = kapanislar[-1]
+        with np.errstate(invalid='ignore'):
+            kazanc, kayip = np.where(fark > 0, fark, 0.0), np.where(fark < 0, -fark, 0.0)
+        return {
+            f'SMA_{self.pencere}': self._sma.guncelle(kapanislar),
+            f'RSI_{self.pencere}': _rsi_formulu(self._kazanc.guncelle(kazanc), self._kayip.guncelle(kayip)),
+        }
+
+
+class AkanOzellikler:
+    """
+    verileri_birlestir'in varsayılan özelliklerini (SMA_14, RSI_14, bist100_getiri) bar bar üretir.
+
+    Hesaplayıcı, toplu hazırlamadaki ilk bardan itibaren beslendiğinde (örn. gecmisten_olustur ile) her satır
+    verileri_birlestir çıktısıyla bit bit aynıdır; SMA_14 henüz NaN iken (ilk 13 bar) 'hazir' False döner.
+    """
+    def __init__(self, pencere=14):
+        self._sma = AkanSMA(pencere)
+        self._rsi = AkanRSIBasit(pencere)
+        self._endeks = AkanGetiri()
+
+    def endeks_guncelle(self, endeks_kapanisi):
+        """
+        Endeks getirisi endeksin kendi işlem günleri üzerinden hesaplanır; hissenin işlem görmediği endeks günleri
+        yalnızca bu metodla beslenir. Getiriyi döndürür.
+        """
+        return self._endeks.guncelle(endeks_kapanisi)
+
+    def guncelle(self, kapanis, endeks_kapanisi=None, duygu_skoru=0.0):
+        """
+        Args:
+            kapanis (float): Hissenin yeni kapanışı.
+            endeks_kapanisi (float, optional): Aynı günün XU100 kapanışı; yoksa getiri 0 kabul edilir.
+            duygu_skoru (float): Günün duygu skoru (yoksa 0).
+
+        Returns:
+            dict: 'Close', 'SMA_14', 'RSI_14', 'sentiment_score', 'bist100_getiri', 'hazir'.
+        """
+        endeks_getiri = 0.0 if endeks_kapanisi is None else self._endeks.guncelle(endeks_kapanisi)
+        sma = self._sma.guncelle(kapanis)
+        rsi = self._rsi.guncelle(kapanis)
+        return {
+            'Close': kapanis,
+            'SMA_14': sma,
+            'RSI_14': rsi,
+            'sentiment_score': 0.0 if math.isnan(duygu_skoru) else duygu_skoru,
+            'bist100_getiri': 0.0 if math.isnan(endeks_getiri) else endeks_getiri,
+            'hazir': not (math.isnan(sma) or math.isnan(rsi)),
+        }
+
+    @classmethod
+    def gecmisten_olustur(cls, df_hisse, df_endeks, pencere=14):
+        """
+        Hesaplayıcıyı verileri_birlestir'e verilen ham hisse ve endeks verisiyle (aynı ilk bardan) besler.
+        Sonraki günler için yalnızca guncelle çağrılır.
+        """
+        hesaplayici = cls(pencere)
+        kapanislar = pd.Series(df_hisse['Close'].to_numpy(dtype=np.float64), index=pd.to_datetime(df_hisse.index))
+        endeks = pd.Series(df_endeks['Close'].to_numpy(dtype=np.float64), index=pd.to_datetime(df_endeks.index))
+        # İki seriyi tarih sırasıyla birlikte yürütüyoruz; yalnızca endeksin işlem gördüğü günler getiriyi ilerletir
+        for tarih in kapanislar.index.union(endeks.index):
+            endeks_kapanisi = endeks.get(tarih)
+            if tarih in kapanislar.index:
+                hesaplayici.guncelle(kapanislar[tarih], endeks_kapanisi)
+            elif endeks_kapanisi is not None:
+                hesaplayici.endeks_guncelle(endeks_kapanisi)
+        return hesaplayici
\ No newline at end of file
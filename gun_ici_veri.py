@@ -0,0 +1,189 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from gostergeler import ParcaliGostergeler
+from islem_takvimi import gunluk_skorlar
+from ozellik_deposu import OzellikDeposu
+
+# Gün içi dosyalarda beklenen sütunlar (Volume isteğe bağlıdır)
+BAR_SUTUNLARI = ['Open', 'High', 'Low', 'Close', 'Volume']
+PARCA_BOYUTU = 500_000
+_TOPLAMA_KURALLARI = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def bar_parcalari_oku(dosya, parca_boyutu=PARCA_BOYUTU, zaman_sutunu='Datetime'):
+    """
+    Yerel CSV veya Parquet dosyasındaki gün içi barları en fazla parca_boyutu satırlık parçalar halinde okur.
+
+    Args:
+        dosya (str): .csv veya .parquet dosyası; satırlar zaman sırasında olmalıdır.
+        parca_boyutu (int): Parça başına satır sayısı (bellek kullanımını bu belirler).
+        zaman_sutunu (str): Zaman damgası sütunu.
+
+    Yields:
+        pd.DataFrame: Zaman indeksli, BAR_SUTUNLARI'ndan dosyada bulunanları içeren parça.
+    """
+    if dosya.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(dosya)
+        sutunlar = [zaman_sutunu] + [s for s in BAR_SUTUNLARI if s in parquet.schema_arrow.names]
+        okuyucu = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=parca_boyutu, columns=sutunlar))
+    else:
+        okuyucu = pd.read_csv(
+            dosya, chunksize=parca_boyutu, usecols=lambda s: s == zaman_sutunu or s in BAR_SUTUNLARI
+        )
+    for parca in okuyucu:
+        parca.index = pd.DatetimeIndex(pd.to_datetime(parca.pop(zaman_sutunu)))
+        yield parca
+
+
+def yeniden_ornekle(parcalar, bar_boyutu='5min'):
+    """
+    Zaman sıralı bar parçalarını bar_boyutu'na (örn. '5min', '15min', '1h') toplar.
+    Bir parçanın son barı sonraki parçada devam edebileceği için bir sonraki parçaya taşınır; sonuç, tüm veri
+    tek seferde gruplanmış gibidir ama bellekte yalnızca bir parça tutulur. İşlem olmayan aralıklar (gece, hafta sonu)
+    için boş bar üretilmez.
+
+    Yields:
+        pd.DataFrame: Tamamlanmış barlar (OHLC ve varsa Volume).
+    """
+    tasinan = None
+    for parca in parcalar:
+        if len(parca) == 0:
+            continue
+        kurallar = {s: k for s, k in _TOPLAMA_KURALLARI.items() if s in parca.columns}
+        barlar = parca.groupby(parca.index.floor(bar_boyutu)).agg(kurallar)
+        if tasinan is not None:
+            if tasinan.index[0] == barlar.index[0]:
+                ilk = barlar.iloc[0].copy()
+                for sutun, kural in kurallar.items():
+                    if kural == 'first':
+                        ilk[sutun] = tasinan[sutun].iloc[0]
+                    elif kural == 'max':
+                        ilk[sutun] = max(ilk[sutun], tasinan[sutun].iloc[0])
+                    elif kural == 'min':
+                        ilk[sutun] = min(ilk[sutun], tasinan[sutun].iloc[0])
+                    elif kural == 'sum':
+                        ilk[sutun] = ilk[sutun] + tasinan[sutun].iloc[0]
+                barlar.iloc[0] = ilk
+            else:
+                yield tasinan
+        tasinan = barlar.iloc[-1:]
+        if len(barlar) > 1:
+            yield barlar.iloc[:-1]
+    if tasinan is not None:
+        yield tasinan
+
+
+class _GecikmeliDuygu:
+    """
+    Günlük duygu skorlarını gün içi barlara ileriye bakmadan eşler. Seanslar barların günleridir: her seansa
+    islem_takvimi.seanslara_topla'daki gibi önceki seanstan sonraki günden kendisine kadar olan günlerin başlık
+    sayısıyla ağırlıklı skor ortalaması atanır (hafta sonu/tatil skorları sonraki seansa katılır) ve bir seansın barları bu değeri değil,
+    bir önceki seansınkini görür; gün sonunda yayınlanan haberler aynı günün sabah barlarına sızmaz.
+    İlk seansın barları 0 (nötr) alır. Parçalar arasında durum taşındığı için akış halinde kullanılabilir.
+    """
+    def __init__(self, duygu_skorlari):
+        if isinstance(duygu_skorlari, pd.Series):
+            duygu_skorlari = gunluk_skorlar(pd.DataFrame({'Date': duygu_skorlari.index,
+                                                          'sentiment_score': duygu_skorlari.to_numpy()}))
+        agirliklar = duygu_skorlari['agirlik'].to_numpy(dtype=np.float64)
+        self._gunler = duygu_skorlari.index.to_numpy().astype('datetime64[ns]')
+        self._toplam = np.concatenate([[0.0], np.cumsum(duygu_skorlari['sentiment_score'].to_numpy() * agirliklar)])
+        self._toplam_agirlik = np.concatenate([[0.0], np.cumsum(agirliklar)])
+        self._onceki_seans = None
+        self._gorunen = 0.0
+
+    def _pencere_ortalamasi(self, ilk_haric, son_dahil):
+        # (ilk_haric, son_dahil] aralığındaki günlerin ağırlıklı skor ortalaması; haber yoksa 0
+        bas = np.searchsorted(self._gunler, ilk_haric, side='right')
+        bit = np.searchsorted(self._gunler, son_dahil, side='right')
+        agirlik = self._toplam_agirlik[bit] - self._toplam_agirlik[bas]
+        return (self._toplam[bit] - self._toplam[bas]) / agirlik if agirlik > 0 else 0.0
+
+    def eslestir(self, zamanlar):
+        gunler = pd.DatetimeIndex(zamanlar).normalize().to_numpy().astype('datetime64[ns]')
+        seanslar, konum = np.unique(gunler, return_inverse=True)
+        degerler = np.empty(len(seanslar))
+        for i, seans in enumerate(seanslar):
+            if self._onceki_seans is not None and seans > self._onceki_seans[1]:
+                # Yeni seans: önceki seansın penceresi artık tamamlanmıştır ve görünür hale gelir
+                ilk_haric = self._onceki_seans[0] if self._onceki_seans[0] is not None \
+                    else self._onceki_seans[1] - np.timedelta64(1, 'D')
+                self._gorunen = self._pencere_ortalamasi(ilk_haric, self._onceki_seans[1])
+                self._onceki_seans = (self._onceki_seans[1], seans)
+            elif self._onceki_seans is None:
+                self._onceki_seans = (None, seans)
+            degerler[i] = self._gorunen
+        return degerler[konum]
+
+
+def ozellik_parcalari(bar_parcalari, duygu_skorlari=None):
+    """
+    Bar parçalarından ortamın piyasa özelliklerini (PIYASA_OZELLIKLERI) parça parça üretir.
+    Göstergeler ParcaliGostergeler ile hesaplandığından sonuç, tüm seri üzerinde verileri_birlestir'deki
+    göstergelerle aynıdır; gösterge ısınması (NaN) satırları aynı şekilde düşülür.
+
+    Args:
+        bar_parcalari (iterable): 'Close' sütunlu, zaman indeksli parçalar.
+        duygu_skorlari (pd.DataFrame or pd.Series, optional): islem_takvimi.gunluk_skorlar çıktısı ya da takvim
+            günü -> duygu skoru serisi (başlık sayısı olmayan dosya gibi ele alınır). Her bar, bir önceki seansın
+            skorunu alır (bkz. _GecikmeliDuygu); aynı günün skoru o günün barlarında görünmez.
+
+    Yields:
+        pd.DataFrame: PIYASA_OZELLIKLERI sütunlu parça.
+    """
+    gostergeler = ParcaliGostergeler(14)
+    gecikmeli_duygu = _GecikmeliDuygu(duygu_skorlari) if duygu_skorlari is not None else None
+    for parca in bar_parcalari:
+        kapanis = parca['Close'].to_numpy(dtype=np.float64)
+        hesaplanan = gostergeler.guncelle(kapanis)
+        if duygu_skorlari is None:
+            duygu = np.zeros(len(parca))
+        else:
+            duygu = gecikmeli_duygu.eslestir(parca.index)
+        ozellikler = pd.DataFrame({
+            'Close': kapanis,
+            'SMA_14': hesaplanan['SMA_14'],
+            'RSI_14': hesaplanan['RSI_14'],
+            'sentiment_score': duygu,
+        }, index=parca.index)
+        yield ozellikler.dropna()
+
+
+def gun_ici_depo_olustur(dosyalar, klasor, bar_boyutu='5min', duygu_dosyasi=None, parca_boyutu=PARCA_BOYUTU,
+                         zaman_sutunu='Datetime', scaler=None):
+    """
+    Gün içi bar dosyalarını okuyup yeniden örnekleyerek, göstergeleri akış halinde hesaplayarak doğrudan
+    bir OzellikDeposu'na yazar. Tam DataFrame hiçbir zaman oluşturulmaz; bellek kullanımı parca_boyutu ile sınırlıdır.
+    Dönen depo TicaretOrtami(depo=...) veya VektorTicaretOrtami(depo=...) ile kullanılır.
+
+    Args:
+        dosyalar (list): Zaman sırasına göre CSV/Parquet dosyaları (örn. aylık dosyalar).
+        klasor (str): Deponun yazılacağı klasör.
+        bar_boyutu (str, optional): Hedef bar boyutu; None ise barlar olduğu gibi kullanılır.
+        duygu_dosyasi (str, optional): 'Date', 'sentiment_score' (ve varsa 'news_count') sütunlu günlük duygu CSV'si.
+        scaler (MinMaxScaler, optional): OzellikDeposu.parcalardan_yaz'a iletilir.
+
+    Returns:
+        tuple: (OzellikDeposu, scaler)
+    """
+    if isinstance(dosyalar, (str, os.PathLike)):
+        dosyalar = [dosyalar]
+
+    def tum_parcalar():
+        for dosya in dosyalar:
+            yield from bar_parcalari_oku(os.fspath(dosya), parca_boyutu, zaman_sutunu)
+
+    parcalar = tum_parcalar()
+    if bar_boyutu is not None:
+        parcalar = yeniden_ornekle(parcalar, bar_boyutu)
+
+    duygu_skorlari = None
+    if duygu_dosyasi is not None:
+        duygu_skorlari = gunluk_skorlar(pd.read_csv(duygu_dosyasi))
+
+    return OzellikDeposu.parcalardan_yaz(ozellik_parcalari(parcalar, duygu_skorlari), klasor, scaler=scaler)
\ No newline at end of file
@@ -0,0 +1,265 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+# Başlıkların arandığı seçiciler, sırayla: ilk eşleşen seçicinin sonuçları kullanılır.
+# (etiket, sınıf) çiftleri; sınıf None ise yalnızca etikete bakılır. Google sınıf adını değiştirirse buraya eklenir.
+SECICILER = (
+    ("a", "JtKRv"),
+    ("h3", None),
+    ("h4", None),
+)
+# Ayrıştırıcı: "lxml" (C tabanlı, hedefli XPath sorguları) veya "bs4" (BeautifulSoup html.parser);
+# varsayılan lxml kuruluysa lxml'dir, HABER_AYIKLAYICI ortam değişkeniyle değiştirilebilir
+AYIKLAYICILAR = ("lxml", "bs4")
+CIKTI_DOSYASI = "ayiklayici_karsilastirma.json"
+
+
+def _varsayilan_ayiklayici():
+    try:
+        import lxml.html  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "bs4"
+
+
+HABER_AYIKLAYICI = os.environ.get("HABER_AYIKLAYICI") or _varsayilan_ayiklayici()
+
+
+# --- BeautifulSoup ---
+
+def _bs4_bul(kok, etiket, sinif, limit=None):
+    return kok.find_all(etiket, class_=sinif, limit=limit) if sinif else kok.find_all(etiket, limit=limit)
+
+
+def _bs4_basliklar(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    for etiket, sinif in SECICILER:
+        basliklar = _bs4_bul(soup, etiket, sinif)
+        if basliklar:
+            return [baslik.text for baslik in basliklar]
+    return []
+
+
+def _bs4_haberler(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    haberler = []
+    for makale in soup.find_all('article'):
+        adaylar = [b for etiket, sinif in SECICILER for b in _bs4_bul(makale, etiket, sinif, limit=1)]
+        if not adaylar:
+            continue
+        baslik = adaylar[0]
+        zaman = makale.find('time', attrs={'datetime': True})
+        haberler.append((baslik.text, zaman['datetime'] if zaman is not None else None))
+    return haberler
+
+
+# --- lxml ---
+
+_lxml_sorgulari = None
+_ayristirici = None
+
+
+def _xpath(etiket, sinif):
+    if sinif is None:
+        return etiket
+    return f"{etiket}[contains(concat(' ', normalize-space(@class), ' '), ' {sinif} ')]"
+
+
+def _lxml_sorgulari_hazirla():
+    # XPath ifadeleri bir kez derlenir; her sayfada yalnızca hedef düğümler aranır
+    global _lxml_sorgulari
+    if _lxml_sorgulari is None:
+        from lxml import etree
+
+        _lxml_sorgulari = {
+            'basliklar': [etree.XPath(f"//{_xpath(etiket, sinif)}") for etiket, sinif in SECICILER],
+            'makale_basliklari': [etree.XPath(f".//{_xpath(etiket, sinif)}[1]") for etiket, sinif in SECICILER],
+            'makaleler': etree.XPath("//article"),
+            'zaman': etree.XPath(".//time[@datetime][1]/@datetime"),
+            'metin': etree.XPath("string()"),
+        }
+    return _lxml_sorgulari
+
+
+def _lxml_ayristirici():
+    global _ayristirici
+    if _ayristirici is None:
+        import lxml.html
+
+        _ayristirici = lxml.html.HTMLParser(encoding="utf-8")
+    return _ayristirici
+
+
+def _lxml_agaci(html):
+    import lxml.html
+    from lxml import etree
+
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    try:
+        return lxml.html.fromstring(html, parser=_lxml_ayristirici())
+    except etree.ParserError:
+        # Boş sayfa
+        return None
+
+
+def _metin(eleman):
+    # BeautifulSoup'un .text'i gibi: yorumlar hariç tüm alt düğümlerin metni
+    return str(_lxml_sorgulari['metin'](eleman))
+
+
+def _lxml_basliklar(html):
+    agac = _lxml_agaci(html)
+    if agac is None:
+        return []
+    for sorgu in _lxml_sorgulari_hazirla()['basliklar']:
+        basliklar = sorgu(agac)
+        if basliklar:
+            return [_metin(baslik) for baslik in basliklar]
+    return []
+
+
+def _lxml_haberler(html):
+    agac = _lxml_agaci(html)
+    if agac is None:
+        return []
+    sorgular = _lxml_sorgulari_hazirla()
+    haberler = []
+    for makale in sorgular['makaleler'](agac):
+        adaylar = [b for sorgu in sorgular['makale_basliklari'] for b in sorgu(makale)]
+        if not adaylar:
+            continue
+        baslik = adaylar[0]
+        zaman = sorgular['zaman'](makale)
+        haberler.append((_metin(baslik), str(zaman[0]) if zaman else None))
+    return haberler
+
+
+_BASLIK_AYIKLAYICILARI = {"lxml": _lxml_basliklar, "bs4": _bs4_basliklar}
+_HABER_AYIKLAYICILARI = {"lxml": _lxml_haberler, "bs4": _bs4_haberler}
+
+
+def _ayiklayici_sec(tablo, ayiklayici):
+    ayiklayici = ayiklayici or HABER_AYIKLAYICI
+    if ayiklayici not in AYIKLAYICILAR:
+        raise ValueError(f"Bilinmeyen HTML ayıklayıcı: {ayiklayici}. Seçenekler: {', '.join(AYIKLAYICILAR)}")
+    return tablo[ayiklayici]
+
+
+def basliklari_ayikla(html, ayiklayici=None):
+    """
+    Google News arama sayfasından haber başlıklarını çıkarır (başlık yoksa boş liste).
+    SECICILER sırayla denenir, ilk eşleşen seçicinin başlıkları döner.
+
+    Args:
+        html (str): Sayfa içeriği.
+        ayiklayici (str, optional): AYIKLAYICILAR'dan biri (varsayılan HABER_AYIKLAYICI); ikisi de aynı sonucu verir.
+    """
+    return _ayiklayici_sec(_BASLIK_AYIKLAYICILARI, ayiklayici)(html)
+
+
+def haberleri_ayikla(html, ayiklayici=None):
+    """
+    Google News arama sayfasındaki her haberin ('article') başlığını ve yayın zamanını çıkarır.
+
+    Returns:
+        list: {'baslik', 'zaman'} sözlükleri; 'zaman' UTC pd.Timestamp, sayfada yoksa None.
+    """
+    haberler = [
+        {'baslik': baslik, 'zaman': pd.Timestamp(zaman).tz_convert('UTC') if zaman is not None else None}
+        for baslik, zaman in _ayiklayici_sec(_HABER_AYIKLAYICILARI, ayiklayici)(html)
+    ]
+    if not haberler:
+        # Sayfa düzeni 'article' kullanmıyorsa en azından başlıkları (zamansız) döndürüyoruz
+        haberler = [{'baslik': baslik, 'zaman': None} for baslik in basliklari_ayikla(html, ayiklayici)]
+    return haberler
+
+
+def ayiklayicilari_karsilastir(sayfalar, tekrar=3):
+    """
+    Ayıklayıcıların sayfa başına ayrıştırma süresini ölçer ve çıktılarının bs4 ile aynı olup olmadığını denetler.
+
+    Args:
+        sayfalar (list): HTML sayfaları.
+        tekrar (int): Her sayfanın kaç kez ayrıştırılacağı (sayfa süresi en kısa denemedir).
+
+    Returns:
+        dict: Ayıklayıcı -> sayfa başına süre istatistikleri (ms) ve bs4 ile aynı sonucu veren sayfa oranı.
+    """
+    if not sayfalar:
+        raise ValueError("Ölçülecek sayfa bulunamadı.")
+    sonuclar = {}
+    referans = [_bs4_basliklar(html) for html in sayfalar]
+    for ayiklayici in AYIKLAYICILAR:
+        ayikla = _BASLIK_AYIKLAYICILARI[ayiklayici]
+        # Derleme ve import maliyeti ölçüme katılmaz
+        ayikla(sayfalar[0])
+        sureler = []
+        ayni = 0
+        for html, beklenen in zip(sayfalar, referans):
+            en_kisa = float("inf")
+            for _ in range(tekrar):
+                t0 = time.perf_counter()
+                basliklar = ayikla(html)
+                en_kisa = min(en_kisa, time.perf_counter() - t0)
+            sureler.append(en_kisa * 1000)
+            ayni += basliklar == beklenen
+        sureler = np.array(sureler)
+        sonuclar[ayiklayici] = {
+            'ms_ortalama': float(sureler.mean()),
+            'ms_medyan': float(np.median(sureler)),
+            'ms_p95': float(np.percentile(sureler, 95)),
+            'sayfa_per_sn': float(len(sureler) / (sureler.sum() / 1000)),
+            'bs4_ile_ayni_oran': ayni / len(sayfalar),
+        }
+    return sonuclar
+
+
+if __name__ == "__main__":
+    from sayfa_arsivi import SayfaArsivi
+
+    parser = argparse.ArgumentParser(
+        description="Arşivlenmiş arama sayfaları üzerinde HTML ayıklayıcılarının sayfa başına ayrıştırma süresini ölçer."
+    )
+    parser.add_argument("--sirket", default=None, help="Yalnızca bu şirketin sayfaları (varsayılan tümü)")
+    parser.add_argument("--baslangic", default=None, help="İlk gün (YYYY-MM-DD)")
+    parser.add_argument("--bitis", default=None, help="Son gün (YYYY-MM-DD)")
+    parser.add_argument("--sayfa", type=int, default=500, help="Ölçülecek en fazla sayfa sayısı")
+    parser.add_argument("--tekrar", type=int, default=3, help="Sayfa başına deneme sayısı")
+    parser.add_argument("--cikti", default=CIKTI_DOSYASI, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    baslangic = datetime.date.fromisoformat(args.baslangic) if args.baslangic else None
+    bitis = datetime.date.fromisoformat(args.bitis) if args.bitis else None
+    sayfalar = []
+    for _, _, html in SayfaArsivi().sayfalar(args.sirket, baslangic, bitis):
+        sayfalar.append(html)
+        if len(sayfalar) >= args.sayfa:
+            break
+
+    sonuc = ayiklayicilari_karsilastir(sayfalar, args.tekrar)
+    rapor = {
+        'meta': {
+            'tarih': datetime.datetime.now().isoformat(timespec='seconds'),
+            'sayfa_sayisi': len(sayfalar),
+            'ortalama_sayfa_kb': float(np.mean([len(html.encode("utf-8")) for html in sayfalar]) / 1024),
+            'tekrar': args.tekrar,
+            'platform': platform.platform(),
+        },
+        'sonuclar': sonuc,
+    }
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(rapor, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{len(sayfalar)} sayfa ölçüldü; sonuçlar '{args.cikti}' dosyasına kaydedildi.")
+    for ayiklayici, olcum in sonuc.items():
+        print(f"- {ayiklayici}: medyan {olcum['ms_medyan']:.3f} ms/sayfa, p95 {olcum['ms_p95']:.3f} ms, "
+              f"bs4 ile aynı: %{100 * olcum['bs4_ile_ayni_oran']:.1f}")
\ No newline at end of file
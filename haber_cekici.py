@@ -1,53 +1,333 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
 import datetime
 
-def haberleri_getir(sirket_adi, gun):
+from haber_ayiklayici import basliklari_ayikla, haberleri_ayikla
+from sayfa_arsivi import SayfaArsivi
+
+# Yerel bir test sunucusuna yönlendirmek için HABER_ADRESI ortam değişkeni kullanılabilir
+HABER_ADRESI = os.environ.get("HABER_ADRESI", "https://news.google.com")
+# Googlebot gibi görünmek için User-Agent bilgisi ekliyoruz
+ISTEK_BASLIKLARI = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+# Google News bir arama sayfasında en fazla bu kadar haber gösterir; bu sayıya ulaşan çok günlü pencereler bölünür
+SONUC_SINIRI = 100
+# Aralık modunda tek aramayla istenen gün sayısı
+PENCERE_GUN = 7
+# Yayın zamanları günlere bu saat dilimine göre dağıtılır
+YEREL_SAAT_DILIMI = "Europe/Istanbul"
+
+
+def arama_adresi(sirket_adi, gun, taban_adres=None, son_gun=None):
+    # Google News URL formatı: q=aranacak_kelime&after=YYYY-MM-DD&before=YYYY-MM-DD
+    # son_gun verilirse [gun, son_gun] aralığının tamamı tek aramada istenir
+    baslangic_tarihi = gun.strftime('%Y-%m-%d')
+    bitis_tarihi = ((son_gun or gun) + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+    taban_adres = (taban_adres or HABER_ADRESI).rstrip("/")
+    return f"{taban_adres}/search?q={sirket_adi}%20after%3A{baslangic_tarihi}%20before%3A{bitis_tarihi}&hl=tr&gl=TR&ceid=TR%3Atr"
+
+
+def _gunlere_bol(haberler, ilk_gun, son_gun):
+    """ haberleri_ayikla çıktısını [ilk_gun, son_gun] penceresinin günlerine yayın zamanlarına göre dağıtır. """
+    gun_sayisi = (son_gun - ilk_gun).days + 1
+    gunluk = {ilk_gun + datetime.timedelta(days=i): [] for i in range(gun_sayisi)}
+    for haber in haberler:
+        # Yayın zamanı olmayan haberler pencerenin son gününe yazılır (haber o güne kadar yayınlanmıştır);
+        # saat dilimi farkıyla pencere dışına düşen zamanlar en yakın uca çekilir
+        gun = son_gun if haber['zaman'] is None else haber['zaman'].tz_convert(YEREL_SAAT_DILIMI).date()
+        gunluk[min(max(gun, ilk_gun), son_gun)].append(haber['baslik'])
+    return gunluk
+
+
+def haberleri_getir(sirket_adi, gun, arsiv=None):
     """
-    Belirtilen şirket için Google News'te o güne ait haber başlıklarını arar.
+    Belirtilen şirket için Google News'te o güne ait haber başlıklarını arar. Tek günlük fetch_days çağrısıdır;
+    zaman aşımı, yeniden deneme ve hız sınırı HaberCekici'ninkilerdir.
     
     Args:
         sirket_adi (str): Aranacak şirket adı (örn: "Türk Hava Yolları").
         gun (datetime.date): Haberlerin aranacağı tarih.
+        arsiv (SayfaArsivi, optional): Verilirse çekilen ham sayfa arşive de kaydedilir.
     
     Returns:
         list: Bulunan haber başlıklarının bir listesi.
+
+    Raises:
+        RuntimeError: Sayfa alınamazsa (ağ hatası, zaman aşımı, HTTP hatası). Hatalar başlık gibi döndürülmez.
     """
-    try:
-        # Google News URL formatı: q=aranacak_kelime&after=YYYY-MM-DD&before=YYYY-MM-DD
-        baslangic_tarihi = gun.strftime('%Y-%m-%d')
-        bitis_tarihi = (gun + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        # Googlebot gibi görünmek için User-Agent bilgisi ekliyoruz
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    sonuc = fetch_days(sirket_adi, [gun], arsiv=arsiv)[gun]
+    if sonuc['hata'] is not None:
+        raise RuntimeError(f"{sirket_adi} için {gun} haberleri alınamadı: {sonuc['hata']}")
+
+    if not sonuc['basliklar']:
+        return ["O tarihte ilgili haber bulunamadı."]
+
+    return sonuc['basliklar']
+
+
+# --- Eş zamanlı toplu çekme ---
+
+class _HizSiniri:
+    """ Bir sunucuya saniyede en fazla 'saniyede_istek' istek başlatılmasını sağlar (istekler eşit aralıklı dağılır). """
+    def __init__(self, saniyede_istek):
+        self.aralik = 1.0 / saniyede_istek if saniyede_istek else 0.0
+        self._sonraki = 0.0
+        self._kilit = asyncio.Lock()
+
+    async def bekle(self):
+        async with self._kilit:
+            simdi = time.monotonic()
+            bekleme = self._sonraki - simdi
+            self._sonraki = max(simdi, self._sonraki) + self.aralik
+        if bekleme > 0:
+            await asyncio.sleep(bekleme)
+
+
+class HaberCekici:
+    """
+    Haber sayfalarını tek bir bağlantı havuzu (aiohttp.ClientSession) üzerinden eş zamanlı çeker.
+    Aynı anda en fazla 'eszamanli' istek açık olur, her sunucuya saniyede en fazla 'saniyede_istek' istek başlatılır.
+    Zaman aşımı, bağlantı hataları, 429 ve 5xx yanıtları üstel geri çekilmeyle (Retry-After varsa ona uyularak)
+    yeniden denenir; diğer 4xx yanıtlar yeniden denenmez.
+
+    Her gün için {'tarih', 'basliklar', 'hata'} döner. Hata durumunda 'basliklar' boş, 'hata' doludur;
+    ağ hataları hiçbir zaman başlık gibi döndürülmez.
+
+    arsiv (SayfaArsivi) verilirse çekilen her sayfa arşive kaydedilir ve arşivde bulunan sayfalar yeniden indirilmez.
+    """
+    YENIDEN_DENENEN_DURUMLAR = {429, 500, 502, 503, 504}
+
+    def __init__(self, eszamanli=8, saniyede_istek=4.0, deneme_sayisi=4, zaman_asimi=20.0, geri_cekilme=1.0,
+                 taban_adres=None, arsiv=None, sonuc_siniri=SONUC_SINIRI):
+        self.eszamanli = eszamanli
+        self.saniyede_istek = saniyede_istek
+        self.deneme_sayisi = deneme_sayisi
+        self.zaman_asimi = zaman_asimi
+        self.geri_cekilme = geri_cekilme
+        self.taban_adres = taban_adres or HABER_ADRESI
+        self.arsiv = arsiv
+        self.sonuc_siniri = sonuc_siniri
+        self._hiz_sinirlari = {}
+
+    def _hiz_siniri(self, url):
+        sunucu = urlsplit(url).netloc
+        if sunucu not in self._hiz_sinirlari:
+            self._hiz_sinirlari[sunucu] = _HizSiniri(self.saniyede_istek)
+        return self._hiz_sinirlari[sunucu]
+
+    def _bekleme_suresi(self, deneme, yanit=None):
+        if yanit is not None and 'Retry-After' in yanit.headers:
+            try:
+                return float(yanit.headers['Retry-After'])
+            except ValueError:
+                pass
+        # Üstel geri çekilme + rastgele sapma (aynı anda başarısız olan isteklerin aynı anda tekrar gelmemesi için)
+        return self.geri_cekilme * (2 ** deneme) * (0.5 + random.random())
+
+    async def sayfa_getir(self, oturum, url):
+        """
+        Returns:
+            tuple: (html veya None, hata mesajı veya None)
+        """
+        import aiohttp
+
+        hata = None
+        for deneme in range(self.deneme_sayisi):
+            await self._hiz_siniri(url).bekle()
+            try:
+                async with oturum.get(url) as yanit:
+                    if yanit.status == 200:
+                        return await yanit.text(), None
+                    hata = f"HTTP {yanit.status}"
+                    if yanit.status not in self.YENIDEN_DENENEN_DURUMLAR:
+                        return None, hata
+                    bekleme = self._bekleme_suresi(deneme, yanit)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                hata = f"{type(e).__name__}: {e}"
+                bekleme = self._bekleme_suresi(deneme)
+            if deneme < self.deneme_sayisi - 1:
+                await asyncio.sleep(bekleme)
+        return None, f"{self.deneme_sayisi} denemede alınamadı ({hata})"
+
+    def _oturum(self):
+        import aiohttp
+
+        baglayici = aiohttp.TCPConnector(limit=self.eszamanli)
+        zaman_asimi = aiohttp.ClientTimeout(total=self.zaman_asimi)
+        return aiohttp.ClientSession(connector=baglayici, timeout=zaman_asimi, headers=ISTEK_BASLIKLARI)
+
+    async def _arama_sayfasi(self, oturum, sinir, sirket_adi, ilk_gun, son_gun):
+        # Sayfa, arşivde pencerenin son gününün ayına kaydedilir; ilk gün de kayda yazılır ki arşivden yeniden
+        # ayrıştırılırken haberler pencerenin günlerine dağıtılabilsin
+        url = arama_adresi(sirket_adi, ilk_gun, self.taban_adres, son_gun)
+        html = self.arsiv.getir(url, son_gun) if self.arsiv is not None else None
+        hata = None
+        if html is None:
+            async with sinir:
+                html, hata = await self.sayfa_getir(oturum, url)
+            if html is not None and self.arsiv is not None:
+                self.arsiv.kaydet(sirket_adi, son_gun, url, html, ilk_gun=ilk_gun)
+        return html, hata
+
+    async def _pencere_getir(self, oturum, sinir, sirket_adi, ilk_gun, son_gun):
+        html, hata = await self._arama_sayfasi(oturum, sinir, sirket_adi, ilk_gun, son_gun)
+        basliklar = basliklari_ayikla(html) if html is not None else []
+        return {'tarih': son_gun, 'ilk_gun': ilk_gun, 'basliklar': basliklar, 'hata': hata}
+
+    async def _gunlere_dagit(self, oturum, sinir, sirket_adi, ilk_gun, son_gun):
+        """
+        [ilk_gun, son_gun] penceresini tek aramayla çeker ve haberleri yayın günlerine dağıtır. Sonuç sayısı
+        sonuc_siniri'na ulaşırsa sayfada gösterilmeyen haberler olabileceğinden pencere ikiye bölünüp yeniden aranır.
+        """
+        gun_sayisi = (son_gun - ilk_gun).days + 1
+        gunler = [ilk_gun + datetime.timedelta(days=i) for i in range(gun_sayisi)]
+        html, hata = await self._arama_sayfasi(oturum, sinir, sirket_adi, ilk_gun, son_gun)
+        if html is None:
+            return {gun: {'tarih': gun, 'basliklar': [], 'hata': hata} for gun in gunler}
+
+        haberler = haberleri_ayikla(html)
+        if len(haberler) >= self.sonuc_siniri and gun_sayisi > 1:
+            orta = ilk_gun + datetime.timedelta(days=gun_sayisi // 2 - 1)
+            sol, sag = await asyncio.gather(
+                self._gunlere_dagit(oturum, sinir, sirket_adi, ilk_gun, orta),
+                self._gunlere_dagit(oturum, sinir, sirket_adi, orta + datetime.timedelta(days=1), son_gun),
+            )
+            return {**sol, **sag}
+
+        return {
+            gun: {'tarih': gun, 'basliklar': basliklar, 'hata': None}
+            for gun, basliklar in _gunlere_bol(haberler, ilk_gun, son_gun).items()
         }
-        
-        url = f"https://news.google.com/search?q={sirket_adi}%20after%3A{baslangic_tarihi}%20before%3A{bitis_tarihi}&hl=tr&gl=TR&ceid=TR%3Atr"
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status() # Hata varsa (404, 500 vb.) exception fırlatır
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Google News'teki haber başlıkları genellikle 'h3' veya 'h4' etiketleri içinde bulunur
-        basliklar = soup.find_all('a', class_='JtKRv') # Bu class adı değişebilir
-        
-        if not basliklar:
-             # Eğer ilk class bulunamazsa alternatif bir class deneyebiliriz
-             basliklar = soup.find_all('h3')
-
-        bulunan_basliklar = [baslik.text for baslik in basliklar]
-        
-        if not bulunan_basliklar:
-            return ["O tarihte ilgili haber bulunamadı."]
-
-        return bulunan_basliklar
-
-    except requests.exceptions.RequestException as e:
-        return [f"Haberler çekilirken bir ağ hatası oluştu: {e}"]
-    except Exception as e:
-        return [f"Beklenmedik bir hata oluştu: {e}"]
+
+    async def aralik_toplu_getir(self, sirket_adi, baslangic, bitis, pencere_gun=PENCERE_GUN):
+        """
+        aralik_getir ile aynı sonucu gün başına bir arama yerine pencere_gun günlük pencerelerle üretir; haberler
+        yayın zamanlarına göre günlere dağıtılır. Sonuç sınırına ulaşan pencereler tek güne inene kadar bölünür.
+        """
+        pencereler = []
+        ilk_gun = baslangic
+        while ilk_gun <= bitis:
+            son_gun = min(ilk_gun + datetime.timedelta(days=pencere_gun - 1), bitis)
+            pencereler.append((ilk_gun, son_gun))
+            ilk_gun = son_gun + datetime.timedelta(days=1)
+
+        sinir = asyncio.Semaphore(self.eszamanli)
+        async with self._oturum() as oturum:
+            parcalar = await asyncio.gather(*(
+                self._gunlere_dagit(oturum, sinir, sirket_adi, ilk_gun, son_gun) for ilk_gun, son_gun in pencereler
+            ))
+        return {gun: sonuc for parca in parcalar for gun, sonuc in parca.items()}
+
+    async def aralik_getir(self, sirket_adi, baslangic, bitis):
+        gunler = [baslangic + datetime.timedelta(days=i) for i in range((bitis - baslangic).days + 1)]
+        return await self.gunleri_getir(sirket_adi, gunler)
+
+    async def gunleri_getir(self, sirket_adi, gunler):
+        """ Ardışık olması gerekmeyen günleri (örn. doldurulacak boşluklar) eş zamanlı çeker. """
+        return await self.pencereleri_getir(sirket_adi, [(gun, gun) for gun in gunler])
+
+    async def pencereleri_getir(self, sirket_adi, pencereler):
+        """
+        Her (ilk_gun, son_gun) penceresini tek bir aramayla eş zamanlı çeker; sonuçlar pencerenin son gününe göre döner.
+        Örneğin bir seansın penceresi önceki seanstan sonraki günden başlar ve hafta sonu/tatil haberlerini de kapsar.
+        """
+        sinir = asyncio.Semaphore(self.eszamanli)
+        async with self._oturum() as oturum:
+            sonuclar = await asyncio.gather(*(
+                self._pencere_getir(oturum, sinir, sirket_adi, ilk_gun, son_gun) for ilk_gun, son_gun in pencereler
+            ))
+        return {sonuc['tarih']: sonuc for sonuc in sonuclar}
+
+
+def fetch_range(sirket_adi, baslangic, bitis, pencere_gun=1, **ayarlar):
+    """
+    [baslangic, bitis] aralığındaki (iki uç dahil) her gün için haberleri eş zamanlı çeker.
+
+    Args:
+        sirket_adi (str): Aranacak şirket adı.
+        baslangic, bitis (datetime.date): Aralığın ilk ve son günü.
+        pencere_gun (int): 1 ise her gün ayrı aranır; daha büyükse aralık bu kadar günlük pencerelerle aranıp
+            haberler yayın zamanlarına göre günlere dağıtılır (bkz. HaberCekici.aralik_toplu_getir).
+        **ayarlar: HaberCekici parametreleri (eszamanli, saniyede_istek, deneme_sayisi, zaman_asimi, taban_adres, arsiv...).
+
+    Returns:
+        dict: Gün -> {'tarih', 'basliklar', 'hata'}.
+    """
+    cekici = HaberCekici(**ayarlar)
+    if pencere_gun > 1:
+        return asyncio.run(cekici.aralik_toplu_getir(sirket_adi, baslangic, bitis, pencere_gun))
+    return asyncio.run(cekici.aralik_getir(sirket_adi, baslangic, bitis))
+
+
+def fetch_days(sirket_adi, gunler, **ayarlar):
+    """ fetch_range gibidir ama yalnızca verilen günleri (datetime.date listesi) çeker. """
+    return asyncio.run(HaberCekici(**ayarlar).gunleri_getir(sirket_adi, list(gunler)))
+
+
+def fetch_windows(sirket_adi, pencereler, **ayarlar):
+    """
+    Verilen (ilk_gun, son_gun) pencerelerinin her birini tek aramayla çeker.
+
+    Returns:
+        dict: Pencerenin son günü -> {'tarih', 'ilk_gun', 'basliklar', 'hata'}.
+    """
+    return asyncio.run(HaberCekici(**ayarlar).pencereleri_getir(sirket_adi, list(pencereler)))
+
+
+def arsivden_ayikla(sirket_adi=None, baslangic=None, bitis=None, arsiv=None, ayiklayici=basliklari_ayikla):
+    """
+    Arşivlenmiş ham sayfaları ağa çıkmadan yeniden ayrıştırır. Seçici veya ayrıştırıcı değiştiğinde
+    (örn. Google sınıf adını değiştirdiğinde) geçmiş günlerin başlıkları bu fonksiyonla yeniden üretilir.
+
+    Çok günlü aramaların (aralık modu, seans pencereleri) sayfaları haberleri_ayikla ile ayrıştırılıp yayın
+    zamanlarına göre günlere dağıtılır. Bir gün birden fazla sayfada geçiyorsa (örn. sonuç sınırına ulaşıp
+    bölünen pencere ile parçaları, ya da aynı günü farklı pencerelerle çeken çalıştırmalar) o günün başlıkları
+    günü kapsayan en dar sayfadan alınır; böylece aynı haber iki kez sayılmaz ve sınıra takılan sayfa kullanılmaz.
+
+    Args:
+        sirket_adi (str, optional): Yalnızca bu şirketin sayfaları.
+        baslangic, bitis (datetime.date, optional): Gün aralığı (iki uç dahil).
+        arsiv (SayfaArsivi, optional): Varsayılan olarak SAYFA_ARSIVI_KLASORU'ndaki arşiv.
+        ayiklayici (callable): html -> başlık listesi (tek günlük sayfalar için).
+
+    Returns:
+        dict: Gün -> başlık listesi.
+    """
+    arsiv = arsiv or SayfaArsivi()
+    # (şirket, gün) -> günü kapsayan en dar sayfanın sırası
+    secilenler = {}
+    sayfalar = []
+    for sirket, ilk_gun, son_gun, _, html in arsiv.pencere_sayfalari(sirket_adi, baslangic, bitis):
+        sira = len(sayfalar)
+        sayfalar.append((ilk_gun, son_gun, html))
+        gun_sayisi = (son_gun - ilk_gun).days + 1
+        for i in range(gun_sayisi):
+            gun = ilk_gun + datetime.timedelta(days=i)
+            if (baslangic is not None and gun < baslangic) or (bitis is not None and gun > bitis):
+                continue
+            onceki = secilenler.get((sirket, gun))
+            if onceki is None or gun_sayisi <= (sayfalar[onceki][1] - sayfalar[onceki][0]).days + 1:
+                secilenler[(sirket, gun)] = sira
+
+    gerekenler = {}
+    for (_, gun), sira in secilenler.items():
+        gerekenler.setdefault(sira, []).append(gun)
+
+    sonuclar = {}
+    for sira in sorted(gerekenler):
+        ilk_gun, son_gun, html = sayfalar[sira]
+        if ilk_gun == son_gun:
+            gunluk = {son_gun: ayiklayici(html)}
+        else:
+            gunluk = _gunlere_bol(haberleri_ayikla(html), ilk_gun, son_gun)
+        for gun in gerekenler[sira]:
+            sonuclar.setdefault(gun, []).extend(gunluk[gun])
+    return dict(sorted(sonuclar.items()))
 
 if __name__ == "__main__":
     # Dünü test edelim
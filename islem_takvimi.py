@@ -0,0 +1,103 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from veri_onbellegi import fiyat_verisi_getir
+
+# İşlem günleri BIST 100 endeksinin fiyat verisinden (önbellekten) alınır
+TAKVIM_KODU = "XU100.IS"
+# Duygu dosyalarında günün skorlanan başlık sayısını tutan sütun (eski dosyalarda yoktur)
+HABER_SAYISI_SUTUNU = "news_count"
+
+
+def islem_gunleri(baslangic_tarihi, bitis_tarihi, kod=TAKVIM_KODU, cevrimdisi=None):
+    """
+    [baslangic, bitis] aralığındaki (iki uç dahil) işlem seanslarını fiyat verisinden çıkarır;
+    hafta sonları ve resmi tatiller bu nedenle ayrıca tanımlanmaz.
+
+    Returns:
+        pd.DatetimeIndex: Seans tarihleri (normalize edilmiş, artan sırada); veri alınamazsa boş.
+    """
+    bitis_sonrasi = (pd.Timestamp(bitis_tarihi) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    df = fiyat_verisi_getir(kod, baslangic_tarihi, bitis_sonrasi, cevrimdisi=cevrimdisi)
+    return pd.DatetimeIndex(df.index).normalize().unique().sort_values()
+
+
+def seans_pencereleri(seanslar, baslangic_tarihi=None):
+    """
+    Her seansa, önceki seanstan sonraki günden seansın kendisine kadar olan takvim günlerini atar; hafta sonu ve
+    tatil günlerinin haberleri böylece bir sonraki seansa aittir.
+
+    Args:
+        seanslar (pd.DatetimeIndex): Artan sıralı seans tarihleri.
+        baslangic_tarihi (str, optional): İlk seansın penceresinin başladığı gün (varsayılan ilk seansın kendisi).
+
+    Returns:
+        list: (pencerenin ilk günü, seans günü) datetime.date çiftleri.
+    """
+    seans_gunleri = [seans.date() for seans in pd.DatetimeIndex(seanslar)]
+    if not seans_gunleri:
+        return []
+    ilk = pd.Timestamp(baslangic_tarihi).date() if baslangic_tarihi is not None else seans_gunleri[0]
+    ilk_gunler = [min(ilk, seans_gunleri[0])] + [onceki + datetime.timedelta(days=1) for onceki in seans_gunleri[:-1]]
+    return list(zip(ilk_gunler, seans_gunleri))
+
+
+def gunluk_skorlar(df_duygu):
+    """
+    Duygu dosyasındaki günlük skorları ve seans ortalamasındaki ağırlıklarını döndürür. Ağırlık günün başlık
+    sayısıdır (HABER_SAYISI_SUTUNU); haber olmayan günler 0 skorla yazıldığından ortalamaya katılmaz. Başlık
+    sayısı olmayan eski dosyalarda 0 skorlu günler haber yok sayılır, diğer günlerin ağırlığı 1'dir.
+
+    Args:
+        df_duygu (pd.DataFrame): 'Date', 'sentiment_score' ve isteğe bağlı HABER_SAYISI_SUTUNU sütunlu skorlar.
+
+    Returns:
+        pd.DataFrame: Tarih indeksli (tekrarlarda son kayıt, artan sırada) 'sentiment_score' ve 'agirlik'.
+    """
+    skorlar = pd.to_numeric(df_duygu['sentiment_score'], errors='coerce').to_numpy(dtype=np.float64)
+    if HABER_SAYISI_SUTUNU in df_duygu:
+        sayilar = pd.to_numeric(df_duygu[HABER_SAYISI_SUTUNU], errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        sayilar = np.full(len(skorlar), np.nan)
+    agirliklar = np.where(np.isnan(sayilar), (skorlar != 0).astype(np.float64), sayilar)
+    gunluk = pd.DataFrame({'sentiment_score': skorlar, 'agirlik': agirliklar},
+                          index=pd.DatetimeIndex(pd.to_datetime(df_duygu['Date'])).normalize())
+    gunluk = gunluk[~gunluk.index.duplicated(keep='last')].dropna(subset=['sentiment_score'])
+    return gunluk.sort_index()
+
+
+def seanslara_topla(df_duygu, seanslar):
+    """
+    Takvim günü bazındaki duygu skorlarını seanslara as-of (ileriye doğru) toplar: her gün, o güne eşit veya
+    ondan sonraki ilk seansa atanır. Hafta sonu/tatil skorları seanslarla sol birleştirmede olduğu gibi kaybolmaz,
+    pazartesi (ya da tatil sonrası ilk seans) skoruna katılır.
+    Seans skoru günlük skorların başlık sayısıyla ağırlıklı ortalamasıdır (bkz. gunluk_skorlar): haber olmayan bir
+    hafta sonu pazartesinin skorunu 0'a doğru çekmez. Penceresinde hiç haber olmayan seansın skoru 0'dır.
+    Yalnızca seans günleri için skor içeren bir dosyada sonuç sol birleştirmeyle birebir aynıdır.
+
+    Args:
+        df_duygu (pd.DataFrame): 'Date', 'sentiment_score' ve isteğe bağlı HABER_SAYISI_SUTUNU sütunlu skorlar.
+        seanslar (pd.DatetimeIndex): Artan sıralı seans tarihleri (örn. fiyat verisinin indeksi).
+
+    Returns:
+        pd.Series: Seans indeksli skorlar; penceresinde hiç skor satırı olmayan seanslar NaN. İlk seanstan önceki ve
+        son seanstan sonraki günler (ait oldukları seans aralıkta olmadığından) dışarıda kalır.
+    """
+    seanslar = pd.DatetimeIndex(seanslar)
+    gunluk = gunluk_skorlar(df_duygu)
+
+    seans_anlari = seanslar.normalize().to_numpy().astype('datetime64[ns]')
+    gun_anlari = gunluk.index.to_numpy().astype('datetime64[ns]')
+    konum = np.searchsorted(seans_anlari, gun_anlari, side='left')
+    gecerli = (konum < len(seans_anlari)) & (gun_anlari >= seans_anlari[0]) if len(seans_anlari) else konum < 0
+
+    degerler = gunluk['sentiment_score'].to_numpy()[gecerli]
+    agirliklar = gunluk['agirlik'].to_numpy()[gecerli]
+    toplam = np.bincount(konum[gecerli], weights=degerler * agirliklar, minlength=len(seanslar))
+    toplam_agirlik = np.bincount(konum[gecerli], weights=agirliklar, minlength=len(seanslar))
+    sayi = np.bincount(konum[gecerli], minlength=len(seanslar))
+    ortalama = np.where(sayi > 0, 0.0, np.nan)
+    np.divide(toplam, toplam_agirlik, out=ortalama, where=toplam_agirlik > 0)
+    return pd.Series(ortalama, index=seanslar, name='sentiment_score')
\ No newline at end of file
@@ -0,0 +1,169 @@
+import numpy as np
+
+# Moody & Saffell'in diferansiyel oranlarında paydası henüz oluşmamış adımlar için alt sınır
+_EPS = 1e-12
+
+
+class OdulFonksiyonu:
+    """
+    N portföy için adım ödülünü hesaplayan temel sınıf. Durum (N,) dizilerinde tutulur ve her adım O(1)'dir;
+    bu yüzden aynı nesne hem TicaretOrtami (N=1) hem de VektorTicaretOrtami içinde kullanılır.
+    """
+    def __init__(self, n_ortam=1):
+        self.n_ortam = n_ortam
+        self.sifirla(slice(None))
+
+    def sifirla(self, indisler):
+        pass
+
+    def hesapla(self, onceki_deger, yeni_deger, aktif=None):
+        """
+        Args:
+            onceki_deger, yeni_deger: (N,) portföy değerleri (adımdan önce / sonra).
+            aktif (np.ndarray, optional): (N,) bool; False olan portföyler 0 ödül alır ve durumları değişmez.
+
+        Returns:
+            np.ndarray: (N,) float64 ödüller.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _getiri(onceki_deger, yeni_deger):
+        onceki_deger = np.atleast_1d(np.asarray(onceki_deger, dtype=np.float64))
+        yeni_deger = np.atleast_1d(np.asarray(yeni_deger, dtype=np.float64))
+        getiri = np.zeros(np.broadcast(onceki_deger, yeni_deger).shape)
+        return np.divide(yeni_deger - onceki_deger, onceki_deger, out=getiri, where=onceki_deger != 0)
+
+    @staticmethod
+    def _guncelle(durum, yeni, aktif):
+        if aktif is None:
+            durum[:] = yeni
+        else:
+            np.copyto(durum, yeni, where=aktif)
+
+
+class PnlOdulu(OdulFonksiyonu):
+    """ Portföy değerindeki değişim (ortamın varsayılan ödülü). """
+    def hesapla(self, onceki_deger, yeni_deger, aktif=None):
+        odul = np.asarray(yeni_deger, dtype=np.float64) - onceki_deger
+        return odul if aktif is None else np.where(aktif, odul, 0.0)
+
+
+class DiferansiyelSharpeOdulu(OdulFonksiyonu):
+    """
+    Moody & Saffell diferansiyel Sharpe oranı: Sharpe oranının bu adımın getirisine göre anlık değişimi.
+    Getirinin birinci (A) ve ikinci (B) momentleri çevrimiçi güncellenir:
+    eta=None ise 1/t ağırlığıyla bölüm başından beri ortalama (Welford tarzı), aksi halde sabit eta ile üstel ortalama.
+    """
+    def __init__(self, n_ortam=1, eta=None):
+        self.eta = eta
+        self.A = np.zeros(n_ortam)
+        self.B = np.zeros(n_ortam)
+        self.t = np.zeros(n_ortam, dtype=np.int64)
+        super().__init__(n_ortam)
+
+    def sifirla(self, indisler):
+        self.A[indisler] = 0.0
+        self.B[indisler] = 0.0
+        self.t[indisler] = 0
+
+    def hesapla(self, onceki_deger, yeni_deger, aktif=None):
+        R = self._getiri(onceki_deger, yeni_deger)
+        t = self.t + 1
+        delta_A = R - self.A
+        delta_B = R * R - self.B
+        varyans = self.B - self.A * self.A
+        payda = np.power(np.maximum(varyans, 0.0), 1.5)
+        odul = np.divide(self.B * delta_A - 0.5 * self.A * delta_B, payda, out=np.zeros_like(R), where=payda > _EPS)
+
+        eta = 1.0 / t if self.eta is None else self.eta
+        self._guncelle(self.A, self.A + eta * delta_A, aktif)
+        self._guncelle(self.B, self.B + eta * delta_B, aktif)
+        self._guncelle(self.t, t, aktif)
+        return odul if aktif is None else np.where(aktif, odul, 0.0)
+
+
+class DiferansiyelSortinoOdulu(OdulFonksiyonu):
+    """
+    Moody & Saffell diferansiyel aşağı yönlü sapma oranı (Sortino oranının çevrimiçi karşılığı).
+    Ortalama getiri (A) ile yalnızca negatif getirilerin ikinci momenti (DD2) DiferansiyelSharpeOdulu'ndaki gibi güncellenir.
+    """
+    def __init__(self, n_ortam=1, eta=None):
+        self.eta = eta
+        self.A = np.zeros(n_ortam)
+        self.DD2 = np.zeros(n_ortam)
+        self.t = np.zeros(n_ortam, dtype=np.int64)
+        super().__init__(n_ortam)
+
+    def sifirla(self, indisler):
+        self.A[indisler] = 0.0
+        self.DD2[indisler] = 0.0
+        self.t[indisler] = 0
+
+    def hesapla(self, onceki_deger, yeni_deger, aktif=None):
+        R = self._getiri(onceki_deger, yeni_deger)
+        t = self.t + 1
+        DD = np.sqrt(self.DD2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            odul = np.where(
+                R > 0,
+                (R - 0.5 * self.A) / DD,
+                (self.DD2 * (R - 0.5 * self.A) - 0.5 * self.A * R * R) / (self.DD2 * DD),
+            )
+        odul = np.where(DD > _EPS, odul, 0.0)
+
+        eta = 1.0 / t if self.eta is None else self.eta
+        asagi = np.minimum(R, 0.0)
+        self._guncelle(self.A, self.A + eta * (R - self.A), aktif)
+        self._guncelle(self.DD2, self.DD2 + eta * (asagi * asagi - self.DD2), aktif)
+        self._guncelle(self.t, t, aktif)
+        return odul if aktif is None else np.where(aktif, odul, 0.0)
+
+
+class DususCezaliPnlOdulu(OdulFonksiyonu):
+    """
+    PnL'den, zirveden düşüşün (drawdown) bu adımdaki artışının ceza katsayısıyla çarpımını çıkarır.
+    Zirve değeri çevrimiçi izlenir; yeni zirvede düşüş sıfırlanır ve ceza uygulanmaz.
+    """
+    def __init__(self, n_ortam=1, ceza=1.0):
+        self.ceza = ceza
+        self.zirve = np.full(n_ortam, np.nan)
+        self.dusus = np.zeros(n_ortam)
+        super().__init__(n_ortam)
+
+    def sifirla(self, indisler):
+        self.zirve[indisler] = np.nan
+        self.dusus[indisler] = 0.0
+
+    def hesapla(self, onceki_deger, yeni_deger, aktif=None):
+        onceki_deger = np.asarray(onceki_deger, dtype=np.float64)
+        yeni_deger = np.asarray(yeni_deger, dtype=np.float64)
+        zirve = np.fmax(np.fmax(self.zirve, onceki_deger), yeni_deger)
+        dusus = zirve - yeni_deger
+        odul = (yeni_deger - onceki_deger) - self.ceza * np.maximum(dusus - self.dusus, 0.0)
+
+        self._guncelle(self.zirve, zirve, aktif)
+        self._guncelle(self.dusus, dusus, aktif)
+        return odul if aktif is None else np.where(aktif, odul, 0.0)
+
+
+ODUL_FONKSIYONLARI = {
+    'pnl': PnlOdulu,
+    'sharpe': DiferansiyelSharpeOdulu,
+    'sortino': DiferansiyelSortinoOdulu,
+    'dusus_cezali': DususCezaliPnlOdulu,
+}
+
+
+def odul_fonksiyonu_olustur(ad, n_ortam=1, **parametreler):
+    """
+    Ada göre ödül fonksiyonu oluşturur.
+
+    Args:
+        ad (str): 'pnl', 'sharpe', 'sortino' veya 'dusus_cezali'.
+        n_ortam (int): Aynı anda izlenecek portföy sayısı.
+        **parametreler: Sınıfa özel ayarlar (örn. eta=0.01, ceza=2.0).
+    """
+    if ad not in ODUL_FONKSIYONLARI:
+        raise ValueError(f"Bilinmeyen ödül fonksiyonu: '{ad}'. Seçenekler: {list(ODUL_FONKSIYONLARI)}")
+    return ODUL_FONKSIYONLARI[ad](n_ortam, **parametreler)
\ No newline at end of file
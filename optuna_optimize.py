@@ -1,21 +1,32 @@
 import optuna
 import pandas as pd
 from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecMonitor
 import torch as th
 import sqlite3 # Optuna'nın veritabanı için
 
 # Proje dosyalarımızı import ediyoruz
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
+from vektor_ortam import VektorTicaretOrtami
+
+# Eğitimde aynı anda adımlanan portföy sayısı
+ORTAM_SAYISI = 8
+# Eğitim bölümlerinin uzunluğu; test ortamı ise tüm test dönemini tek bölümde oynar
+BOLUM_UZUNLUGU = 256
+# Çalışmanın adı. "ppo_optimization_v1" denemeleri tek ortamda tüm eğitim dönemini tek bölümde oynayarak
+# yapılmıştı; vektörleştirilmiş ortamda rastgele BOLUM_UZUNLUGU günlük bölümlerle eğitilen denemelerin
+# sonuçları onlarla karşılaştırılamayacağından yeni denemeler ayrı bir çalışmaya yazılır
+CALISMA_ADI = "ppo_optimization_v2"
 
 # --- VERİYİ BİR KEZ BAŞTA YÜKLEYELİM ---
 print("Optimizasyon için eğitim ve test verileri hazırlanıyor...")
-EĞİTİM_VERİSİ = veri_cek_ve_hazirla(
+EĞİTİM_VERİSİ = veri_seti_hazirla(
     hisse_kodu="THYAO.IS",
     baslangic_tarihi="2020-01-01",
     bitis_tarihi="2024-12-31"
 )
-TEST_VERİSİ = veri_cek_ve_hazirla(
+TEST_VERİSİ = veri_seti_hazirla(
     hisse_kodu="THYAO.IS",
     baslangic_tarihi="2025-01-01",
     bitis_tarihi="2025-09-12" # Bugünün tarihi
@@ -35,8 +46,9 @@ def objective(trial):
             activation_fn=th.nn.ReLU
         )
 
-        eğitim_ortamı = TicaretOrtami(df=EĞİTİM_VERİSİ, baslangic_bakiye=100000)
-        model = PPO("MlpPolicy", eğitim_ortamı, policy_kwargs=policy_kwargs, learning_rate=learning_rate, n_steps=n_steps, gamma=gamma, verbose=0)
+        eğitim_ortamı = VecMonitor(VektorTicaretOrtami(df=EĞİTİM_VERİSİ, n_ortam=ORTAM_SAYISI, baslangic_bakiye=100000, bolum_uzunlugu=BOLUM_UZUNLUGU))
+        # n_steps ortam başına olduğu için rollout boyutu denemedeki değerle aynı kalsın diye bölüyoruz
+        model = PPO("MlpPolicy", eğitim_ortamı, policy_kwargs=policy_kwargs, learning_rate=learning_rate, n_steps=n_steps // ORTAM_SAYISI, gamma=gamma, verbose=0)
         model.learn(total_timesteps=30000)
 
         test_ortamı = TicaretOrtami(df=TEST_VERİSİ, baslangic_bakiye=100000)
@@ -59,7 +71,7 @@ if __name__ == "__main__":
     # --- YENİ EKLENEN KISIM: KALICI KAYIT AYARI ---
     # Sonuçları saklamak için bir veritabanı dosyası tanımlıyoruz.
     storage_name = "sqlite:///optuna_study.db"
-    study_name = "ppo_optimization_v1" # Çalışmamıza bir isim veriyoruz
+    study_name = CALISMA_ADI # Çalışmamıza bir isim veriyoruz
 
     # Optuna'ya bu veritabanını kullanmasını ve eğer varsa eski çalışmayı yüklemesini söylüyoruz.
     study = optuna.create_study(
@@ -68,6 +80,9 @@ if __name__ == "__main__":
         direction="maximize",
         load_if_exists=True # Bu satır, kaldığı yerden devam etmeyi sağlar!
     )
+    # Denemelerin hangi eğitim düzeniyle yapıldığı çalışmanın kendisinde de kayıtlı olsun
+    study.set_user_attr("ortam_sayisi", ORTAM_SAYISI)
+    study.set_user_attr("bolum_uzunlugu", BOLUM_UZUNLUGU)
     # ---------------------------------------------
     
     # n_trials: Toplamda kaç deneme yapılacağını belirtir.
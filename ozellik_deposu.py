@@ -0,0 +1,228 @@
+import gc
+import os
+import pickle
+import secrets
+import tempfile
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from ticaret_ortami import piyasa_dizilerini_hazirla, PIYASA_OZELLIKLERI
+
+OZELLIK_DOSYASI = "ozellikler.npy"
+FIYAT_DOSYASI = "fiyatlar.npy"
+
+
+class OzellikDeposu:
+    """
+    Ölçeklenmiş piyasa özelliklerini ve kapanış fiyatlarını süreçler arasında kopyalamadan paylaşan salt okunur depo.
+
+    Depo ya multiprocessing.shared_memory içinde ya da bellek eşlemli .npy dosyalarında tutulur.
+    Pickle edildiğinde yalnızca konumu taşınır; SubprocVecEnv veya Optuna işçileri depoya bağlanır,
+    DataFrame'i ya da scaler'ı yeniden yüklemez ve yeniden ölçekleme yapmaz.
+    """
+    def __init__(self, ozellikler, fiyatlar, tur, konum, _bellek=None, _sahip=False):
+        ozellikler.flags.writeable = False
+        fiyatlar.flags.writeable = False
+        self.ozellikler = ozellikler
+        self.fiyatlar = fiyatlar
+        self.tur = tur
+        self.konum = konum
+        self._bellek = _bellek
+        self._sahip = _sahip
+
+    def __len__(self):
+        return len(self.fiyatlar)
+
+    # --- Paylaşılan bellek ---
+
+    @staticmethod
+    def _bellek_dizileri(bellek, satir_sayisi):
+        # Yerleşim: önce float64 fiyatlar, ardından float32 özellikler (8n bayt ofseti 4'e hizalıdır)
+        fiyatlar = np.ndarray((satir_sayisi,), dtype=np.float64, buffer=bellek.buf)
+        ozellikler = np.ndarray(
+            (satir_sayisi, len(PIYASA_OZELLIKLERI)), dtype=np.float32, buffer=bellek.buf, offset=fiyatlar.nbytes
+        )
+        return ozellikler, fiyatlar
+
+    @classmethod
+    def paylasimli_bellekte_olustur(cls, df, ad=None):
+        """
+        df'yi bir kez ölçekleyip sonuçları yeni bir paylaşılan bellek bloğuna yazar.
+        Oluşturan süreç bloğun sahibidir ve işi bitince sil() çağırmalıdır.
+        """
+        _, ozellikler, fiyatlar = piyasa_dizilerini_hazirla(df)
+        ad = ad or f"ticaret_{secrets.token_hex(6)}"
+        bellek = shared_memory.SharedMemory(name=ad, create=True, size=fiyatlar.nbytes + ozellikler.nbytes)
+        ozellikler_paylasimli, fiyatlar_paylasimli = cls._bellek_dizileri(bellek, len(fiyatlar))
+        fiyatlar_paylasimli[:] = fiyatlar
+        ozellikler_paylasimli[:] = ozellikler
+        return cls(ozellikler_paylasimli, fiyatlar_paylasimli, 'paylasimli', (ad, len(fiyatlar)), bellek, _sahip=True)
+
+    @classmethod
+    def paylasimli_bellege_baglan(cls, ad, satir_sayisi):
+        # Sahiple aynı resource_tracker'ı paylaşan alt süreçlerde (spawn/fork) izleyici zaten çalışıyordur.
+        # Bağımsız başlatılmış bir süreçte ise Python < 3.13 bloğu kendi izleyicisine kaydeder ve süreç
+        # bitince siler; blok sahibine ait olduğu için bu durumda kaydı geri alıyoruz.
+        izleyici_paylasiliyor = getattr(resource_tracker._resource_tracker, '_fd', None) is not None
+        bellek = shared_memory.SharedMemory(name=ad)
+        if not izleyici_paylasiliyor:
+            try:
+                resource_tracker.unregister(bellek._name, "shared_memory")
+            except Exception:
+                pass
+        ozellikler, fiyatlar = cls._bellek_dizileri(bellek, satir_sayisi)
+        return cls(ozellikler, fiyatlar, 'paylasimli', (ad, satir_sayisi), bellek)
+
+    # --- Bellek eşlemli dosyalar ---
+
+    @classmethod
+    def dosyaya_yaz(cls, df, klasor):
+        """ df'yi bir kez ölçekleyip klasöre .npy olarak yazar ve bellek eşlemli olarak açar. """
+        _, ozellikler, fiyatlar = piyasa_dizilerini_hazirla(df)
+        os.makedirs(klasor, exist_ok=True)
+        np.save(os.path.join(klasor, OZELLIK_DOSYASI), ozellikler)
+        np.save(os.path.join(klasor, FIYAT_DOSYASI), fiyatlar)
+        return cls.dosyadan_ac(klasor)
+
+    @classmethod
+    def parcalardan_yaz(cls, parcalar, klasor, scaler=None):
+        """
+        Belleğe sığmayan veriyi parça parça depoya yazar; hiçbir anda tüm veri bellekte tutulmaz.
+        İlk geçişte ham özellikler diske eklenir ve ölçekleyici partial_fit ile eğitilir, ikinci geçişte
+        ham dosya bellek eşlemli okunup parça parça ölçeklenir. Sonuç dosyaya_yaz ile aynıdır.
+
+        Args:
+            parcalar (iterable): PIYASA_OZELLIKLERI sütunlarını içeren DataFrame parçaları (zaman sırasıyla).
+            klasor (str): Deponun yazılacağı klasör.
+            scaler (MinMaxScaler, optional): Önceden eğitilmiş ölçekleyici (örn. test verisi için eğitimdeki).
+
+        Returns:
+            tuple: (OzellikDeposu, kullanılan scaler)
+        """
+        os.makedirs(klasor, exist_ok=True)
+        ham_yolu = os.path.join(klasor, "ham_ozellikler.bin")
+        egit = scaler is None
+        if egit:
+            scaler = MinMaxScaler(feature_range=(-1, 1))
+
+        satir_sayisi = 0
+        with open(ham_yolu, "wb") as ham:
+            for parca in parcalar:
+                if len(parca) == 0:
+                    continue
+                degerler = np.ascontiguousarray(parca[PIYASA_OZELLIKLERI].to_numpy(dtype=np.float64))
+                if egit:
+                    scaler.partial_fit(degerler)
+                ham.write(degerler.tobytes())
+                satir_sayisi += len(degerler)
+        if satir_sayisi == 0:
+            os.remove(ham_yolu)
+            raise ValueError("Depoya yazılacak satır bulunamadı.")
+
+        ham_degerler = np.memmap(ham_yolu, dtype=np.float64, mode='r', shape=(satir_sayisi, len(PIYASA_OZELLIKLERI)))
+        ozellikler = np.lib.format.open_memmap(
+            os.path.join(klasor, OZELLIK_DOSYASI), mode='w+', dtype=np.float32, shape=ham_degerler.shape
+        )
+        fiyatlar = np.lib.format.open_memmap(
+            os.path.join(klasor, FIYAT_DOSYASI), mode='w+', dtype=np.float64, shape=(satir_sayisi,)
+        )
+        parca_boyutu = 1 << 18
+        for i in range(0, satir_sayisi, parca_boyutu):
+            blok = np.array(ham_degerler[i:i + parca_boyutu])
+            ozellikler[i:i + parca_boyutu] = scaler.transform(blok)
+            fiyatlar[i:i + parca_boyutu] = blok[:, PIYASA_OZELLIKLERI.index('Close')]
+        ozellikler.flush()
+        fiyatlar.flush()
+        del ozellikler, fiyatlar, ham_degerler
+        os.remove(ham_yolu)
+        return cls.dosyadan_ac(klasor), scaler
+
+    @classmethod
+    def dosyadan_ac(cls, klasor):
+        ozellikler = np.load(os.path.join(klasor, OZELLIK_DOSYASI), mmap_mode='r')
+        fiyatlar = np.load(os.path.join(klasor, FIYAT_DOSYASI), mmap_mode='r')
+        return cls(ozellikler, fiyatlar, 'dosya', os.path.abspath(klasor))
+
+    # --- Pickle: yalnızca konum taşınır ---
+
+    def __getstate__(self):
+        return {'tur': self.tur, 'konum': self.konum}
+
+    def __setstate__(self, durum):
+        if durum['tur'] == 'paylasimli':
+            depo = OzellikDeposu.paylasimli_bellege_baglan(*durum['konum'])
+        else:
+            depo = OzellikDeposu.dosyadan_ac(durum['konum'])
+        self.__dict__.update(depo.__dict__)
+
+    def kapat(self):
+        """ Bu süreçteki bağlantıyı kapatır; diziler bundan sonra kullanılmamalıdır. """
+        if self._bellek is not None:
+            self.ozellikler = self.fiyatlar = None
+            self._bellek.close()
+            self._bellek = None
+
+    def sil(self):
+        """ Paylaşılan bellek bloğunu sistemden kaldırır (yalnızca sahibi çağırmalıdır). """
+        bellek = self._bellek
+        self.kapat()
+        if self._sahip and bellek is not None:
+            bellek.unlink()
+
+
+def gidis_donus_dogrula(df, adim_sayisi=50):
+    """
+    Her iki depo türü için pickle gidiş-dönüşünü ve depodan kurulan ortamları df'den kurulan ortamla karşılaştırır.
+    Ortamlar, başka hiçbir yerde tutulmayan (pickle'dan yeni açılmış) bir depoyla kurulur ve depo nesnesi çöp
+    toplandıktan sonra adımlanır; ortam depoyu tutmazsa paylaşılan bellek eşlemesi kapanır ve süreç çöker.
+
+    Raises:
+        AssertionError: Diziler veya gözlemler df'den hesaplananlardan farklıysa.
+    """
+    from ticaret_ortami import TicaretOrtami
+    from vektor_ortam import VektorTicaretOrtami
+
+    _, beklenen_ozellikler, beklenen_fiyatlar = piyasa_dizilerini_hazirla(df)
+    referans = TicaretOrtami(df=df)
+    aksiyonlar = np.random.default_rng(0).integers(0, 3, adim_sayisi).tolist()
+
+    with tempfile.TemporaryDirectory() as klasor:
+        depolar = [OzellikDeposu.paylasimli_bellekte_olustur(df), OzellikDeposu.dosyaya_yaz(df, klasor)]
+        try:
+            for depo in depolar:
+                kopya = pickle.loads(pickle.dumps(depo))
+                assert np.array_equal(kopya.ozellikler, beklenen_ozellikler), f"{depo.tur}: özellikler farklı"
+                assert np.array_equal(kopya.fiyatlar, beklenen_fiyatlar), f"{depo.tur}: fiyatlar farklı"
+                del kopya
+
+                ortam = TicaretOrtami(depo=pickle.loads(pickle.dumps(depo)))
+                vektor = VektorTicaretOrtami(depo=pickle.loads(pickle.dumps(depo)), n_ortam=2)
+                izler = [weakref.ref(ortam.depo), weakref.ref(vektor.depo)]
+                gc.collect()
+                # Depoyu yalnızca ortamlar tutuyor; ortamlar yaşadıkça depo (ve bellek eşlemesi) de yaşamalı
+                assert all(iz() is not None for iz in izler), f"{depo.tur}: ortam depoyu tutmuyor"
+                beklenen, _ = referans.reset()
+                gozlem, _ = ortam.reset()
+                vektor_gozlem = vektor.reset()
+                for aksiyon in aksiyonlar:
+                    assert np.array_equal(gozlem, beklenen) and np.array_equal(vektor_gozlem[0], beklenen), \
+                        f"{depo.tur}: depodan kurulan ortamın gözlemi farklı"
+                    beklenen = referans.step(aksiyon)[0]
+                    gozlem = ortam.step(aksiyon)[0]
+                    vektor_gozlem = vektor.step([aksiyon, aksiyon])[0]
+                del ortam, vektor
+                gc.collect()
+        finally:
+            for depo in depolar:
+                depo.sil()
+
+
+if __name__ == "__main__":
+    from performans_olcumu import sentetik_ham_veri
+    from veri_hazirlama import verileri_birlestir
+
+    gidis_donus_dogrula(verileri_birlestir(*sentetik_ham_veri(2_000)))
+    print("Depo gidiş-dönüş doğrulaması başarılı (paylaşılan bellek ve bellek eşlemli dosya).")
\ No newline at end of file
@@ -0,0 +1,216 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from veri_hazirlama import verileri_birlestir
+from ticaret_ortami import TicaretOrtami
+
+# --- PARAMETRELER ---
+VERI_BOYUTLARI = [1_000, 10_000, 100_000]
+OLCUM_ADIMI = 20_000
+RESET_TEKRARI = 2_000
+TAHMIN_TEKRARI = 500
+MODEL_DOSYASI = "ppo_champion_model.zip"
+CIKTI_DOSYASI = "performans_sonuclari.json"
+# --------------------
+
+
+def sentetik_ham_veri(satir_sayisi, seed=42):
+    """
+    Ağ erişimi olmadan ölçüm yapabilmek için yf.download ve duygu CSV'si biçiminde sentetik veri üretir.
+
+    Returns:
+        tuple: (df_hisse, df_endeks, df_duygu)
+    """
+    rng = np.random.default_rng(seed)
+    tarihler = pd.bdate_range("2000-01-03", periods=satir_sayisi)
+    hisse_kapanis = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, satir_sayisi)))
+    endeks_kapanis = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.01, satir_sayisi)))
+    df_hisse = pd.DataFrame({'Close': hisse_kapanis, 'Volume': rng.integers(100_000, 10_000_000, satir_sayisi)}, index=tarihler)
+    df_endeks = pd.DataFrame({'Close': endeks_kapanis}, index=tarihler)
+    df_duygu = pd.DataFrame({
+        'Date': tarihler.strftime('%Y-%m-%d'),
+        'sentiment_score': rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0], satir_sayisi),
+    })
+    return df_hisse, df_endeks, df_duygu
+
+
+def _sure_istatistikleri(sureler):
+    sureler = np.asarray(sureler) * 1e6
+    return {
+        'ortalama_us': float(sureler.mean()),
+        'p50_us': float(np.percentile(sureler, 50)),
+        'p95_us': float(np.percentile(sureler, 95)),
+    }
+
+
+def ozellik_hesaplama_olc(ham_veri, tekrar=3):
+    """ verileri_birlestir (birleştirme + göstergeler) süresini ölçer. """
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        verileri_birlestir(*ham_veri)
+        sureler.append(time.perf_counter() - t0)
+    return {'en_iyi_sn': min(sureler), 'satir_sayisi': len(ham_veri[0])}
+
+
+def ortam_adimi_olc(ortam, adim_sayisi, seed=0):
+    """ Rastgele aksiyonlarla saniyedeki ham ortam adımını ölçer; bölüm bitince ortam sıfırlanır. """
+    aksiyonlar = np.random.default_rng(seed).integers(0, 3, adim_sayisi).tolist()
+    ortam.reset()
+    t0 = time.perf_counter()
+    for aksiyon in aksiyonlar:
+        _, _, terminated, truncated, _ = ortam.step(aksiyon)
+        if terminated or truncated:
+            ortam.reset()
+    sure = time.perf_counter() - t0
+    return {'adim_per_sn': adim_sayisi / sure, 'adim_sayisi': adim_sayisi}
+
+
+def reset_gecikmesi_olc(ortam, tekrar):
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        ortam.reset()
+        sureler.append(time.perf_counter() - t0)
+    return _sure_istatistikleri(sureler)
+
+
+def adim_bellek_olc(ortam, adim_sayisi, seed=0):
+    """
+    Adım başına bellek tahsisini ölçer.
+    'adim_basina_tahsis' her adımda ayrılan bellek bloklarının ortalamasıdır: izler her adımdan önce temizlenir ve
+    adımın sonunda (dönüş değeri henüz bırakılmadan) alınan anlık görüntüdeki blok sayıları toplanır; adım içinde
+    ayrılıp yine adım içinde serbest bırakılan bloklar sayılmaz, onların boyutu 'adim_basina_tepe_bayt'a yansır.
+    'adim_basina_net_blok' kalıcı olarak artan Python bellek bloğu sayısıdır (sızıntı göstergesi),
+    'tepe_bayt' tek bir adımda tracemalloc'un gördüğü en yüksek ek bellektir.
+    """
+    aksiyonlar = np.random.default_rng(seed).integers(0, 3, adim_sayisi).tolist()
+    ortam.reset()
+    tracemalloc.start()
+    baslangic_blok = sys.getallocatedblocks()
+    tahsis = 0
+    adim_tepeleri = []
+    for aksiyon in aksiyonlar:
+        # İzler (ve tepe değeri) her adımdan önce sıfırlanır; anlık görüntü yalnızca bu adımda ayrılan blokları içerir
+        tracemalloc.clear_traces()
+        sonuc = ortam.step(aksiyon)
+        adim_tepeleri.append(tracemalloc.get_traced_memory()[1])
+        tahsis += sum(istatistik.count for istatistik in tracemalloc.take_snapshot().statistics('lineno'))
+        _, _, terminated, truncated, _ = sonuc
+        del sonuc
+        if terminated or truncated:
+            ortam.reset()
+    net_blok = sys.getallocatedblocks() - baslangic_blok
+    tracemalloc.stop()
+    return {
+        'adim_basina_tahsis': tahsis / adim_sayisi,
+        'adim_basina_tepe_bayt': float(np.mean(adim_tepeleri)),
+        'adim_basina_net_blok': net_blok / adim_sayisi,
+        'tepe_bayt': int(max(adim_tepeleri)),
+        'adim_sayisi': adim_sayisi,
+    }
+
+
+def vektor_ortam_olc(df, ortam_sayisi, adim_sayisi, seed=0):
+    """ VektorTicaretOrtami'nın saniyedeki vektör adımını ölçer (stable-baselines3 gerektirir). """
+    from vektor_ortam import VektorTicaretOrtami
+
+    ortam = VektorTicaretOrtami(df, n_ortam=ortam_sayisi, baslangic_bakiye=100000)
+    aksiyonlar = np.random.default_rng(seed).integers(0, 3, (adim_sayisi, ortam_sayisi))
+    ortam.reset()
+    t0 = time.perf_counter()
+    for aksiyon in aksiyonlar:
+        ortam.step(aksiyon)
+    sure = time.perf_counter() - t0
+    return {'vektor_adim_per_sn': adim_sayisi / sure, 'ortam_adim_per_sn': adim_sayisi * ortam_sayisi / sure}
+
+
+def tahmin_gecikmesi_olc(model_dosyasi, ortam, tekrar):
+    """ Kayıtlı PPO modelinin tek gözlem için predict gecikmesini ölçer. """
+    from stable_baselines3 import PPO
+
+    model = PPO.load(model_dosyasi, device="cpu")
+    obs, _ = ortam.reset()
+    model.predict(obs, deterministic=True)  # Isınma
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        action, _ = model.predict(obs, deterministic=True)
+        sureler.append(time.perf_counter() - t0)
+        obs, _, terminated, truncated, _ = ortam.step(action)
+        if terminated or truncated:
+            obs, _ = ortam.reset()
+    return _sure_istatistikleri(sureler)
+
+
+def olcumleri_calistir(veri_boyutlari=VERI_BOYUTLARI, olcum_adimi=OLCUM_ADIMI, model_dosyasi=MODEL_DOSYASI):
+    sonuclar = {'ozellik_hesaplama': {}, 'ortam': {}, 'pencereli_ortam': {}, 'vektor_ortam': {}}
+
+    for boyut in veri_boyutlari:
+        print(f"{boyut} satırlık sentetik veriyle ölçülüyor...")
+        ham_veri = sentetik_ham_veri(boyut)
+        sonuclar['ozellik_hesaplama'][str(boyut)] = ozellik_hesaplama_olc(ham_veri)
+        df = verileri_birlestir(*ham_veri)
+
+        ortam = TicaretOrtami(df=df, baslangic_bakiye=100000)
+        sonuclar['ortam'][str(boyut)] = {
+            **ortam_adimi_olc(ortam, olcum_adimi),
+            'reset': reset_gecikmesi_olc(ortam, RESET_TEKRARI),
+            'bellek': adim_bellek_olc(ortam, olcum_adimi // 4),
+        }
+
+        pencereli_ortam = TicaretOrtami(df=df, baslangic_bakiye=100000, sequence_length=10)
+        sonuclar['pencereli_ortam'][str(boyut)] = ortam_adimi_olc(pencereli_ortam, olcum_adimi)
+
+        try:
+            sonuclar['vektor_ortam'][str(boyut)] = vektor_ortam_olc(df, 64, olcum_adimi // 10)
+        except ImportError as e:
+            sonuclar['vektor_ortam'][str(boyut)] = {'atlandi': str(e)}
+
+    if os.path.exists(model_dosyasi):
+        print(f"'{model_dosyasi}' için tahmin gecikmesi ölçülüyor...")
+        ortam = TicaretOrtami(df=verileri_birlestir(*sentetik_ham_veri(veri_boyutlari[0])), baslangic_bakiye=100000)
+        try:
+            sonuclar['ppo_tahmin'] = tahmin_gecikmesi_olc(model_dosyasi, ortam, TAHMIN_TEKRARI)
+        except ImportError as e:
+            sonuclar['ppo_tahmin'] = {'atlandi': str(e)}
+    else:
+        sonuclar['ppo_tahmin'] = {'atlandi': f"'{model_dosyasi}' bulunamadı"}
+
+    return {
+        'meta': {
+            'tarih': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'olcum_adimi': olcum_adimi,
+        },
+        'sonuclar': sonuclar,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ortam, özellik hesaplama ve PPO tahmin performansını ölçer.")
+    parser.add_argument("--cikti", default=CIKTI_DOSYASI, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=VERI_BOYUTLARI, help="Sentetik veri satır sayıları")
+    parser.add_argument("--adim", type=int, default=OLCUM_ADIMI, help="Ölçüm başına ortam adımı")
+    parser.add_argument("--model", default=MODEL_DOSYASI, help="predict gecikmesi ölçülecek PPO modeli")
+    args = parser.parse_args()
+
+    rapor = olcumleri_calistir(args.boyutlar, args.adim, args.model)
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(rapor, f, indent=2, ensure_ascii=False)
+
+    print(f"\nSonuçlar '{args.cikti}' dosyasına kaydedildi.")
+    for boyut, olcum in rapor['sonuclar']['ortam'].items():
+        print(f"- {boyut} satır: {olcum['adim_per_sn']:,.0f} adım/sn, reset {olcum['reset']['ortalama_us']:.1f} µs")
\ No newline at end of file
@@ -0,0 +1,131 @@
+import gymnasium as gym
+from gymnasium import spaces
+import numpy as np
+import pandas as pd
+
+from ticaret_ortami import PIYASA_OZELLIKLERI, piyasa_dizilerini_hazirla
+
+
+def panel_olustur(cerceveler):
+    """
+    Hisse başına hazırlanmış DataFrame'leri ortak tarihlerde hizalayıp (zaman x varlık x özellik) paneline çevirir.
+
+    Args:
+        cerceveler (dict): Hisse kodu -> veri_cek_ve_hazirla çıktısı gibi PIYASA_OZELLIKLERI sütunlarını içeren DataFrame.
+
+    Returns:
+        tuple: (hisse kodları listesi, ortak tarihler, panel (T, A, F) float64, kapanış fiyatları (T, A) float64)
+    """
+    varliklar = list(cerceveler)
+    ortak_tarihler = None
+    for df in cerceveler.values():
+        ortak_tarihler = df.index if ortak_tarihler is None else ortak_tarihler.intersection(df.index)
+    ortak_tarihler = ortak_tarihler.sort_values()
+
+    # Ham özellikler float64 tutulur ki ölçekleme TicaretOrtami'nin DataFrame üzerindeki ölçeklemesiyle aynı olsun
+    panel = np.empty((len(ortak_tarihler), len(varliklar), len(PIYASA_OZELLIKLERI)), dtype=np.float64)
+    fiyatlar = np.empty((len(ortak_tarihler), len(varliklar)), dtype=np.float64)
+    for j, varlik in enumerate(varliklar):
+        df = cerceveler[varlik].loc[ortak_tarihler]
+        panel[:, j, :] = df[PIYASA_OZELLIKLERI].to_numpy()
+        fiyatlar[:, j] = df['Close'].to_numpy()
+    return varliklar, ortak_tarihler, panel, fiyatlar
+
+
+def _panel_olcekle(panel):
+    """
+    Her varlığın özelliklerini TicaretOrtami ile aynı yoldan (piyasa_dizilerini_hazirla, varlık başına bir
+    MinMaxScaler) ölçekler; tek varlıklı bir portföy TicaretOrtami ile birebir aynı piyasa gözlemlerini üretir.
+
+    Returns:
+        tuple: (varlık başına scaler listesi, ölçeklenmiş panel (T, A, F) float32)
+    """
+    scalerlar = []
+    olcekli = np.empty(panel.shape, dtype=np.float32)
+    for j in range(panel.shape[1]):
+        scaler, olcekli[:, j, :], _ = piyasa_dizilerini_hazirla(pd.DataFrame(panel[:, j, :], columns=PIYASA_OZELLIKLERI))
+        scalerlar.append(scaler)
+    return scalerlar, olcekli
+
+
+class PortfoyOrtami(gym.Env):
+    """
+    Ortak nakit bakiyesiyle birden fazla hisseyi aynı anda işleyen portföy ortamı.
+    Her varlık için TicaretOrtami'ndaki aksiyonlar (0: Al, 1: Sat, 2: Bekle) ve işlem maliyeti kullanılır.
+    Önce satışlar gerçekleşir; ardından alımlar varlık sırasıyla, nakit yetmeyen ilk emre kadar doldurulur.
+    """
+    metadata = {'render_modes': ['human']}
+
+    def __init__(self, panel, fiyatlar=None, baslangic_bakiye=10000, islem_maliyeti=0.001, varliklar=None):
+        super(PortfoyOrtami, self).__init__()
+        self.panel = panel
+        self.baslangic_bakiye = baslangic_bakiye
+        self.islem_maliyeti = islem_maliyeti
+
+        adim_sayisi, self.varlik_sayisi, ozellik_sayisi = panel.shape
+        self.varliklar = varliklar if varliklar is not None else list(range(self.varlik_sayisi))
+        if fiyatlar is None:
+            fiyatlar = panel[:, :, PIYASA_OZELLIKLERI.index('Close')]
+        self.fiyatlar = np.ascontiguousarray(fiyatlar, dtype=np.float64)
+        self._son_adim = adim_sayisi - 1
+
+        # Panel kurulumda bir kez ölçeklenir ve her zaman adımı bitişik bir satır olacak şekilde düzleştirilir
+        self.scalerlar, olcekli = _panel_olcekle(panel)
+        self.ozellikler = olcekli.reshape(adim_sayisi, self.varlik_sayisi * ozellik_sayisi)
+
+        self._alis_carpani = 1 + self.islem_maliyeti
+        self._satis_carpani = 1 - self.islem_maliyeti
+
+        self.action_space = spaces.MultiDiscrete([3] * self.varlik_sayisi)
+        # Gözlem: tüm varlıkların piyasa özellikleri + ölçekli bakiye + varlık başına ölçekli hisse sayısı
+        gozlem_boyutu = self.ozellikler.shape[1] + 1 + self.varlik_sayisi
+        self.observation_space = spaces.Box(low=-1, high=1, shape=(gozlem_boyutu,), dtype=np.float32)
+        self._gozlem = np.empty(gozlem_boyutu, dtype=np.float32)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.bakiye = float(self.baslangic_bakiye)
+        self.hisse_sayisi = np.zeros(self.varlik_sayisi, dtype=np.int64)
+        self.mevcut_adim = 0
+        self.toplam_portfoy_degeri = self.baslangic_bakiye
+        return self._sonraki_gozlem(), self._get_info()
+
+    def _sonraki_gozlem(self):
+        gozlem = self._gozlem
+        n = self.ozellikler.shape[1]
+        gozlem[:n] = self.ozellikler[self.mevcut_adim]
+        gozlem[n] = (self.bakiye / self.baslangic_bakiye) * 2 - 1
+        gozlem[n + 1:] = self.hisse_sayisi / 1000
+        return gozlem.copy()
+
+    def _get_info(self):
+        return {'toplam_portfoy_degeri': self.toplam_portfoy_degeri}
+
+    def step(self, action):
+        onceki_portfoy_degeri = self.toplam_portfoy_degeri
+        if self.mevcut_adim >= self._son_adim:
+            return self._sonraki_gozlem(), 0, True, False, self._get_info()
+
+        aksiyonlar = np.asarray(action)
+        mevcut_fiyatlar = self.fiyatlar[self.mevcut_adim]
+
+        # Satışlar
+        satim = (aksiyonlar == 1) & (self.hisse_sayisi > 0)
+        self.bakiye += (mevcut_fiyatlar[satim] * self._satis_carpani).sum()
+        self.hisse_sayisi -= satim
+
+        # Alımlar: kümülatif maliyet bakiyeyi aşana kadar varlık sırasıyla
+        alis_fiyatlari = mevcut_fiyatlar * self._alis_carpani
+        alim_istegi = aksiyonlar == 0
+        alim = alim_istegi & (np.cumsum(alis_fiyatlari * alim_istegi) <= self.bakiye)
+        self.bakiye -= alis_fiyatlari[alim].sum()
+        self.hisse_sayisi += alim
+
+        self.toplam_portfoy_degeri = self.bakiye + float(self.hisse_sayisi @ mevcut_fiyatlar)
+        self.mevcut_adim += 1
+
+        reward = self.toplam_portfoy_degeri - onceki_portfoy_degeri
+
+        terminated = self.mevcut_adim >= self._son_adim
+        truncated = False
+        return self._sonraki_gozlem(), reward, terminated, truncated, self._get_info()
\ No newline at end of file
@@ -1,21 +1,30 @@
 import pandas as pd
 from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecMonitor
 import torch as th
 
-from veri_hazirlama import veri_cek_ve_hazirla
-from ticaret_ortami import TicaretOrtami
+from veri_seti import veri_seti_hazirla
+from vektor_ortam import VektorTicaretOrtami
+
+# Aynı anda adımlanan portföy sayısı. n_steps buna bölünerek rollout başına toplam adım sabit tutulur.
+ORTAM_SAYISI = 8
+# Eğitim bölümlerinin uzunluğu (işlem günü). Her bölüm verinin rastgele bir noktasından başlar.
+BOLUM_UZUNLUGU = 256
 
 if __name__ == "__main__":
-    hisse_verisi = veri_cek_ve_hazirla(
+    hisse_verisi = veri_seti_hazirla(
         hisse_kodu="THYAO.IS",
         baslangic_tarihi="2020-01-01",
         bitis_tarihi="2024-12-31"
     )
 
     if hisse_verisi is not None:
-        env = TicaretOrtami(df=hisse_verisi, baslangic_bakiye=100000)
+        env = VecMonitor(VektorTicaretOrtami(df=hisse_verisi, n_ortam=ORTAM_SAYISI, baslangic_bakiye=100000, bolum_uzunlugu=BOLUM_UZUNLUGU))
 
         # --- OPTUNA'DAN GELEN "ŞAMPİYON" AYARLARI KULLANIYORUZ ---
+        # Bu değerler tek ortamlı, tam dönemlik bölümlerle yapılan "ppo_optimization_v1" çalışmasından gelir;
+        # vektörleştirilmiş eğitim için optuna_optimize.py'nin "ppo_optimization_v2" çalışmasındaki en iyi
+        # deneme ile güncellenmelidir
         policy_kwargs = dict(
             net_arch=dict(pi=[155, 155], vf=[155, 155]),
             activation_fn=th.nn.ReLU
@@ -25,7 +34,7 @@ if __name__ == "__main__":
             "MlpPolicy",
             env,
             learning_rate=4.431302727643054e-05,
-            n_steps=2048,
+            n_steps=2048 // ORTAM_SAYISI,
             gamma=0.9770458406880964,
             policy_kwargs=policy_kwargs,
             verbose=1,
@@ -3,7 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from stable_baselines3 import PPO
 
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
 
 MODEL_DOSYASI = "ppo_lstm_model.zip" # Yeni model dosyamızın adı
@@ -14,7 +14,7 @@ TEST_BASLANGIC_TARIHI = "2025-01-01"
 TEST_BITIS_TARIHI = "2025-09-07"
 
 print("Test verisi çekiliyor...")
-test_verisi = veri_cek_ve_hazirla(
+test_verisi = veri_seti_hazirla(
     hisse_kodu=HİSSE_KODU,
     baslangic_tarihi=TEST_BASLANGIC_TARIHI,
     bitis_tarihi=TEST_BITIS_TARIHI
@@ -22,7 +22,7 @@ test_verisi = veri_cek_ve_hazirla(
 
 if test_verisi is not None and len(test_verisi) > 15:
     # LSTM'li ortamı kuruyoruz
-    env = TicaretOrtami(df=test_verisi, baslangic_bakiye=BASLANGIC_BAKIYE)
+    env = TicaretOrtami(df=test_verisi, baslangic_bakiye=BASLANGIC_BAKIYE, sequence_length=10)
 
     model = PPO.load(MODEL_DOSYASI)
     print(f"'{MODEL_DOSYASI}' başarıyla yüklendi.")
@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 from stable_baselines3 import PPO
 
 # İlgili proje dosyalarını import ediyoruz
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
 
 # --- TEST PARAMETRELERİ ---
@@ -18,7 +18,7 @@ TEST_BITIS_TARIHI = "2025-09-06"  # Bugünün tarihi
 
 # --- 1. Veri ve Ortamı Hazırla ---
 print("Test verisi çekiliyor...")
-test_verisi = veri_cek_ve_hazirla(
+test_verisi = veri_seti_hazirla(
     hisse_kodu=HİSSE_KODU,
     baslangic_tarihi=TEST_BASLANGIC_TARIHI,
     bitis_tarihi=TEST_BITIS_TARIHI
@@ -6,7 +6,7 @@ import numpy as np
 import pandas as pd
 from stable_baselines3 import PPO
 
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
 
 # --- TEST PARAMETRELERİ ---
@@ -20,8 +20,8 @@ TEST_BITIS_TARIHI = "2025-09-07"
 
 # --- 1. Veri ve Ortamı Hazırla ---
 print("Test verisi çekiliyor...")
-# veri_cek_ve_hazirla artık duygu verisini de otomatik olarak birleştirecek
-test_verisi = veri_cek_ve_hazirla(
+# veri_seti_hazirla (veri_cek_ve_hazirla üzerinden) artık duygu verisini de otomatik olarak birleştirecek
+test_verisi = veri_seti_hazirla(
     hisse_kodu=HİSSE_KODU,
     baslangic_tarihi=TEST_BASLANGIC_TARIHI,
     bitis_tarihi=TEST_BITIS_TARIHI
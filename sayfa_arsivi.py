@@ -0,0 +1,221 @@
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+import zlib
+
+# Çekilen ham sayfaların saklandığı klasör; SAYFA_ARSIVI_KLASORU ortam değişkeniyle değiştirilebilir
+SAYFA_ARSIVI_KLASORU = os.environ.get("SAYFA_ARSIVI_KLASORU", "sayfa_arsivi")
+VERI_UZANTISI = ".sayfa"
+DIZIN_UZANTISI = ".dizin"
+KILIT_UZANTISI = ".kilit"
+ZSTD_SEVIYESI = 10
+ZLIB_SEVIYESI = 6
+
+
+def _varsayilan_kodek():
+    # zstandard kuruluysa onu (daha hızlı ve daha iyi sıkıştırır), değilse standart kütüphanedeki zlib'i kullanıyoruz
+    try:
+        import zstandard  # noqa: F401
+        return "zstd"
+    except ImportError:
+        return "zlib"
+
+
+def _sikistir(veri, kodek):
+    if kodek == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=ZSTD_SEVIYESI).compress(veri)
+    return zlib.compress(veri, ZLIB_SEVIYESI)
+
+
+def _ac(veri, kodek):
+    if kodek == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(veri)
+    return zlib.decompress(veri)
+
+
+@contextlib.contextmanager
+def _dosya_kilidi(yol):
+    # Süreçler arası özel kilit: POSIX'te fcntl.flock, Windows'ta msvcrt.locking (ilk bayt üzerinde)
+    with open(yol, "a+b") as f:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _gun(tarih):
+    if isinstance(tarih, str):
+        return datetime.date.fromisoformat(tarih)
+    if isinstance(tarih, datetime.datetime):
+        return tarih.date()
+    return tarih
+
+
+class SayfaArsivi:
+    """
+    Çekilen ham HTML sayfalarını aylık dosyalarda sıkıştırılmış olarak saklayan yerel arşiv.
+    Ayrıştırıcı veya seçici değiştiğinde yıllarca sayfa yeniden indirilmeden diskten tekrar ayrıştırılabilir.
+
+    Her ay için iki dosya vardır: kayıtların tek tek sıkıştırılıp art arda eklendiği 'YYYY-MM.sayfa' ve her satırı
+    bir kaydın (url, şirket, gün, çok günlü aramalarda ilk gün, ofset, uzunluk, kodek) bilgisini tutan
+    'YYYY-MM.dizin'. Her kayıt ayrı sıkıştırıldığı için tek bir sayfa, ay dosyasının tamamı açılmadan ofsetinden okunur.
+
+    Dosyalar yalnızca sona ekleme ile büyür: önce sayfa, sonra dizin satırı yazılır; yarıda kesilen bir yazım dizinde
+    görünmez. Aynı url yeniden kaydedilirse dizindeki son kayıt geçerlidir. Yazımlar ayın 'YYYY-MM.kilit' dosyası
+    üzerindeki kilitle sıralandığından bir ay dosyasına birden fazla süreç (örn. ay sınırını aşan pencereleri
+    arşivleyen paralel işçiler) ve iş parçacığı güvenle yazabilir.
+    """
+    def __init__(self, klasor=None, kodek=None):
+        self.klasor = klasor or SAYFA_ARSIVI_KLASORU
+        self.kodek = kodek or _varsayilan_kodek()
+        self._dizinler = {}
+        self._kilit = threading.Lock()
+
+    def _yollar(self, ay):
+        return os.path.join(self.klasor, ay + VERI_UZANTISI), os.path.join(self.klasor, ay + DIZIN_UZANTISI)
+
+    def _dizin(self, ay):
+        """ Ayın dizinini (url -> kayıt) döndürür; dosya başka bir süreç tarafından büyütüldüyse yalnızca yeni satırları okur. """
+        _, dizin_yolu = self._yollar(ay)
+        dizin, okunan = self._dizinler.get(ay, ({}, 0))
+        boyut = os.path.getsize(dizin_yolu) if os.path.exists(dizin_yolu) else 0
+        if boyut > okunan:
+            with open(dizin_yolu, "rb") as f:
+                f.seek(okunan)
+                for satir in f.read().splitlines(keepends=True):
+                    if not satir.endswith(b"\n"):
+                        break  # henüz tamamlanmamış son satır; bir sonraki okumada ele alınır
+                    okunan += len(satir)
+                    try:
+                        kayit = json.loads(satir)
+                    except ValueError:
+                        continue
+                    dizin[kayit['url']] = kayit
+            self._dizinler[ay] = (dizin, okunan)
+        return dizin
+
+    def kaydet(self, sirket_adi, gun, url, html, ilk_gun=None):
+        """
+        Args:
+            sirket_adi (str): Sayfanın arandığı şirket adı.
+            gun (datetime.date): Sayfanın ait olduğu gün (çok günlü aramalarda son gün); kaydın hangi ay dosyasına
+                yazılacağını belirler.
+            url (str): Sayfanın adresi (arşivdeki anahtar).
+            html (str): Ham sayfa içeriği.
+            ilk_gun (datetime.date, optional): Çok günlü aramalarda aralığın ilk günü (varsayılan gun).
+        """
+        gun = _gun(gun)
+        ilk_gun = _gun(ilk_gun) if ilk_gun is not None else gun
+        ay = gun.strftime("%Y-%m")
+        veri_yolu, dizin_yolu = self._yollar(ay)
+        sikistirilmis = _sikistir(html.encode("utf-8"), self.kodek)
+        with self._kilit:
+            os.makedirs(self.klasor, exist_ok=True)
+            with _dosya_kilidi(os.path.join(self.klasor, ay + KILIT_UZANTISI)):
+                with open(veri_yolu, "ab") as f:
+                    ofset = f.tell()
+                    f.write(sikistirilmis)
+                kayit = {
+                    'url': url, 'sirket': sirket_adi, 'gun': gun.isoformat(), 'ilk_gun': ilk_gun.isoformat(),
+                    'ofset': ofset, 'uzunluk': len(sikistirilmis), 'kodek': self.kodek,
+                    'zaman': round(time.time(), 3),
+                }
+                with open(dizin_yolu, "ab") as f:
+                    f.write(json.dumps(kayit, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._dizin(ay)
+
+    def _oku(self, f, kayit):
+        f.seek(kayit['ofset'])
+        return _ac(f.read(kayit['uzunluk']), kayit['kodek']).decode("utf-8")
+
+    def getir(self, url, gun):
+        """
+        Returns:
+            str veya None: Arşivdeki sayfa; yoksa None.
+        """
+        ay = _gun(gun).strftime("%Y-%m")
+        with self._kilit:
+            kayit = self._dizin(ay).get(url)
+        if kayit is None:
+            return None
+        with open(self._yollar(ay)[0], "rb") as f:
+            return self._oku(f, kayit)
+
+    def aylar(self):
+        if not os.path.isdir(self.klasor):
+            return []
+        return sorted(ad[:-len(DIZIN_UZANTISI)] for ad in os.listdir(self.klasor) if ad.endswith(DIZIN_UZANTISI))
+
+    def _sayfalari_oku(self, sirket_adi, baslangic, bitis, ortusme):
+        baslangic = _gun(baslangic) if baslangic is not None else None
+        bitis = _gun(bitis) if bitis is not None else None
+        for ay in self.aylar():
+            # Kayıtlar son günlerinin ayında durur; çakışma aranırken bitişten sonraki aylardaki pencereler de
+            # aralığa uzanabileceği için yalnızca alt sınırla eleniyor
+            if (baslangic is not None and ay < baslangic.strftime("%Y-%m")) or \
+                    (not ortusme and bitis is not None and ay > bitis.strftime("%Y-%m")):
+                continue
+            with self._kilit:
+                kayitlar = list(self._dizin(ay).values())
+            kayitlar = [
+                k for k in kayitlar
+                if (sirket_adi is None or k['sirket'] == sirket_adi)
+                and (baslangic is None or k['gun'] >= baslangic.isoformat())
+                and (bitis is None or k.get('ilk_gun' if ortusme else 'gun', k['gun']) <= bitis.isoformat())
+            ]
+            if not kayitlar:
+                continue
+            sayfalar = {}
+            with open(self._yollar(ay)[0], "rb") as f:
+                for kayit in sorted(kayitlar, key=lambda k: k['ofset']):
+                    sayfalar[kayit['url']] = self._oku(f, kayit)
+            for kayit in sorted(kayitlar, key=lambda k: (k['gun'], k['url'])):
+                yield kayit, sayfalar[kayit['url']]
+
+    def sayfalar(self, sirket_adi=None, baslangic=None, bitis=None):
+        """
+        Arşivdeki sayfaları gün sırasıyla dolaşır; her ay dosyası bir kez açılıp kayıtlar ofset sırasıyla okunur.
+
+        Args:
+            sirket_adi (str, optional): Yalnızca bu şirket için kaydedilen sayfalar.
+            baslangic, bitis (datetime.date, optional): Gün aralığı (iki uç dahil; çok günlü aramalarda son gün).
+
+        Yields:
+            tuple: (gün, url, html)
+        """
+        for kayit, html in self._sayfalari_oku(sirket_adi, baslangic, bitis, ortusme=False):
+            yield datetime.date.fromisoformat(kayit['gun']), kayit['url'], html
+
+    def pencere_sayfalari(self, sirket_adi=None, baslangic=None, bitis=None):
+        """
+        sayfalar gibidir ama aramanın kapsadığı [ilk gün, son gün] aralığı [baslangic, bitis] ile çakışan tüm
+        sayfaları, aralıklarıyla birlikte döndürür. ilk_gun kaydı olmayan eski kayıtlar tek günlük sayılır.
+
+        Yields:
+            tuple: (şirket, ilk gün, son gün, url, html)
+        """
+        for kayit, html in self._sayfalari_oku(sirket_adi, baslangic, bitis, ortusme=True):
+            yield (kayit['sirket'], datetime.date.fromisoformat(kayit.get('ilk_gun', kayit['gun'])),
+                   datetime.date.fromisoformat(kayit['gun']), kayit['url'], html)
+
+    def __len__(self):
+        with self._kilit:
+            return sum(len(self._dizin(ay)) for ay in self.aylar())
\ No newline at end of file
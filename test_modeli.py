@@ -3,7 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 # Diğer dosyalarımızdan gerekli sınıfları ve fonksiyonları import ediyoruz
-from veri_hazirlama import veri_cek_ve_hazirla
+from veri_seti import veri_seti_hazirla
 from ticaret_ortami import TicaretOrtami
 from ajan_ve_egitim import DQNAjan
 
@@ -18,7 +18,7 @@ TEST_BITIS_TARIHI = "2025-09-05"  # Bugünün tarihi
 
 # --- 1. ADIM: Test Verisini Hazırlama ---
 print("Test verisi çekiliyor...")
-test_verisi = veri_cek_ve_hazirla(
+test_verisi = veri_seti_hazirla(
     hisse_kodu=HİSSE_KODU,
     baslangic_tarihi=TEST_BASLANGIC_TARIHI,
     bitis_tarihi=TEST_BITIS_TARIHI
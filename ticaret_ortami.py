@@ -2,71 +2,196 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 
+from odul_fonksiyonlari import odul_fonksiyonu_olustur
+
+# Gözlemde kullanılan piyasa sütunları (sıra önemli, ilk sütun kapanış fiyatı)
+PIYASA_OZELLIKLERI = ['Close', 'SMA_14', 'RSI_14', 'sentiment_score']
+
+
+def piyasa_dizilerini_hazirla(df, scaler=None):
+    """
+    DataFrame'deki piyasa verisini adım döngüsünde kullanılacak NumPy dizilerine çevirir.
+
+    Args:
+        df (pd.DataFrame): PIYASA_OZELLIKLERI sütunlarını içeren veri.
+        scaler (MinMaxScaler, optional): Önceden eğitilmiş ölçekleyici. Verilmezse df üzerinde eğitilir.
+
+    Returns:
+        tuple: (scaler, ölçeklenmiş özellikler (n, 4) float32, kapanış fiyatları (n,) float64)
+    """
+    piyasa_verisi = df[PIYASA_OZELLIKLERI]
+    if scaler is None:
+        scaler = MinMaxScaler(feature_range=(-1, 1))
+        scaler.fit(piyasa_verisi)
+    # Tüm matrisi tek seferde ölçekliyoruz; satır satır transform ile aynı sonucu verir
+    ozellikler = np.ascontiguousarray(scaler.transform(piyasa_verisi), dtype=np.float32)
+    fiyatlar = np.ascontiguousarray(df['Close'].to_numpy(), dtype=np.float64)
+    return scaler, ozellikler, fiyatlar
+
+
+def pencere_gorunumu(ozellikler, sequence_length):
+    """
+    Özellik matrisi üzerinde (pencere sayısı, sequence_length, özellik sayısı) şeklinde kopyasız bir görünüm döndürür.
+    i. pencere, i. satırdan başlayan sequence_length satırdır. Bellek kullanımı pencere boyundan bağımsızdır.
+    """
+    if sequence_length < 1 or sequence_length > len(ozellikler):
+        raise ValueError(f"sequence_length 1 ile {len(ozellikler)} arasında olmalı, {sequence_length} verildi.")
+    return sliding_window_view(ozellikler, sequence_length, axis=0).transpose(0, 2, 1)
+
+
+def islemleri_uygula(bakiye, hisse_sayisi, aksiyonlar, fiyatlar, islem_maliyeti, aktif=None):
+    """
+    TicaretOrtami.step içindeki alım/satım kurallarını birden fazla portföye aynı anda uygular.
+    Diziler yerinde güncellenir; sonuçlar tek tek ortam adımlarıyla birebir aynıdır.
+
+    Args:
+        bakiye (np.ndarray): (N,) float64 nakit bakiyeleri.
+        hisse_sayisi (np.ndarray): (N,) int64 hisse adetleri.
+        aksiyonlar (np.ndarray): (N,) aksiyonlar (0: Al, 1: Sat, 2: Bekle).
+        fiyatlar (np.ndarray): (N,) float64 işlem fiyatları.
+        islem_maliyeti (float): Oransal işlem maliyeti.
+        aktif (np.ndarray, optional): (N,) bool; False olan portföylere dokunulmaz.
+
+    Returns:
+        tuple: (alım yapılanlar, satım yapılanlar) bool maskeleri.
+    """
+    alis_fiyatlari = fiyatlar * (1 + islem_maliyeti)
+    alim = (aksiyonlar == 0) & (bakiye >= alis_fiyatlari)
+    satim = (aksiyonlar == 1) & (hisse_sayisi > 0)
+    if aktif is not None:
+        alim &= aktif
+        satim &= aktif
+    # Maskeyle çarpım işlem olmayan portföylere 0.0 ekler; sonuç koşullu güncellemeyle birebir aynıdır
+    bakiye -= alim * alis_fiyatlari
+    bakiye += satim * (fiyatlar * (1 - islem_maliyeti))
+    hisse_sayisi += alim
+    hisse_sayisi -= satim
+    return alim, satim
+
+
+def bolum_araligi_sec(rng, ilk_adim, son_adim, bolum_uzunlugu):
+    """
+    Bir bölümün başlangıç ve bitiş adımlarını seçer. bolum_uzunlugu None ise tüm veri aralığı döner.
+    Aksi halde başlangıç, bölüm veri kenarlarından taşabilecek şekilde rastgele seçilip veri aralığına kırpılır;
+    böylece her gün bir bölüme eşit olasılıkla girer. Kenarlara denk gelen bölümler daha kısa olabilir.
+
+    Returns:
+        tuple: (ilk işlem adımı, bölümün bittiği adım)
+    """
+    if bolum_uzunlugu is None:
+        return ilk_adim, son_adim
+    baslangic = int(rng.integers(ilk_adim - bolum_uzunlugu + 1, son_adim))
+    return max(baslangic, ilk_adim), min(baslangic + bolum_uzunlugu, son_adim)
+
+
 class TicaretOrtami(gym.Env):
     metadata = {'render_modes': ['human']}
 
-    def __init__(self, df, baslangic_bakiye=10000, islem_maliyeti=0.001, **kwargs):
+    def __init__(self, df=None, baslangic_bakiye=10000, islem_maliyeti=0.001, sequence_length=None, bolum_uzunlugu=None, depo=None,
+                 odul_fonksiyonu='pnl', odul_parametreleri=None, **kwargs):
         super(TicaretOrtami, self).__init__()
         self.df = df
         self.baslangic_bakiye = baslangic_bakiye
         self.islem_maliyeti = islem_maliyeti
+        self.sequence_length = sequence_length
+        # None: her bölüm tüm veriyi baştan sona oynar (değerlendirme modu).
+        # Sayı: her reset'te tohumlu rastgele bir ofsetten başlayan en fazla bu uzunlukta bölümler (eğitim modu).
+        self.bolum_uzunlugu = bolum_uzunlugu
+        # 'pnl' dışındaki ödüller (bkz. odul_fonksiyonlari.py) çevrimiçi istatistik tutar, adım başına O(1)'dir
+        self.odul_fonksiyonu = odul_fonksiyonu
+        self._odul = None if odul_fonksiyonu == 'pnl' else odul_fonksiyonu_olustur(odul_fonksiyonu, 1, **(odul_parametreleri or {}))
         self.action_space = spaces.Discrete(3)
 
-        # Gözlem alanı 6 özellikli tek boyutlu vektör
-        self.observation_space = spaces.Box(low=-1, high=1, shape=(6,), dtype=np.float32)
+        # Depodan gelen diziler deponun belleğine bakan görünümlerdir; depo ortamla birlikte yaşamalı, yoksa eşleme kapanır
+        self.depo = depo
+        if depo is not None:
+            # Önceden ölçeklenmiş, süreçler arası paylaşılan salt okunur diziye bağlanıyoruz (bkz. ozellik_deposu.py)
+            self.scaler = None
+            self.ozellikler, self.fiyatlar = depo.ozellikler, depo.fiyatlar
+        else:
+            # Scaler'ı duygu skoru dahil tüm piyasa verileriyle eğitiyoruz ve
+            # tüm özellik matrisini kurulumda bir kez ölçekliyoruz. step() içinde DataFrame'e dokunulmaz.
+            self.scaler, self.ozellikler, self.fiyatlar = piyasa_dizilerini_hazirla(self.df)
+        self._son_adim = len(self.fiyatlar) - 1
+
+        if self.sequence_length is None:
+            # Gözlem alanı 6 özellikli tek boyutlu vektör
+            self.observation_space = spaces.Box(low=-1, high=1, shape=(6,), dtype=np.float32)
+            self._ilk_adim = 0
+        else:
+            # Pencereli mod: gözlem, son sequence_length günün piyasa özellikleri (sequence_length, 4).
+            # Pencereler özellik matrisinin salt okunur görünümleridir, adım başına kopya yapılmaz.
+            # Portföy durumu bu modda gözleme girmez; info üzerinden izlenir.
+            self.pencereler = pencere_gorunumu(self.ozellikler, self.sequence_length)
+            self.observation_space = spaces.Box(low=-1, high=1, shape=self.pencereler.shape[1:], dtype=np.float32)
+            # Simülasyon ilk tam pencerenin son gününde başlar
+            self._ilk_adim = self.sequence_length - 1
 
-        self.scaler = MinMaxScaler(feature_range=(-1, 1))
-        # Scaler'ı duygu skoru dahil tüm piyasa verileriyle eğitiyoruz
-        self.scaler.fit(self.df[['Close', 'SMA_14', 'RSI_14', 'sentiment_score']])
+        # Alım/satım fiyatları her adımda yeniden hesaplanmasın diye önceden hesaplanır
+        self._alis_carpani = 1 + self.islem_maliyeti
+        self._satis_carpani = 1 - self.islem_maliyeti
 
-    def reset(self, seed=None):
+        # Gözlem her adımda bu tampon üzerinde kurulur
+        self._gozlem = np.empty(6, dtype=np.float32)
+
+    def reset(self, seed=None, options=None):
         super().reset(seed=seed)
         self.bakiye = self.baslangic_bakiye
         self.hisse_sayisi = 0
-        self.mevcut_adim = 0
+        self.mevcut_adim, self._bolum_sonu = bolum_araligi_sec(
+            self.np_random, self._ilk_adim, self._son_adim, self.bolum_uzunlugu
+        )
         self.toplam_portfoy_degeri = self.baslangic_bakiye
+        if self._odul is not None:
+            self._odul.sifirla(slice(None))
         obs = self._sonraki_gozlem()
         info = self._get_info()
         return obs, info
 
     def _sonraki_gozlem(self):
-        piyasa_verisi_raw = self.df[['Close', 'SMA_14', 'RSI_14', 'sentiment_score']].iloc[self.mevcut_adim:self.mevcut_adim+1]
-        piyasa_verisi_scaled = self.scaler.transform(piyasa_verisi_raw)[0]
-        
-        bakiye_scaled = (self.bakiye / self.baslangic_bakiye) * 2 - 1 # Bakiyeyi de -1 ile 1 arasına ölçekleyelim
-        hisse_sayisi_scaled = self.hisse_sayisi / 1000 # Hisse sayısını da ölçekleyelim
-        
-        obs = np.concatenate([piyasa_verisi_scaled, [bakiye_scaled, hisse_sayisi_scaled]]).astype(np.float32)
-        return obs
+        if self.sequence_length is not None:
+            return self.pencereler[self.mevcut_adim - self._ilk_adim]
+        gozlem = self._gozlem
+        gozlem[:4] = self.ozellikler[self.mevcut_adim]
+        gozlem[4] = (self.bakiye / self.baslangic_bakiye) * 2 - 1 # Bakiyeyi de -1 ile 1 arasına ölçekleyelim
+        gozlem[5] = self.hisse_sayisi / 1000 # Hisse sayısını da ölçekleyelim
+        # Çağıran gözlemi saklayabileceği için tamponun kopyasını döndürüyoruz
+        return gozlem.copy()
 
     def _get_info(self):
         return {'toplam_portfoy_degeri': self.toplam_portfoy_degeri}
 
     def step(self, action):
         onceki_portfoy_degeri = self.toplam_portfoy_degeri
-        if self.mevcut_adim >= len(self.df) - 1:
-            return self._sonraki_gozlem(), 0, True, False, self._get_info()
-        
-        mevcut_fiyat = self.df['Close'].iloc[self.mevcut_adim]
+        if self.mevcut_adim >= self._bolum_sonu:
+            terminated = self.mevcut_adim >= self._son_adim
+            return self._sonraki_gozlem(), 0, terminated, not terminated, self._get_info()
+
+        mevcut_fiyat = self.fiyatlar[self.mevcut_adim]
         if action == 0: # Al
-            if self.bakiye >= mevcut_fiyat * (1 + self.islem_maliyeti):
-                self.bakiye -= mevcut_fiyat * (1 + self.islem_maliyeti)
+            alis_fiyati = mevcut_fiyat * self._alis_carpani
+            if self.bakiye >= alis_fiyati:
+                self.bakiye -= alis_fiyati
                 self.hisse_sayisi += 1
         elif action == 1: # Sat
             if self.hisse_sayisi > 0:
-                self.bakiye += mevcut_fiyat * (1 - self.islem_maliyeti)
+                self.bakiye += mevcut_fiyat * self._satis_carpani
                 self.hisse_sayisi -= 1
-        
+
         self.toplam_portfoy_degeri = self.bakiye + (self.hisse_sayisi * mevcut_fiyat)
         self.mevcut_adim += 1
-        
+
         # Basit ödül fonksiyonuna geri dönüyoruz
         reward = self.toplam_portfoy_degeri - onceki_portfoy_degeri
-        
-        terminated = self.mevcut_adim >= len(self.df) - 1
-        truncated = False
+        if self._odul is not None:
+            reward = float(self._odul.hesapla(onceki_portfoy_degeri, self.toplam_portfoy_degeri)[0])
+
+        terminated = self.mevcut_adim >= self._son_adim
+        # Bölüm uzunluğu dolduğunda veri bitmediği için bölüm kesilmiş (truncated) sayılır
+        truncated = not terminated and self.mevcut_adim >= self._bolum_sonu
         obs = self._sonraki_gozlem()
         info = self._get_info()
         return obs, reward, terminated, truncated, info
\ No newline at end of file
@@ -0,0 +1,177 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from odul_fonksiyonlari import odul_fonksiyonu_olustur
+from ticaret_ortami import piyasa_dizilerini_hazirla, pencere_gorunumu, islemleri_uygula, bolum_araligi_sec
+
+# Portföy başına tutulan (num_envs uzunluklu) durum dizileri; get_attr/set_attr bunlarda indisleri dikkate alır
+PORTFOY_DURUMLARI = ("bakiye", "hisse_sayisi", "mevcut_adim", "toplam_portfoy_degeri")
+
+
+class VektorTicaretOrtami(VecEnv):
+    """
+    N bağımsız portföyü NumPy dizileriyle aynı anda adımlayan vektörel ticaret ortamı.
+    Her portföy, ayrı bir TicaretOrtami örneğinin DummyVecEnv içindeki davranışıyla birebir aynıdır;
+    bölümü biten portföyler otomatik olarak sıfırlanır ve son gözlem info['terminal_observation'] içinde döner.
+    """
+    def __init__(self, df=None, n_ortam=8, baslangic_bakiye=10000, islem_maliyeti=0.001, sequence_length=None, bolum_uzunlugu=None, depo=None,
+                 odul_fonksiyonu='pnl', odul_parametreleri=None):
+        self.df = df
+        self.baslangic_bakiye = baslangic_bakiye
+        self.islem_maliyeti = islem_maliyeti
+        self.sequence_length = sequence_length
+        self.bolum_uzunlugu = bolum_uzunlugu
+        self.odul_fonksiyonu = odul_fonksiyonu
+        self._odul = None if odul_fonksiyonu == 'pnl' else odul_fonksiyonu_olustur(odul_fonksiyonu, n_ortam, **(odul_parametreleri or {}))
+        self.render_mode = None
+
+        # Özellik matrisi tüm portföyler için bir kez hazırlanır ve paylaşılır
+        # Depodan gelen diziler deponun belleğine bakan görünümlerdir; depo ortamla birlikte yaşamalı, yoksa eşleme kapanır
+        self.depo = depo
+        if depo is not None:
+            self.scaler = None
+            self.ozellikler, self.fiyatlar = depo.ozellikler, depo.fiyatlar
+        else:
+            self.scaler, self.ozellikler, self.fiyatlar = piyasa_dizilerini_hazirla(df)
+        self._son_adim = len(self.fiyatlar) - 1
+
+        if self.sequence_length is None:
+            observation_space = spaces.Box(low=-1, high=1, shape=(6,), dtype=np.float32)
+            self._ilk_adim = 0
+        else:
+            self.pencereler = pencere_gorunumu(self.ozellikler, self.sequence_length)
+            observation_space = spaces.Box(low=-1, high=1, shape=self.pencereler.shape[1:], dtype=np.float32)
+            self._ilk_adim = self.sequence_length - 1
+
+        # Portföy durumları
+        self.bakiye = np.full(n_ortam, baslangic_bakiye, dtype=np.float64)
+        self.hisse_sayisi = np.zeros(n_ortam, dtype=np.int64)
+        self.mevcut_adim = np.full(n_ortam, self._ilk_adim, dtype=np.int64)
+        self.toplam_portfoy_degeri = np.full(n_ortam, baslangic_bakiye, dtype=np.float64)
+        self._bolum_sonu = np.full(n_ortam, self._son_adim, dtype=np.int64)
+        # Her portföyün kendi rastgele sayı üreticisi vardır; tohumlanınca ayrı TicaretOrtami'larıyla aynı ofsetleri çeker
+        self._rngler = [None] * n_ortam
+
+        self._gozlemler = np.empty((n_ortam, 6), dtype=np.float32)
+        self._aksiyonlar = np.zeros(n_ortam, dtype=np.int64)
+
+        action_space = spaces.Discrete(3)
+        super().__init__(n_ortam, observation_space, action_space)
+
+    def _portfoyleri_sifirla(self, indisler):
+        self.bakiye[indisler] = self.baslangic_bakiye
+        self.hisse_sayisi[indisler] = 0
+        self.toplam_portfoy_degeri[indisler] = self.baslangic_bakiye
+        if self._odul is not None:
+            self._odul.sifirla(indisler)
+        if self.bolum_uzunlugu is None:
+            self.mevcut_adim[indisler] = self._ilk_adim
+            self._bolum_sonu[indisler] = self._son_adim
+            return
+        for i in indisler:
+            if self._rngler[i] is None:
+                self._rngler[i], _ = seeding.np_random()
+            self.mevcut_adim[i], self._bolum_sonu[i] = bolum_araligi_sec(
+                self._rngler[i], self._ilk_adim, self._son_adim, self.bolum_uzunlugu
+            )
+
+    def _gozlemleri_yaz(self):
+        if self.sequence_length is not None:
+            # Pencereli modda her portföyün penceresi toplu olarak tek seferde toplanır
+            return self.pencereler[self.mevcut_adim - self._ilk_adim]
+        gozlemler = self._gozlemler
+        gozlemler[:, :4] = self.ozellikler[self.mevcut_adim]
+        gozlemler[:, 4] = (self.bakiye / self.baslangic_bakiye) * 2 - 1
+        gozlemler[:, 5] = self.hisse_sayisi / 1000
+        return gozlemler
+
+    def _get_info(self, i):
+        return {'toplam_portfoy_degeri': self.toplam_portfoy_degeri[i]}
+
+    def reset(self):
+        for i, seed in enumerate(self._seeds):
+            if seed is not None:
+                self._rngler[i], _ = seeding.np_random(seed)
+        self._portfoyleri_sifirla(np.arange(self.num_envs))
+        self.reset_infos = [self._get_info(i) for i in range(self.num_envs)]
+        # Tohumlar yalnızca bir kez kullanılır
+        self._reset_seeds()
+        self._reset_options()
+        return self._gozlemleri_yaz().copy()
+
+    def step_async(self, actions):
+        self._aksiyonlar[:] = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        onceki_portfoy_degeri = self.toplam_portfoy_degeri.copy()
+        aktif = self.mevcut_adim < self._bolum_sonu
+        mevcut_fiyatlar = self.fiyatlar[self.mevcut_adim]
+
+        islemleri_uygula(self.bakiye, self.hisse_sayisi, self._aksiyonlar, mevcut_fiyatlar, self.islem_maliyeti, aktif)
+        np.copyto(self.toplam_portfoy_degeri, self.bakiye + self.hisse_sayisi * mevcut_fiyatlar, where=aktif)
+        self.mevcut_adim += aktif
+
+        if self._odul is None:
+            oduller = (self.toplam_portfoy_degeri - onceki_portfoy_degeri).astype(np.float32)
+        else:
+            oduller = self._odul.hesapla(onceki_portfoy_degeri, self.toplam_portfoy_degeri, aktif).astype(np.float32)
+        sonlananlar = self.mevcut_adim >= self._son_adim
+        kesilenler = ~sonlananlar & (self.mevcut_adim >= self._bolum_sonu)
+        bitenler = sonlananlar | kesilenler
+        gozlemler = self._gozlemleri_yaz()
+
+        infos = [
+            {'toplam_portfoy_degeri': deger, 'TimeLimit.truncated': kesildi}
+            for deger, kesildi in zip(self.toplam_portfoy_degeri.tolist(), kesilenler.tolist())
+        ]
+        if bitenler.any():
+            biten_indisler = np.flatnonzero(bitenler)
+            for i in biten_indisler:
+                infos[i]['terminal_observation'] = gozlemler[i].copy()
+            self._portfoyleri_sifirla(biten_indisler)
+            for i in biten_indisler:
+                self.reset_infos[i] = self._get_info(i)
+            gozlemler = self._gozlemleri_yaz()
+
+        return gozlemler.copy(), oduller, bitenler, infos
+
+    def close(self):
+        pass
+
+    def _indisler(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def _tum_ortamlar_mi(self, indices):
+        return sorted(int(i) for i in self._indisler(indices)) == list(range(self.num_envs))
+
+    def get_attr(self, attr_name, indices=None):
+        deger = getattr(self, attr_name)
+        if attr_name in PORTFOY_DURUMLARI:
+            return [deger[i] for i in self._indisler(indices)]
+        return [deger for _ in self._indisler(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        # Portföy başına tutulan durumlar yalnızca istenen portföyler için değişir; diğer öznitelikler tüm
+        # portföylerce paylaşıldığından yalnızca hepsi için birden değiştirilebilir
+        if attr_name in PORTFOY_DURUMLARI:
+            getattr(self, attr_name)[list(self._indisler(indices))] = value
+            return
+        if not self._tum_ortamlar_mi(indices):
+            raise ValueError(f"'{attr_name}' tüm portföylerce paylaşılıyor; yalnızca bazı portföyler için değiştirilemez.")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        # Metotlar paylaşılan durum üzerinde çalıştığından bir kez çağrılır ve sonuç her portföy için döndürülür
+        if not self._tum_ortamlar_mi(indices):
+            raise ValueError(f"'{method_name}' tüm portföyler üzerinde çalışır; yalnızca bazı portföyler için çağrılamaz.")
+        sonuc = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [sonuc for _ in range(self.num_envs)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indisler(indices)]
\ No newline at end of file
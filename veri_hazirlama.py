@@ -1,20 +1,153 @@
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
-def _calculate_rsi(data, window=14):
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+from veri_onbellegi import fiyat_verisi_getir
+from portfoy_ortami import panel_olustur
+from gostergeler import gostergeleri_hesapla
+from islem_takvimi import seanslara_topla
+
+ENDEKS_KODU = "XU100.IS"
+
+def _ozellik_sutunlari(hesaplanan):
+    # Varsayılan göstergelerle eski sütun sırası (Close, SMA_14, RSI_14, sentiment_score, bist100_getiri) korunur
+    return ['Close', *hesaplanan, 'sentiment_score', 'bist100_getiri']
+
+def verileri_birlestir(df_hisse, df_endeks, df_duygu, gostergeler=None, hisse_kodu=None):
+    """
+    İndirilmiş hisse, endeks ve duygu verilerini birleştirip ortamın kullandığı özellikleri hesaplar.
+    Ağ erişimi gerektirmez; veri_cek_ve_hazirla'nın hesaplama kısmıdır.
+
+    Args:
+        df_hisse (pd.DataFrame): 'Close' sütunlu hisse verisi (tarih indeksli).
+        df_endeks (pd.DataFrame): 'Close' sütunlu XU100 verisi (tarih indeksli).
+        df_duygu (pd.DataFrame): 'Date' ve 'sentiment_score' sütunlu günlük duygu skorları. İşlem olmayan
+            günlerin skorları seanslara_topla ile bir sonraki seansa aktarılır.
+        gostergeler (dict, optional): gostergeler.gostergeleri_hesapla istekleri (varsayılan VARSAYILAN_GOSTERGELER).
+        hisse_kodu (str, optional): Verilirse göstergeler (hisse, tarih aralığı, parametreler) bazında önbelleğe alınır.
+
+    Returns:
+        pd.DataFrame: 'Close', gösterge sütunları (varsayılan 'SMA_14', 'RSI_14'), 'sentiment_score', 'bist100_getiri'.
+    """
+    df_hisse = df_hisse.copy()
+    df_endeks = df_endeks.copy()
+
+    df_endeks['bist100_getiri'] = df_endeks['Close'].pct_change()
+
+    df_hisse.index = pd.to_datetime(df_hisse.index)
+    df_hisse.index.name = 'Date'
+    df_endeks.index = pd.to_datetime(df_endeks.index)
+
+    veri_birlesik = df_hisse.assign(sentiment_score=seanslara_topla(df_duygu, df_hisse.index).to_numpy())
+    veri_birlesik = pd.merge(veri_birlesik, df_endeks[['bist100_getiri']], left_index=True, right_index=True, how='left')
+
+    veri_birlesik['sentiment_score'] = veri_birlesik['sentiment_score'].fillna(0)
+    veri_birlesik['bist100_getiri'] = veri_birlesik['bist100_getiri'].fillna(0)
+
+    anahtar = None if hisse_kodu is None else (hisse_kodu, veri_birlesik.index[0], veri_birlesik.index[-1])
+    hesaplanan = gostergeleri_hesapla(veri_birlesik, gostergeler, anahtar=anahtar)
+    veri_birlesik = veri_birlesik.assign(**hesaplanan)
+
+    veri = veri_birlesik[_ozellik_sutunlari(hesaplanan)].copy()
+    veri.dropna(inplace=True)
+    return veri
+
+def evreni_hazirla(hisse_kodlari, baslangic_tarihi, bitis_tarihi, duygu_dosyalari=None, is_parcacigi_sayisi=8,
+                   cevrimdisi=None, panel=False, gostergeler=None):
+    """
+    Bir hisse listesini (örn. BIST evreni) birlikte hazırlar. Endeks bir kez çekilir, hisseler sınırlı bir iş parçacığı
+    havuzunda eş zamanlı indirilir/önbellekten okunur ve göstergeler aynı işlem günlerine sahip hisselerin
+    kapanışlarını içeren geniş bir tablo üzerinde tek geçişte hesaplanır.
+
+    Her hisse kendi tarihlerini korur ve sonucu verileri_birlestir ile aynıdır: yeni listelenmiş ya da geçmişi kısa bir
+    hisse diğerlerinin geçmişini kısaltmaz. Tarihler yalnızca panel=True ile ortak bir panel istendiğinde
+    (panel_olustur) tüm hisselerde bulunan günlere hizalanır.
 
-def veri_cek_ve_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi="thy_duygu_skorlari.csv"):
+    Args:
+        hisse_kodlari (list): Örn. ["THYAO.IS", "ASELS.IS", ...].
+        baslangic_tarihi, bitis_tarihi (str): veri_cek_ve_hazirla'daki gibi.
+        duygu_dosyalari (dict, optional): Hisse kodu -> duygu CSV dosyası. Dosyası olmayan hisselerin skoru 0 kabul edilir.
+        is_parcacigi_sayisi (int): Aynı anda yapılacak en fazla indirme sayısı.
+        cevrimdisi (bool, optional): fiyat_verisi_getir'e iletilir.
+        panel (bool): True ise panel_olustur çıktısı (varliklar, tarihler, panel, fiyatlar) döner.
+        gostergeler (dict, optional): verileri_birlestir'deki gibi.
+
+    Returns:
+        dict: Hisse kodu -> verileri_birlestir çıktısıyla aynı sütunlu DataFrame (veri alınamayan hisseler atlanır) veya panel=True ise tuple.
+    """
+    duygu_dosyalari = duygu_dosyalari or {}
+
+    def getir(kod):
+        return fiyat_verisi_getir(kod, baslangic_tarihi, bitis_tarihi, cevrimdisi=cevrimdisi)
+
+    with ThreadPoolExecutor(max_workers=is_parcacigi_sayisi) as havuz:
+        df_endeks = havuz.submit(getir, ENDEKS_KODU)
+        hisseler = dict(zip(hisse_kodlari, havuz.map(getir, hisse_kodlari)))
+        df_endeks = df_endeks.result()
+
+    gecerli_hisseler = {}
+    for kod, df in hisseler.items():
+        if df.empty or 'Close' not in df.columns:
+            print(f"UYARI: {kod} için geçerli veri bulunamadı, evrenden çıkarılıyor.")
+            continue
+        gecerli_hisseler[kod] = df
+    if not gecerli_hisseler:
+        return {}
+
+    # Geniş tablolar: satırlar tüm hisselerin tarihlerinin birleşimi, sütunlar hisseler
+    kapanis = pd.concat({kod: df['Close'] for kod, df in gecerli_hisseler.items()}, axis=1).sort_index()
+    genis_tablolar = {'Close': kapanis}
+    for sutun in ('High', 'Low'):
+        if all(sutun in df.columns for df in gecerli_hisseler.values()):
+            genis = pd.concat({kod: df[sutun] for kod, df in gecerli_hisseler.items()}, axis=1)
+            genis_tablolar[sutun] = genis.reindex(index=kapanis.index, columns=kapanis.columns)
+
+    endeks_getiri = df_endeks['Close'].pct_change() if not df_endeks.empty else pd.Series(dtype=float)
+
+    # Aynı günlerde işlem gören hisseler (çoğunlukla evrenin tamamı) bir grupta toplanır; göstergeler her grup için
+    # yalnızca grubun kendi tarihleri üzerinde tek geçişte hesaplanır, böylece bir hissenin olmadığı günler
+    # diğerlerinin göstergelerine boşluk sokmaz
+    islem_gunleri = ~np.isnan(kapanis.to_numpy())
+    gruplar = {}
+    for j, kod in enumerate(kapanis.columns):
+        gruplar.setdefault(islem_gunleri[:, j].tobytes(), (islem_gunleri[:, j], []))[1].append(kod)
+
+    cerceveler = {}
+    for satirlar, kodlar in gruplar.values():
+        tarihler = kapanis.index[satirlar]
+        girdiler = {ad: tablo.loc[satirlar, kodlar].to_numpy() for ad, tablo in genis_tablolar.items()}
+        anahtar = (tuple(kodlar), tarihler[0], tarihler[-1])
+        hesaplanan = gostergeleri_hesapla(girdiler, gostergeler, anahtar=anahtar)
+        sutunlar = _ozellik_sutunlari(hesaplanan)
+        getiri = endeks_getiri.reindex(tarihler).fillna(0).to_numpy()
+        for j, kod in enumerate(kodlar):
+            if kod in duygu_dosyalari:
+                duygu = seanslara_topla(pd.read_csv(duygu_dosyalari[kod]), tarihler).fillna(0).to_numpy()
+            else:
+                duygu = np.zeros(len(tarihler))
+            df = pd.DataFrame({
+                'Close': girdiler['Close'][:, j],
+                **{ad: dizi[:, j] for ad, dizi in hesaplanan.items()},
+                'sentiment_score': duygu,
+                'bist100_getiri': getiri,
+            }, index=tarihler)
+            gecerli = ~np.isnan(girdiler['Close'][:, j])
+            for dizi in hesaplanan.values():
+                gecerli &= ~np.isnan(dizi[:, j])
+            cerceveler[kod] = df.loc[gecerli, sutunlar]
+    cerceveler = {kod: cerceveler[kod] for kod in kapanis.columns}
+    if panel:
+        return panel_olustur(cerceveler)
+    return cerceveler
+
+def veri_cek_ve_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi="thy_duygu_skorlari.csv", cevrimdisi=None,
+                        gostergeler=None):
     try:
         print(f"1. Adım: Ana hisse senedi ({hisse_kodu}) verisi çekiliyor...")
-        df_hisse = yf.download(hisse_kodu, start=baslangic_tarihi, end=bitis_tarihi)
+        # Fiyatlar yerel Parquet önbelleğinden gelir; yalnızca eksik tarihler indirilir (bkz. veri_onbellegi.py)
+        df_hisse = fiyat_verisi_getir(hisse_kodu, baslangic_tarihi, bitis_tarihi, cevrimdisi=cevrimdisi)
         if df_hisse.empty or 'Close' not in df_hisse.columns:
             print(f"HATA: {hisse_kodu} için geçerli veri ('Close' sütunu) bulunamadı.")
             return None
@@ -26,7 +159,7 @@ def veri_cek_ve_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyas
         print("-> Başarılı.")
 
         print("2. Adım: Endeks verisi (XU100.IS) çekiliyor...")
-        df_endeks = yf.download("XU100.IS", start=baslangic_tarihi, end=bitis_tarihi)
+        df_endeks = fiyat_verisi_getir("XU100.IS", baslangic_tarihi, bitis_tarihi, cevrimdisi=cevrimdisi)
         if df_endeks.empty or 'Close' not in df_endeks.columns:
             print("HATA: XU100.IS için geçerli veri ('Close' sütunu) bulunamadı.")
             return None
@@ -37,28 +170,11 @@ def veri_cek_ve_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyas
         # ---------------------------------------------------
         print("-> Başarılı.")
         
-        df_endeks['bist100_getiri'] = df_endeks['Close'].pct_change()
-        
         print(f"3. Adım: '{duygu_dosyasi}' dosyasındaki duygu verisi okunuyor...")
         df_duygu = pd.read_csv(duygu_dosyasi)
-        
-        df_hisse.index = pd.to_datetime(df_hisse.index)
-        df_duygu['Date'] = pd.to_datetime(df_duygu['Date'])
-        df_endeks.index = pd.to_datetime(df_endeks.index)
 
-        print("4. Adım: Tüm veriler birleştiriliyor...")
-        veri_birlesik = pd.merge(df_hisse, df_duygu, left_index=True, right_on='Date', how='left').set_index('Date')
-        veri_birlesik = pd.merge(veri_birlesik, df_endeks[['bist100_getiri']], left_index=True, right_index=True, how='left')
-        
-        veri_birlesik['sentiment_score'].fillna(0, inplace=True)
-        veri_birlesik['bist100_getiri'].fillna(0, inplace=True)
-
-        print("5. Adım: Teknik göstergeler hesaplanıyor...")
-        veri_birlesik['SMA_14'] = veri_birlesik['Close'].rolling(window=14).mean()
-        veri_birlesik['RSI_14'] = _calculate_rsi(veri_birlesik['Close'])
-        
-        veri = veri_birlesik[['Close', 'SMA_14', 'RSI_14', 'sentiment_score', 'bist100_getiri']].copy()
-        veri.dropna(inplace=True)
+        print("4. Adım: Veriler birleştiriliyor ve teknik göstergeler hesaplanıyor...")
+        veri = verileri_birlestir(df_hisse, df_endeks, df_duygu, gostergeler=gostergeler, hisse_kodu=hisse_kodu)
         
         print(f"\n{hisse_kodu} için tüm veriler başarıyla birleştirildi.")
         print("Son 5 satır:")
@@ -0,0 +1,146 @@
+import datetime
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
+
+# Önbellek klasörü ve çevrimdışı mod ortam değişkenleriyle de ayarlanabilir (örn. VERI_CEVRIMDISI=1 python final_test.py)
+ONBELLEK_KLASORU = os.environ.get("VERI_ONBELLEK_KLASORU", "veri_onbellegi")
+CEVRIMDISI = os.environ.get("VERI_CEVRIMDISI", "0") == "1"
+# Geçmişte kalan ve bu kadar iş gününden uzun bir aralık boş dönerse (en uzun bayram tatilleri ~9 iş günü)
+# indirme başarısız sayılır ve kapsama eklenmez
+BOS_ARALIK_IS_GUNU = 10
+
+
+def _dosya_yollari(hisse_kodu, klasor):
+    ad = hisse_kodu.replace("/", "_").replace("^", "_")
+    return os.path.join(klasor, f"{ad}.parquet"), os.path.join(klasor, f"{ad}.json")
+
+
+def _onbellegi_oku(hisse_kodu, klasor):
+    """
+    Returns:
+        tuple: (DataFrame veya None, kapsanan [baslangic, bitis) aralığı veya None)
+    """
+    veri_yolu, kapsam_yolu = _dosya_yollari(hisse_kodu, klasor)
+    if not (os.path.exists(veri_yolu) and os.path.exists(kapsam_yolu)):
+        return None, None
+    with open(kapsam_yolu, encoding="utf-8") as f:
+        kapsam = json.load(f)
+    return pd.read_parquet(veri_yolu), (pd.Timestamp(kapsam["baslangic"]), pd.Timestamp(kapsam["bitis"]))
+
+
+def _onbellege_yaz(hisse_kodu, klasor, df, kapsam):
+    # Yarıda kesilen bir yazım önbelleği bozmasın diye önce geçici dosyaya yazıp yerine taşıyoruz
+    os.makedirs(klasor, exist_ok=True)
+    veri_yolu, kapsam_yolu = _dosya_yollari(hisse_kodu, klasor)
+    df.to_parquet(veri_yolu + ".tmp")
+    os.replace(veri_yolu + ".tmp", veri_yolu)
+    with open(kapsam_yolu + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"baslangic": kapsam[0].strftime("%Y-%m-%d"), "bitis": kapsam[1].strftime("%Y-%m-%d")}, f)
+    os.replace(kapsam_yolu + ".tmp", kapsam_yolu)
+
+
+def _indir(hisse_kodu, baslangic, bitis):
+    """
+    yf.download ile aynı veriyi (düzeltilmiş fiyatlar, saat dilimsiz günlük indeks) Ticker.history ile indirir.
+    yf.download hataları yükseltmeyip boş tablo döndürdüğünden ağ ve sembol hataları raise_errors ile yükseltilir;
+    yalnızca "bu aralıkta fiyat yok" yanıtı boş tablo olarak döner.
+
+    Raises:
+        Exception: İndirme başarısız olduysa (ağ hatası, geçersiz sembol, Yahoo hatası vb.).
+    """
+    with warnings.catch_warnings():
+        # raise_errors yeni sürümlerde kullanımdan kalkıyor olarak işaretli ama hâlâ hataları yükseltmenin tek
+        # sürümden bağımsız yolu
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            df = yf.Ticker(hisse_kodu).history(
+                start=baslangic.strftime("%Y-%m-%d"), end=bitis.strftime("%Y-%m-%d"),
+                auto_adjust=True, actions=False, raise_errors=True,
+            )
+        except YFPricesMissingError:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+    df.index = pd.to_datetime(df.index).tz_localize(None)
+    df.index.name = "Date"
+    return df[sorted(df.columns)]
+
+
+def _bos_olabilir(baslangic, bitis, bugun):
+    """ [baslangic, bitis) aralığının gerçekten işlemsiz olabilecek kadar kısa ya da henüz gelmemiş olup olmadığı. """
+    is_gunu = np.busday_count(baslangic.date(), min(bitis, bugun).date()) if baslangic < bugun else 0
+    return is_gunu <= BOS_ARALIK_IS_GUNU
+
+
+def fiyat_verisi_getir(hisse_kodu, baslangic_tarihi, bitis_tarihi, klasor=None, cevrimdisi=None):
+    """
+    yf.download yerine kullanılır: hisse başına bir Parquet dosyasında tutulan önbellekten [baslangic, bitis)
+    aralığını döndürür ve yalnızca önbelleğin kapsamadığı baştaki/sondaki tarihleri indirir.
+
+    Kapsanan aralık ayrı bir JSON dosyasında saklanır; böylece tatil ve hafta sonları eksik veri sanılmaz.
+    Hata veren indirmeler kapsama eklenmez. Boş dönen indirmeler yalnızca aralık kısaysa (hafta sonu, tatil; en fazla
+    BOS_ARALIK_IS_GUNU iş günü) kapsama eklenir; daha uzun bir geçmiş aralığın boş dönmesi hata sayılır.
+    Bugün ve sonrası kapsama eklenmez, gün içindeki eksik son bar bir sonraki çalıştırmada yenilenir.
+
+    Args:
+        hisse_kodu (str): Örn. "THYAO.IS".
+        baslangic_tarihi, bitis_tarihi (str): yf.download'daki gibi; bitiş tarihi dahil değildir.
+        klasor (str, optional): Önbellek klasörü (varsayılan ONBELLEK_KLASORU).
+        cevrimdisi (bool, optional): True ise hiç indirme yapılmaz, yalnızca önbellekteki veri döner
+            (varsayılan VERI_CEVRIMDISI ortam değişkeni).
+
+    Returns:
+        pd.DataFrame: Tek katmanlı sütunlarla (Close, High, Low, Open, Volume) tarih indeksli veri; veri yoksa boş.
+    """
+    klasor = klasor or ONBELLEK_KLASORU
+    cevrimdisi = CEVRIMDISI if cevrimdisi is None else cevrimdisi
+    baslangic = pd.Timestamp(baslangic_tarihi)
+    bitis = pd.Timestamp(bitis_tarihi)
+
+    df, kapsam = _onbellegi_oku(hisse_kodu, klasor)
+
+    if not cevrimdisi:
+        bugun = pd.Timestamp(datetime.date.today())
+        parcalar = [] if df is None else [df]
+        if kapsam is None:
+            eksikler = [(baslangic, bitis)]
+        else:
+            eksikler = [(baslangic, kapsam[0]), (kapsam[1], bitis)]
+
+        yeni_kapsam = kapsam
+        for eksik_baslangic, eksik_bitis in eksikler:
+            if eksik_baslangic >= eksik_bitis:
+                continue
+            try:
+                indirilen = _indir(hisse_kodu, eksik_baslangic, eksik_bitis)
+            except Exception as e:
+                # Yalnızca hata durumunda kapsam genişletilmez; aralık bir sonraki çalıştırmada yeniden denenir
+                print(f"UYARI: {hisse_kodu} için {eksik_baslangic.date()} - {eksik_bitis.date()} indirilemedi: {e}")
+                continue
+            # Kısa bir aralığın boş dönmesi (hafta sonu, tatil, henüz kapanmamış gün) kapsanmış sayılır; aksi halde
+            # her çalıştırmada aynı boşluk yeniden indirilir. Uzun bir geçmiş aralık boşsa veri alınamamıştır.
+            if indirilen.empty and not _bos_olabilir(eksik_baslangic, eksik_bitis, bugun):
+                print(f"UYARI: {hisse_kodu} için {eksik_baslangic.date()} - {eksik_bitis.date()} boş döndü; "
+                      f"kapsama eklenmedi.")
+                continue
+            if not indirilen.empty:
+                parcalar.append(indirilen)
+            # Kapsam her zaman tek parça kalır: ilk indirmede istenen aralık, sonrakilerde mevcut kapsama bitişik eksikler
+            kapsam_baslangic = eksik_baslangic if yeni_kapsam is None else min(yeni_kapsam[0], eksik_baslangic)
+            kapsam_bitis = min(eksik_bitis, bugun) if yeni_kapsam is None else max(yeni_kapsam[1], min(eksik_bitis, bugun))
+            yeni_kapsam = (kapsam_baslangic, kapsam_bitis)
+
+        if yeni_kapsam is not kapsam:
+            df = pd.concat(parcalar) if parcalar else pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            _onbellege_yaz(hisse_kodu, klasor, df, yeni_kapsam)
+    elif df is None:
+        print(f"UYARI: Çevrimdışı modda {hisse_kodu} için önbellekte veri yok.")
+
+    if df is None:
+        return pd.DataFrame()
+    return df[(df.index >= baslangic) & (df.index < bitis)]
\ No newline at end of file
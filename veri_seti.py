@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from gostergeler import VARSAYILAN_GOSTERGELER
+from veri_hazirlama import veri_cek_ve_hazirla
+
+VERI_SETI_KLASORU = os.environ.get("VERI_SETI_KLASORU", "veri_setleri")
+DEGER_DOSYASI = "degerler.npy"
+TARIH_DOSYASI = "tarihler.npy"
+META_DOSYASI = "meta.json"
+
+
+def _dosya_ozeti(dosya):
+    ozet = hashlib.sha256()
+    with open(dosya, "rb") as f:
+        for parca in iter(lambda: f.read(1 << 20), b""):
+            ozet.update(parca)
+    return ozet.hexdigest()
+
+
+def veri_seti_girdileri(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi, gostergeler=None):
+    """ Anlık görüntünün anahtarını oluşturan girdiler (duygu dosyası adıyla değil içeriğiyle temsil edilir). """
+    gostergeler = VARSAYILAN_GOSTERGELER if gostergeler is None else gostergeler
+    return {
+        'hisse_kodu': hisse_kodu,
+        'baslangic_tarihi': baslangic_tarihi,
+        'bitis_tarihi': bitis_tarihi,
+        'duygu_dosyasi_ozeti': _dosya_ozeti(duygu_dosyasi) if os.path.exists(duygu_dosyasi) else None,
+        'gostergeler': {ad: [gosterge, parametreler] for ad, (gosterge, parametreler) in gostergeler.items()},
+        # Duygu skorlarının seanslara nasıl hizalandığı; değişirse eski anlık görüntüler kullanılmaz
+        'duygu_hizalama': 'seans_asof',
+    }
+
+
+def veri_seti_ozeti(girdiler):
+    metin = json.dumps(girdiler, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(metin.encode("utf-8")).hexdigest()[:16]
+
+
+def veri_seti_yaz(df, klasor, girdiler):
+    """
+    Hazırlanmış DataFrame'i klasöre float64 .npy değer matrisi, datetime64 tarih dizisi ve meta.json olarak yazar.
+    Önce geçici klasöre yazılıp yerine taşınır; yarım kalmış bir anlık görüntü hiçbir zaman açılmaz.
+    """
+    gecici = f"{klasor}.tmp{os.getpid()}"
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+    np.save(os.path.join(gecici, DEGER_DOSYASI), np.ascontiguousarray(df.to_numpy(dtype=np.float64)))
+    np.save(os.path.join(gecici, TARIH_DOSYASI), df.index.to_numpy())
+    meta = {'sutunlar': list(df.columns), 'indeks_adi': df.index.name, 'satir_sayisi': len(df), 'girdiler': girdiler}
+    with open(os.path.join(gecici, META_DOSYASI), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    try:
+        os.replace(gecici, klasor)
+    except OSError:
+        # Aynı anda başka bir süreç aynı anlık görüntüyü yazdıysa onunkini kullanıyoruz
+        shutil.rmtree(gecici, ignore_errors=True)
+
+
+def veri_seti_ac(klasor):
+    """
+    Anlık görüntüyü bellek eşlemli olarak açar; veri kopyalanmaz, açılış süresi veri boyutundan bağımsızdır.
+
+    Returns:
+        pd.DataFrame: veri_cek_ve_hazirla çıktısıyla aynı sütun ve tarih indeksine sahip salt okunur DataFrame.
+    """
+    with open(os.path.join(klasor, META_DOSYASI), encoding="utf-8") as f:
+        meta = json.load(f)
+    degerler = np.load(os.path.join(klasor, DEGER_DOSYASI), mmap_mode='r')
+    tarihler = pd.DatetimeIndex(np.load(os.path.join(klasor, TARIH_DOSYASI)), name=meta['indeks_adi'])
+    return pd.DataFrame(degerler, index=tarihler, columns=meta['sutunlar'], copy=False)
+
+
+def veri_seti_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi="thy_duygu_skorlari.csv",
+                      gostergeler=None, klasor=None, yeniden_olustur=False):
+    """
+    veri_cek_ve_hazirla yerine kullanılır. Girdilerin özetiyle adlandırılmış anlık görüntü varsa onu açar,
+    yoksa veriyi bir kez hazırlayıp anlık görüntüyü yazar. Aynı girdilerle çalışan eğitim, Optuna ve test
+    betikleri böylece birebir aynı veriyi görür.
+
+    Args:
+        hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi, gostergeler: veri_cek_ve_hazirla'daki gibi.
+        klasor (str, optional): Anlık görüntülerin kök klasörü (varsayılan VERI_SETI_KLASORU).
+        yeniden_olustur (bool): True ise mevcut anlık görüntü yok sayılıp veri yeniden hazırlanır.
+
+    Returns:
+        pd.DataFrame veya None: Veri hazırlanamazsa None.
+    """
+    girdiler = veri_seti_girdileri(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi, gostergeler)
+    hedef = os.path.join(klasor or VERI_SETI_KLASORU, f"{hisse_kodu}_{veri_seti_ozeti(girdiler)}")
+
+    if yeniden_olustur:
+        shutil.rmtree(hedef, ignore_errors=True)
+    if not os.path.exists(os.path.join(hedef, META_DOSYASI)):
+        df = veri_cek_ve_hazirla(hisse_kodu, baslangic_tarihi, bitis_tarihi, duygu_dosyasi, gostergeler=gostergeler)
+        if df is None:
+            return None
+        os.makedirs(os.path.dirname(hedef) or ".", exist_ok=True)
+        veri_seti_yaz(df, hedef, girdiler)
+        print(f"Veri seti anlık görüntüsü oluşturuldu: {hedef}")
+    else:
+        print(f"Veri seti anlık görüntüsü kullanılıyor: {hedef}")
+    return veri_seti_ac(hedef)
\ No newline at end of file
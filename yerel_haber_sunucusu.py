@@ -0,0 +1,205 @@
+import asyncio
+import contextlib
+import datetime
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from haber_cekici import SONUC_SINIRI, YEREL_SAAT_DILIMI, arsivden_ayikla, fetch_range, fetch_windows
+from sayfa_arsivi import SayfaArsivi
+
+# Sahte haberlerin dağıldığı saatler (yerel saat); bir kısmı gece yarısına yakındır ki UTC/yerel gün farkı sınansın
+HABER_SAATLERI = ("00:30", "09:15", "13:40", "17:05", "23:50")
+
+
+def ornek_haberler(baslangic, bitis, gunluk=3, yogun_gunler=None, sirket_adi="THY"):
+    """
+    [baslangic, bitis] aralığının her günü için yayın zamanlı sahte haberler üretir.
+
+    Args:
+        gunluk (int): Sıradan bir gündeki haber sayısı.
+        yogun_gunler (dict, optional): Gün -> haber sayısı (sonuç sınırını aşan günler için).
+
+    Returns:
+        list: (yerel saat dilimli pd.Timestamp, başlık) çiftleri, zaman sırasında.
+    """
+    yogun_gunler = yogun_gunler or {}
+    haberler = []
+    for gun in pd.date_range(baslangic, bitis, freq='D'):
+        for i in range(yogun_gunler.get(gun.date(), gunluk)):
+            saat = HABER_SAATLERI[i % len(HABER_SAATLERI)]
+            zaman = (gun + pd.Timedelta(f"{saat}:00") + pd.Timedelta(seconds=i)).tz_localize(YEREL_SAAT_DILIMI)
+            haberler.append((zaman, f"{sirket_adi} {gun.date()} haberi {i}"))
+    return sorted(haberler)
+
+
+class YerelHaberSunucusu:
+    """
+    HaberCekici'yi ağa çıkmadan sınamak için Google News arama sayfalarını taklit eden yerel aiohttp sunucusu.
+    Sorgudaki after:/before: aralığına (yerel gün olarak) düşen haberleri, Google News gibi 'article' ve
+    'time datetime' etiketleriyle ve en fazla sonuc_siniri kadar döndürür.
+
+    hata_plani ile belirli aramalar önce hata döndürür: {"after:2024-01-03": [503, 429]} o aramanın ilk iki
+    isteğine 503 ve 429 (Retry-After ile), sonrakilere sayfayı döndürür; 404 gibi yeniden denenmeyen durumlar da
+    verilebilir. Her istek 'istekler'e (zaman, sorgu, durum, istemci portu) kaydedilir.
+    """
+    def __init__(self, haberler=(), sonuc_siniri=SONUC_SINIRI, hata_plani=None, gecikme=0.02, retry_after=0.05):
+        self.haberler = list(haberler)
+        self.sonuc_siniri = sonuc_siniri
+        self.hata_plani = {anahtar: list(durumlar) for anahtar, durumlar in (hata_plani or {}).items()}
+        self.gecikme = gecikme
+        self.retry_after = retry_after
+        self.istekler = []
+        self.acik_istek = 0
+        self.en_fazla_acik_istek = 0
+        self._kilit = threading.Lock()
+
+    def _sayfa(self, ilk, son_haric):
+        haberler = [(zaman, baslik) for zaman, baslik in self.haberler if ilk <= zaman < son_haric]
+        return "<html><body><c-wiz>" + "".join(
+            f'<article><a class="JtKRv" href="./articles/{i}">{baslik}</a>'
+            f'<time datetime="{zaman.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")}">önce</time></article>'
+            for i, (zaman, baslik) in enumerate(haberler[:self.sonuc_siniri])
+        ) + "</c-wiz></body></html>"
+
+    async def _arama(self, istek):
+        from aiohttp import web
+
+        sorgu = istek.query.get('q', '')
+        with self._kilit:
+            self.acik_istek += 1
+            self.en_fazla_acik_istek = max(self.en_fazla_acik_istek, self.acik_istek)
+            durum = 200
+            for anahtar, durumlar in self.hata_plani.items():
+                if anahtar in sorgu and durumlar:
+                    durum = durumlar.pop(0)
+                    break
+            self.istekler.append((time.monotonic(), sorgu, durum, istek.transport.get_extra_info('peername')[1]))
+        try:
+            await asyncio.sleep(self.gecikme)
+            if durum != 200:
+                basliklar = {'Retry-After': str(self.retry_after)} if durum == 429 else {}
+                return web.Response(status=durum, headers=basliklar)
+            ilk = pd.Timestamp(sorgu.split('after:')[1][:10]).tz_localize(YEREL_SAAT_DILIMI)
+            son_haric = pd.Timestamp(sorgu.split('before:')[1][:10]).tz_localize(YEREL_SAAT_DILIMI)
+            return web.Response(text=self._sayfa(ilk, son_haric), content_type='text/html')
+        finally:
+            with self._kilit:
+                self.acik_istek -= 1
+
+    def istek_sayisi(self, parca=""):
+        return sum(1 for _, sorgu, _, _ in self.istekler if parca in sorgu)
+
+    @contextlib.contextmanager
+    def calistir(self):
+        """ Sunucuyu arka plandaki bir iş parçacığında rastgele bir portta başlatır ve taban adresini verir. """
+        from aiohttp import web
+
+        dongu = asyncio.new_event_loop()
+        uygulama = web.Application()
+        uygulama.router.add_get('/search', self._arama)
+        calistirici = web.AppRunner(uygulama)
+        dongu.run_until_complete(calistirici.setup())
+        site = web.TCPSite(calistirici, '127.0.0.1', 0)
+        dongu.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        is_parcacigi = threading.Thread(target=dongu.run_forever, daemon=True)
+        is_parcacigi.start()
+        try:
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            asyncio.run_coroutine_threadsafe(calistirici.cleanup(), dongu).result()
+            dongu.call_soon_threadsafe(dongu.stop)
+            is_parcacigi.join()
+            dongu.close()
+
+
+def _gun_sorgusu(gun):
+    return f"after:{gun.strftime('%Y-%m-%d')}"
+
+
+def kontrolleri_calistir():
+    """
+    HaberCekici'nin hız sınırı, eş zamanlılık, bağlantı havuzu, yeniden deneme, hata sonuçları, pencere
+    birleştirme ve aralık modu (arşivden yeniden ayrıştırma dahil) davranışını yerel sunucuya karşı doğrular.
+
+    Raises:
+        AssertionError: Bir davranış beklenenden farklıysa.
+    """
+    baslangic, bitis = datetime.date(2024, 1, 1), datetime.date(2024, 1, 30)
+    gunler = [baslangic + datetime.timedelta(days=i) for i in range((bitis - baslangic).days + 1)]
+    haberler = ornek_haberler(baslangic, bitis)
+
+    # 1) Hız sınırı, eş zamanlılık ve bağlantı havuzu
+    sunucu = YerelHaberSunucusu(haberler, gecikme=0.2)
+    with sunucu.calistir() as adres:
+        sonuc = fetch_range("THY", baslangic, bitis, taban_adres=adres, eszamanli=4, saniyede_istek=20.0)
+    assert all(s['hata'] is None and len(s['basliklar']) == 3 for s in sonuc.values()), "başlıklar eksik"
+    zamanlar = sorted(zaman for zaman, _, _, _ in sunucu.istekler)
+    # Varış zamanları iş parçacığı zamanlamasıyla birkaç ms oynayabildiğinden ardışık iki istek arası değil,
+    # herhangi bir 0.25 saniyelik aralığa düşen istek sayısı sınanır (sınırsız çekimde 4'lü istek grupları gelir)
+    en_yogun = max(sum(1 for t in zamanlar if z <= t < z + 0.25) for z in zamanlar)
+    assert en_yogun <= 20 * 0.25 + 1, f"hız sınırı aşıldı (0.25 saniyede {en_yogun} istek)"
+    assert zamanlar[-1] - zamanlar[0] >= 0.9 * (len(zamanlar) - 1) / 20.0, "istekler eşit aralıklı dağılmadı"
+    assert sunucu.en_fazla_acik_istek <= 4, f"eş zamanlı istek sınırı aşıldı ({sunucu.en_fazla_acik_istek})"
+    baglantilar = {port for _, _, _, port in sunucu.istekler}
+    assert len(baglantilar) <= 4, f"bağlantılar yeniden kullanılmıyor ({len(baglantilar)} bağlantı)"
+    print(f"- Hız sınırı: {len(zamanlar)} istek, 0.25 saniyede en fazla {en_yogun} istek; "
+          f"en fazla {sunucu.en_fazla_acik_istek} açık istek, {len(baglantilar)} bağlantı")
+
+    # 2) Geçici hatalar yeniden denenir (429'da Retry-After'a uyulur), kalıcı hatalar başlık değil hata olarak döner
+    hata_plani = {
+        _gun_sorgusu(gunler[2]): [503, 503],
+        _gun_sorgusu(gunler[3]): [429],
+        _gun_sorgusu(gunler[4]): [404],
+        _gun_sorgusu(gunler[5]): [500] * 10,
+    }
+    sunucu = YerelHaberSunucusu(haberler, hata_plani=hata_plani)
+    with sunucu.calistir() as adres:
+        sonuc = fetch_range("THY", baslangic, bitis, taban_adres=adres, saniyede_istek=100.0,
+                            deneme_sayisi=3, geri_cekilme=0.01)
+    assert sonuc[gunler[2]]['hata'] is None and sunucu.istek_sayisi(_gun_sorgusu(gunler[2])) == 3
+    assert sonuc[gunler[3]]['hata'] is None and sunucu.istek_sayisi(_gun_sorgusu(gunler[3])) == 2
+    assert sonuc[gunler[4]]['hata'] == "HTTP 404" and sunucu.istek_sayisi(_gun_sorgusu(gunler[4])) == 1
+    assert sonuc[gunler[5]]['hata'] is not None and sunucu.istek_sayisi(_gun_sorgusu(gunler[5])) == 3
+    assert all(sonuc[gun]['basliklar'] == [] for gun in gunler[4:6]), "hata sonucu başlık gibi döndü"
+    print("- Yeniden deneme: 503/429 sonrası alındı, 404 yeniden denenmedi, 3 denemede alınamayan gün hata olarak döndü")
+
+    # 3) Pencere birleştirme: hafta sonu + pazartesi tek aramayla çekilir
+    pencereler = [(datetime.date(2024, 1, 6), datetime.date(2024, 1, 8)), (datetime.date(2024, 1, 9),) * 2]
+    sunucu = YerelHaberSunucusu(haberler)
+    with sunucu.calistir() as adres:
+        sonuc = fetch_windows("THY", pencereler, taban_adres=adres, saniyede_istek=100.0)
+    assert len(sunucu.istekler) == 2, f"pencere başına bir istek beklenirken {len(sunucu.istekler)} istek"
+    assert len(sonuc[datetime.date(2024, 1, 8)]['basliklar']) == 9
+    print("- Pencereler: 2 pencere için 2 istek, 3 günlük pencerede 9 başlık")
+
+    # 4) Aralık modu: sonuç sınırını aşan pencere bölünür; arşivden yeniden ayrıştırma canlı sonucu verir
+    yogun_gun = datetime.date(2024, 1, 10)
+    haberler = ornek_haberler(baslangic, bitis, yogun_gunler={yogun_gun: SONUC_SINIRI + 20})
+    sunucu = YerelHaberSunucusu(haberler)
+    with tempfile.TemporaryDirectory() as klasor, sunucu.calistir() as adres:
+        arsiv = SayfaArsivi(klasor)
+        gunluk = fetch_range("THY", baslangic, bitis, taban_adres=adres, saniyede_istek=100.0, arsiv=arsiv)
+        toplu = fetch_range("THY", baslangic, bitis, pencere_gun=7, taban_adres=adres, saniyede_istek=100.0,
+                            arsiv=arsiv)
+        istek_sayisi = len(sunucu.istekler)
+        assert all(toplu[gun]['basliklar'] == gunluk[gun]['basliklar'] for gun in gunler), "aralık modu farklı"
+        assert len(toplu[yogun_gun]['basliklar']) == SONUC_SINIRI, "sınırı aşan pencere bölünmedi"
+        tekrar = arsivden_ayikla("THY", baslangic, bitis, arsiv=arsiv)
+        assert tekrar == {gun: gunluk[gun]['basliklar'] for gun in gunler}, "arşivden ayrıştırma canlı sonuçtan farklı"
+
+        # Yalnızca pencere sayfalarının olduğu arşiv: bölünen pencere ile parçaları aynı haberi iki kez saymamalı
+        arsiv = SayfaArsivi(f"{klasor}/pencereler")
+        fetch_range("THY", baslangic, bitis, pencere_gun=7, taban_adres=adres, saniyede_istek=100.0, arsiv=arsiv)
+        tekrar = arsivden_ayikla("THY", datetime.date(2024, 1, 9), datetime.date(2024, 1, 20), arsiv=arsiv)
+        assert tekrar == {gun: toplu[gun]['basliklar'] for gun in gunler[8:20]}, "pencere sayfaları yanlış dağıtıldı"
+    print(f"- Aralık modu: {len(gunler)} gün, yoğun gün bölünerek çekildi; "
+          f"gün ve pencere sayfalarının arşivden ayrıştırılması canlı sonuçla aynı ({istek_sayisi} istek)")
+
+
+if __name__ == "__main__":
+    kontrolleri_calistir()
+    print("HaberCekici yerel sunucu kontrolleri başarılı.")
\ No newline at end of file